@@ -0,0 +1,424 @@
+"""
+This module implements an asyncio interface for CUBRIDdb. The blocking
+calls of a connection run on an executor of its own with a single
+thread, so they never block the event loop and reach the server in the
+order they were made.
+
+    con = await CUBRIDdb.aio.connect('CUBRID:localhost:33000:demodb:::',
+            'public')
+    cur = con.cursor()
+    await cur.execute('select * from athlete')
+    async for row in cur:
+        ...
+    await con.close()
+
+Cancelling a coroutine waiting for a call does not interrupt the call
+on the server; it completes in the background before the next call of
+the connection starts.
+
+Requires Python 3.5 or later.
+"""
+import asyncio
+import collections
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from CUBRIDdb import Error, InterfaceError, OperationalError
+from CUBRIDdb.connections import Connection
+from CUBRIDdb.pool import _BasePool, _Entry
+
+
+class AsyncConnection(object):
+    """
+    An asyncio wrapper of CUBRIDdb.connections.Connection. Methods
+    talking to the server are coroutines.
+    """
+
+    def __init__(self, con, executor, loop):
+        self._con = con
+        self._executor = executor
+        self._loop = loop
+
+    def _submit(self, func, *args):
+        return self._loop.run_in_executor(self._executor,
+                functools.partial(func, *args))
+
+    async def _run(self, func, *args):
+        if self._con is None:
+            raise InterfaceError("The connection has been closed.")
+        return await self._submit(func, *args)
+
+    @property
+    def connection(self):
+        """The wrapped CUBRIDdb connection."""
+        return self._con
+
+    @property
+    def autocommit(self):
+        return self._con.autocommit
+
+    def cursor(self, dictCursor=None, cursorclass=None):
+        """
+        Return a new AsyncCursor, see Connection.cursor().
+        """
+        if self._con is None:
+            raise InterfaceError("The connection has been closed.")
+        return AsyncCursor(self, self._con.cursor(dictCursor, cursorclass))
+
+    async def set_autocommit(self, value):
+        await self._run(self._con.set_autocommit, value)
+
+    async def commit(self):
+        await self._run(self._con.commit)
+
+    async def rollback(self):
+        await self._run(self._con.rollback)
+
+    async def ping(self):
+        return await self._run(self._con.ping)
+
+    async def close(self):
+        """
+        Close the connection and stop its executor.
+        """
+        if self._con is None:
+            return
+        try:
+            await self._run(self._con.close)
+        finally:
+            self._con = None
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+async def connect(*args, **kwargs):
+    """
+    Connect to the database, taking the arguments of CUBRIDdb.connect().
+    Returns an AsyncConnection.
+    """
+    loop = asyncio.get_event_loop()
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        con = await loop.run_in_executor(executor,
+                functools.partial(Connection, *args, **kwargs))
+    except BaseException:
+        executor.shutdown(wait=False)
+        raise
+    return AsyncConnection(con, executor, loop)
+
+
+class AsyncCursor(object):
+    """
+    An asyncio wrapper of a CUBRIDdb cursor.
+
+    Iterating with async for reads the result set in batches of
+    prefetch rows. The next batch is fetched while the current one is
+    being consumed, and only one batch is fetched ahead.
+    """
+
+    prefetch = 100
+
+    def __init__(self, conn, cursor):
+        self._conn = conn
+        self._cursor = cursor
+        self._buffer = collections.deque()
+        self._prefetch = None
+        self.arraysize = 1
+
+    @property
+    def cursor(self):
+        """The wrapped CUBRIDdb cursor."""
+        return self._cursor
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def rowstatus(self):
+        return self._cursor.rowstatus
+
+    def _reset(self):
+        if self._prefetch is not None:
+            self._prefetch.cancel()
+            self._prefetch = None
+        self._buffer.clear()
+
+    async def _fill(self):
+        # move the batch fetched ahead, if any, into the buffer; shield()
+        # keeps the rows if the caller is cancelled meanwhile
+        future = self._prefetch
+        if future is None:
+            return
+        try:
+            rows = await asyncio.shield(future)
+        except BaseException:
+            # a failed batch is dropped, so that the error is raised once
+            if future.done():
+                self._prefetch = None
+                if not future.cancelled() and future.exception() is None:
+                    self._buffer.extend(future.result())
+            raise
+        self._prefetch = None
+        self._buffer.extend(rows)
+
+    async def execute(self, query, args=None, set_type=None):
+        self._reset()
+        return await self._conn._run(self._cursor.execute, query, args,
+                set_type)
+
+    async def executemany(self, query, args):
+        self._reset()
+        return await self._conn._run(self._cursor.executemany, query, args)
+
+    async def fetchone(self):
+        await self._fill()
+        if self._buffer:
+            return self._buffer.popleft()
+        return await self._conn._run(self._cursor.fetchone)
+
+    async def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        await self._fill()
+        rows = []
+        while self._buffer and len(rows) < size:
+            rows.append(self._buffer.popleft())
+        if len(rows) < size:
+            rows.extend(await self._conn._run(self._cursor.fetchmany,
+                    size - len(rows)))
+        return rows
+
+    async def fetchall(self):
+        await self._fill()
+        rows = list(self._buffer)
+        self._buffer.clear()
+        rows.extend(await self._conn._run(self._cursor.fetchall))
+        return rows
+
+    async def close(self):
+        self._reset()
+        if self._cursor is not None:
+            await self._conn._run(self._cursor.close)
+            self._cursor = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._buffer:
+            if self._prefetch is None:
+                self._prefetch = self._conn._submit(self._cursor.fetchmany,
+                        self.prefetch)
+            await self._fill()
+            if not self._buffer:
+                raise StopAsyncIteration
+            self._prefetch = self._conn._submit(self._cursor.fetchmany,
+                    self.prefetch)
+        return self._buffer.popleft()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+class _AsyncEntry(_Entry):
+
+    # created and reset on the executor of the connection, they read and
+    # change its session state
+    def __init__(self, aconn, now):
+        _Entry.__init__(self, aconn.connection, now)
+        self.aconn = aconn
+
+
+class _PoolConnectionContext(object):
+
+    def __init__(self, pool, timeout):
+        self._pool = pool
+        self._timeout = timeout
+        self._con = None
+
+    async def __aenter__(self):
+        self._con = await self._pool.acquire(self._timeout)
+        return self._con
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        con, self._con = self._con, None
+        await self._pool.release(con)
+
+
+class AsyncConnectionPool(_BasePool):
+    """
+    A pool of AsyncConnections, the asyncio counterpart of
+    CUBRIDdb.pool.ConnectionPool, taking the same options. Create it
+    with create_pool().
+    """
+
+    def __init__(self, *args, **kwargs):
+        _BasePool.__init__(self, *args, **kwargs)
+        self._loop = asyncio.get_event_loop()
+        self._cond = asyncio.Condition()
+        self._entries = {}
+
+    async def _open(self):
+        con = await connect(*self._args, **self._kwargs)
+        self._stats['created'] += 1
+        try:
+            return await con._run(_AsyncEntry, con, self._loop.time())
+        except BaseException:
+            await con.close()
+            raise
+
+    async def _discard(self, entry):
+        self._stats['closed'] += 1
+        try:
+            await entry.aconn.close()
+        except Error:
+            pass
+
+    async def acquire(self, timeout=None):
+        """
+        Check a connection out of the pool, waiting up to timeout seconds
+        (the pool's timeout if None) when maxsize connections are in use.
+        Raises OperationalError if none becomes available in time.
+        Returns an AsyncConnection, to be given back with release().
+        """
+        if timeout is None:
+            timeout = self.timeout
+        start = self._loop.time()
+        waited = False
+
+        while True:
+            discard = []
+            entry = None
+            try:
+                async with self._cond:
+                    while True:
+                        if self._closed:
+                            raise InterfaceError("The connection pool has been closed.")
+                        now = self._loop.time()
+                        entry = self._take_idle(now, discard)
+                        if entry is not None or self._size < self.maxsize:
+                            break
+                        remaining = start + timeout - now
+                        if remaining <= 0:
+                            self._stats['timeouts'] += 1
+                            raise OperationalError("no connection available within %s seconds" % timeout)
+                        waited = True
+                        try:
+                            await asyncio.wait_for(self._cond.wait(), remaining)
+                        except asyncio.TimeoutError:
+                            pass
+                    if entry is None:
+                        # the slot is taken now, the connection is opened below
+                        self._size += 1
+            finally:
+                for old in discard:
+                    await self._discard(old)
+
+            if entry is None:
+                try:
+                    entry = await self._open()
+                except BaseException:
+                    async with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif self.ping and not await self._check(entry):
+                continue
+            break
+
+        self._acquired(self._loop.time() - start, waited)
+        self._entries[id(entry.aconn)] = entry
+        return entry.aconn
+
+    async def _check(self, entry):
+        try:
+            if await entry.aconn.ping():
+                return True
+        except Error:
+            pass
+        self._stats['ping_failures'] += 1
+        async with self._cond:
+            self._size -= 1
+            self._cond.notify()
+        await self._discard(entry)
+        return False
+
+    def connection(self, timeout=None):
+        """
+        Return an async context manager checking a connection out of the
+        pool and giving it back at the end of the async with block.
+        """
+        return _PoolConnectionContext(self, timeout)
+
+    async def release(self, con):
+        """
+        Give a connection checked out with acquire() back to the pool.
+        It is reset like the connections of ConnectionPool.
+        """
+        entry = self._entries.pop(id(con))
+        keep = not self._closed
+        if keep:
+            try:
+                await con._run(entry.reset)
+            except Error:
+                keep = False
+
+        async with self._cond:
+            if keep:
+                entry.last_used = self._loop.time()
+                self._idle.append(entry)
+            else:
+                self._size -= 1
+            self._cond.notify()
+
+        if not keep:
+            await self._discard(entry)
+
+    async def close(self):
+        """
+        Close the idle connections. Connections in use are closed when
+        they are given back.
+        """
+        async with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            await self._discard(entry)
+
+    def stats(self):
+        """
+        Return a dict of usage metrics, see ConnectionPool.stats().
+        """
+        return self._stats_snapshot()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+async def create_pool(*args, **kwargs):
+    """
+    Create an AsyncConnectionPool and open its minsize connections.
+    """
+    pool = AsyncConnectionPool(*args, **kwargs)
+    for i in range(pool.minsize):
+        pool._idle.append(await pool._open())
+        pool._size += 1
+    return pool
@@ -5,9 +5,46 @@ want to make your own subclasses. In most cases, you will probably
 override Connection.default_cursor with a non-standard Cursor class.
 
 """
+import decimal
+import time
+import weakref
+import threading
 from CUBRIDdb.cursors import *
+from CUBRIDdb import Error
+from CUBRIDdb import failover
 import _cubrid
 
+try:
+    _now = time.monotonic
+except AttributeError:
+    _now = time.time
+
+
+def _commit_flusher(ref, cond):
+    # one thread per connection with an every_ms commit policy, committing
+    # the pending statements at their deadline; it only holds a weak
+    # reference, so that a connection nobody closes can still go away
+    cond.acquire()
+    try:
+        while True:
+            con = ref()
+            if con is None or con._commit_thread is not threading.current_thread():
+                return
+            timeout = 1.0
+            if con._commit_deadline is not None:
+                timeout = con._commit_deadline - _now()
+                if timeout <= 0:
+                    try:
+                        con.flush()
+                    except Error:
+                        # the statements stay pending, try again later
+                        con._commit_deadline = _now() + con._commit_policy[1] / 1000.0
+                    continue
+            del con
+            cond.wait(timeout)
+    finally:
+        cond.release()
+
 
 class Connection(object):
     """CUBRID Database Connection Object"""
@@ -18,9 +55,45 @@ class Connection(object):
         self.charset = ''
         kwargs2 = kwargs.copy()
         self.charset = kwargs2.pop('charset', 'utf8')
+        self.numeric_type = kwargs2.pop('numeric_type', decimal.Decimal)
+        if self.numeric_type not in NUMERIC_TYPES:
+            raise ValueError("numeric_type should be one of Decimal, int, float or str")
+        stmt_cache_size = kwargs2.pop('stmt_cache_size', 0)
+        stmt_cache_warmup = kwargs2.pop('stmt_cache_warmup', None)
+        brokers = kwargs2.pop('brokers', None)
+        connect_retries = kwargs2.pop('connect_retries', 2)
+        connect_backoff = kwargs2.pop('connect_backoff', 0.1)
+        stats = kwargs2.pop('stats', False)
 
-        self.connection = _cubrid.connect(*args, **kwargs2)
+        if args:
+            url, args = args[0], args[1:]
+        else:
+            url = kwargs2.pop('url', None)
+        self.broker = None
+        # without brokers, altHosts in the url is left to CCI, which also
+        # moves established connections to another host
+        if url is not None and brokers:
+            connect = lambda url: _cubrid.connect(url, *args, **kwargs2)
+            self.connection, self.broker = failover.connect(url, brokers,
+                    connect, connect_retries, connect_backoff)
+        elif url is not None:
+            self.connection = _cubrid.connect(url, *args, **kwargs2)
+        else:
+            self.connection = _cubrid.connect(*args, **kwargs2)
         self.fetch_value_converter = None
+        self._commit_policy = None
+        self._commit_lock = threading.RLock()
+        self._commit_cond = threading.Condition(self._commit_lock)
+        self._commit_pending = 0
+        self._commit_deadline = None
+        self._commit_thread = None
+
+        if stats:
+            self.set_stats_enabled(True)
+        if stmt_cache_size:
+            self.set_stmt_cache_size(stmt_cache_size)
+            if stmt_cache_warmup:
+                self.warmup_stmt_cache(stmt_cache_warmup)
 
     def __del__(self):
         pass
@@ -28,9 +101,15 @@ class Connection(object):
     def set_fetch_value_converter(self, func):
         self.fetch_value_converter = func
 
-    def cursor(self, dictCursor = None):
-        """Return a new Cursor Object using the connection."""
-        if dictCursor:
+    def cursor(self, dictCursor = None, cursorclass = None):
+        """
+        Return a new Cursor Object using the connection.
+        dictCursor -- if true, rows are returned as dictionaries
+        cursorclass -- cursor class to use instead, e.g. NamedRowCursor
+        """
+        if cursorclass is not None:
+            cursorClass = cursorclass
+        elif dictCursor:
             cursorClass = DictCursor
         else:
             cursorClass = Cursor
@@ -43,6 +122,7 @@ class Connection(object):
         """
         if not isinstance(value, bool):
             raise ValueError("Parameter should be a boolean value")
+        self._clear_commit_policy()
         self.connection.set_autocommit(value)
 
     def get_autocommit(self):
@@ -50,25 +130,204 @@ class Connection(object):
         Get the autocommit attribute of the connection.
         Return bool
         """
+        if self._commit_policy is not None:
+            return True
         return self.connection.autocommit
 
     autocommit = property(get_autocommit, set_autocommit, doc = "autocommit value for current Cubrid session")
 
+    def set_lock_timeout(self, value):
+        """
+        Set how many milliseconds statements wait for a lock, -1 for ever.
+        The change is sent with the next statement, if the value changes.
+        value -- int
+        """
+        self.connection.set_lock_timeout(value)
+
+    def get_lock_timeout(self):
+        """
+        Get the lock timeout of the session in milliseconds.
+        Return int
+        """
+        return self.connection.lock_timeout
+
+    lock_timeout = property(get_lock_timeout, set_lock_timeout, doc = "lock timeout in milliseconds for current Cubrid session")
+
     def commit(self):
         """
         Commit any pending transaction to the database.
         Note that if the database supports an auto-commit feature, this must be initially off. An interface method may be provided to turn it back on.
         Database modules that do not support transactions should implement this method with void functionality.
         """
+        if self._commit_policy is not None:
+            self.flush()
+            return
         self.connection.commit()
 
     def rollback(self):
         """
         This method causes the database to roll back to the start of any pending transaction.
         Closing a connection without committing the changes first will cause an implicit rollback to be performed.
+        With a commit policy, statements count as committed like in autocommit mode, and the pending ones are flushed instead.
         """
+        if self._commit_policy is not None:
+            self.flush()
+            return
         self.connection.rollback()
 
+    def set_commit_policy(self, every_n=None, every_ms=None):
+        """
+        Group the INSERT, UPDATE and DELETE statements of an autocommit
+        connection into transactions, committed once every_n of them are
+        pending or every_ms milliseconds after the first one. Any other
+        statement but SELECT is committed at once, along with the pending
+        ones. SELECTs see the pending statements of this connection.
+        close(), commit() and flush() commit the pending statements.
+        Without arguments, flush and commit every statement again.
+        every_n -- int or None
+        every_ms -- int or None
+        """
+        if every_n is not None and every_n < 1:
+            raise ValueError("every_n should be at least 1")
+        if every_ms is not None and every_ms <= 0:
+            raise ValueError("every_ms should be positive")
+
+        self._commit_lock.acquire()
+        try:
+            if self._commit_policy is not None:
+                self.flush()
+            elif not self.connection.autocommit:
+                raise InterfaceError("A commit policy needs an autocommit connection.")
+
+            if every_n is None and every_ms is None:
+                if self._clear_commit_policy():
+                    self.connection.set_autocommit(True)
+                return
+            if self._commit_policy is None:
+                self.connection.set_autocommit(False)
+            self._commit_policy = (every_n, every_ms)
+
+            if every_ms is None:
+                self._stop_commit_thread()
+            elif self._commit_thread is None:
+                thread = threading.Thread(target=_commit_flusher,
+                        args=(weakref.ref(self), self._commit_cond))
+                thread.daemon = True
+                self._commit_thread = thread
+                thread.start()
+        finally:
+            self._commit_lock.release()
+
+    def _stop_commit_thread(self):
+        # the lock is held
+        if self._commit_thread is not None:
+            self._commit_thread = None
+            self._commit_cond.notify()
+
+    def _clear_commit_policy(self):
+        # flush and stop grouping statements; return whether a policy was set
+        self._commit_lock.acquire()
+        try:
+            if self._commit_policy is None:
+                return False
+            self.flush()
+            self._commit_policy = None
+            self._stop_commit_thread()
+            return True
+        finally:
+            self._commit_lock.release()
+
+    def _executed(self, sql_type, count=1):
+        # called by the cursors after their statements while a commit
+        # policy is set; it may have been cleared since by another thread
+        if sql_type == _cubrid.CUBRID_STMT_SELECT:
+            return
+        self._commit_lock.acquire()
+        try:
+            if self._commit_policy is None:
+                return
+            every_n, every_ms = self._commit_policy
+            self._commit_pending += count
+            if sql_type not in (_cubrid.CUBRID_STMT_INSERT,
+                    _cubrid.CUBRID_STMT_UPDATE, _cubrid.CUBRID_STMT_DELETE):
+                self.flush()
+            elif every_n is not None and self._commit_pending >= every_n:
+                self.flush()
+            elif every_ms is not None:
+                now = _now()
+                if self._commit_deadline is None:
+                    self._commit_deadline = now + every_ms / 1000.0
+                    self._commit_cond.notify()
+                elif now >= self._commit_deadline:
+                    self.flush()
+        finally:
+            self._commit_lock.release()
+
+    def flush(self):
+        """
+        Commit the statements held back by the commit policy.
+        """
+        self._commit_lock.acquire()
+        try:
+            if self._commit_pending:
+                self.connection.commit()
+                self._commit_pending = 0
+            self._commit_deadline = None
+        finally:
+            self._commit_lock.release()
+
+    def set_stmt_cache_size(self, size):
+        """
+        Set how many prepared statements are kept open for reuse by the
+        cursors of this connection. 0 disables the cache.
+        size -- int
+        """
+        self.connection.set_stmt_cache_size(size)
+
+    def stmt_cache_info(self):
+        """
+        Return a dict with the size, count, hits and misses of the
+        prepared statement cache.
+        """
+        return self.connection.stmt_cache_info()
+
+    def set_stats_enabled(self, value):
+        """
+        Turn the driver statistics of the connection and its cursors on
+        or off. They are off by default, as they read the clock around
+        every call to the server.
+        value -- True or False
+        """
+        self.connection.set_stats_enabled(value)
+
+    def stats(self):
+        """
+        Return a dict of driver statistics: for prepare, execute, fetch,
+        cursor and end_tran, a dict with the number of calls to the server
+        and the seconds spent waiting for them; rows decoded, their
+        approximate size in bytes and the seconds spent decoding them.
+        """
+        return self.connection.stats()
+
+    def reset_stats(self):
+        """
+        Set the driver statistics of the connection back to zero.
+        """
+        self.connection.reset_stats()
+
+    def warmup_stmt_cache(self, statements):
+        """
+        Prepare statements ahead of time, so their first execution is
+        served by the statement cache.
+        statements -- sequence of SQL strings
+        """
+        cs = self.connection.cursor()
+        try:
+            for stmt in statements:
+                cs.prepare(stmt)
+        finally:
+            cs.close()
+
     def set(self):
         """
         Create a LIST/SET/MULTISET object.
@@ -79,8 +338,25 @@ class Connection(object):
         """
         Close the connection now
         """
+        self._clear_commit_policy()
         self.connection.close()
 
+    def ping(self):
+        """
+        Check that the connection to the server is working.
+        Return True, or raise an Error if the server cannot be reached.
+        """
+        if self.broker is None:
+            return bool(self.connection.ping())
+        start = _now()
+        try:
+            res = self.connection.ping()
+        except InterfaceError:
+            failover.registry.failure(self.broker)
+            raise
+        failover.registry.observe(self.broker, _now() - start)
+        return bool(res)
+
     def escape_string(self, buf):
         """
         Escape special characters in a string for use in an SQL statement
@@ -1,14 +1,45 @@
 import sys
+import csv
+import decimal
+import itertools
 from CUBRIDdb import FIELD_TYPE
+from CUBRIDdb import DatabaseError
 from CUBRIDdb import InterfaceError
-from functools import reduce
-
-
-def bytes_to_binstr(b):
-    return reduce(
-        lambda x1, x2: x1 + x2[2:],
-        map(lambda x: format(x, '#010b'), b)
-    )
+from CUBRIDdb import NotSupportedError
+import _cubrid
+
+
+# Python types NUMERIC columns can be fetched as
+NUMERIC_TYPES = {
+    decimal.Decimal: _cubrid.CUBRID_NUMERIC_AS_DECIMAL,
+    int: _cubrid.CUBRID_NUMERIC_AS_INT,
+    float: _cubrid.CUBRID_NUMERIC_AS_FLOAT,
+    str: _cubrid.CUBRID_NUMERIC_AS_STR,
+}
+
+# datetime64 units of the epoch counts returned by fetch_columns(n, True)
+DATETIME64_UNITS = {
+    FIELD_TYPE.DATE: 'D',
+    FIELD_TYPE.DATETIME: 'ms',
+    FIELD_TYPE.TIMESTAMP: 's',
+}
+
+
+def _unique_names(names):
+    """Suffix repeated names with _1, _2... so that every name is unique."""
+    seen = set(names)
+    result = []
+    used = set()
+    for name in names:
+        unique = name
+        n = 0
+        # a suffixed name must not be the name of another column either
+        while unique in used or (n and unique in seen):
+            n += 1
+            unique = '%s_%d' % (name, n)
+        used.add(unique)
+        result.append(unique)
+    return result
 
 
 class BaseCursor(object):
@@ -21,17 +52,29 @@ class BaseCursor(object):
 
     arraysize::
         default number of rows fetchmany() will fetch
+
+    executemany_chunksize::
+        number of rows executemany() sends in one request
+
+    rowstatus::
+        one dict per row sent by the last executemany(), with the keys
+        result, err_no and err_msg
     """
 
     def __init__(self, conn):
         self.con = conn
         self._cs = conn.connection.cursor()
         self.arraysize = 1
+        self.executemany_chunksize = 1000
         self.rowcount = -1
-        self.description = None
+        self.rowstatus = []
 
         self.charset = conn.charset
         self._cs._set_charset_name(conn.charset)
+        self._cs._set_fetch_type(self._fetch_type)
+        self.numeric_type = conn.numeric_type
+        self._fetchsize = 0
+        self._fetchtarget = 256 * 1024
 
     def __del__(self):
         try:
@@ -51,43 +94,103 @@ class BaseCursor(object):
         self._cs.close()
         self._cs = None
 
+    def set_numeric_type(self, value):
+        """
+        Set the Python type NUMERIC columns are fetched as.
+        value -- decimal.Decimal, int, float or str
+        """
+        if value not in NUMERIC_TYPES:
+            raise ValueError("Parameter should be one of Decimal, int, float or str")
+        self.__check_state()
+        self._cs._set_numeric_type(NUMERIC_TYPES[value])
+        self._numeric_type = value
+
+    def get_numeric_type(self):
+        """
+        Get the Python type NUMERIC columns are fetched as.
+        """
+        return self._numeric_type
+
+    numeric_type = property(get_numeric_type, set_numeric_type, doc = "Python type of fetched NUMERIC values")
+
+    def set_fetch_size(self, value):
+        """
+        Set how many rows are transferred from the server per request. The client buffers one such batch at a time.
+        value -- int, 0 to size the batches from fetchtarget
+        """
+        if not isinstance(value, int) or value < 0:
+            raise ValueError("Parameter should be a non-negative integer")
+        self.__check_state()
+        self._cs.set_fetch_size(value)
+        self._fetchsize = value
+
+    def get_fetch_size(self):
+        """
+        Get how many rows are transferred from the server per request.
+        """
+        return self._fetchsize
+
+    fetchsize = property(get_fetch_size, set_fetch_size, doc = "number of rows transferred from the server per request")
+
+    def set_fetch_target(self, value):
+        """
+        Set about how many bytes a batch of fetched rows should carry when fetchsize is 0. Batches start at 100 rows and grow towards this size, from the observed row width, as rows are read.
+        value -- int, 0 to keep the CCI fetch size unchanged
+        """
+        if not isinstance(value, int) or value < 0:
+            raise ValueError("Parameter should be a non-negative integer")
+        self.__check_state()
+        self._cs.set_fetch_target(value)
+        self._fetchtarget = value
+
+    def get_fetch_target(self):
+        """
+        Get the number of bytes a batch of fetched rows aims at.
+        """
+        return self._fetchtarget
+
+    fetchtarget = property(get_fetch_target, set_fetch_target, doc = "bytes per request the fetch size adapts to")
+
+    def fetch_stats(self):
+        """
+        Return a dict describing the fetching of the current result set: rows read, round_trips to the server, current fetch_size in rows and average row_width in bytes.
+        """
+        self.__check_state()
+        return self._cs.fetch_stats()
+
+    def stats(self):
+        """
+        Return the driver statistics of this cursor, see
+        Connection.stats(). They are counted while enabled on the
+        connection.
+        """
+        self.__check_state()
+        return self._cs.stats()
+
+    def _get_description(self):
+        if self._cs is None:
+            return None
+        # built by the C cursor on first access and kept while the
+        # executed queries return the same columns
+        return self._cs.description
+
+    description = property(_get_description, doc = "DB API description of the last executed query")
+
+    def _get_lastrowid(self):
+        if self._cs is None:
+            return None
+        # read from the server on first access after an INSERT
+        return self._cs.lastrowid
+
+    lastrowid = property(_get_lastrowid, doc = "AUTO_INCREMENT value generated by the last executed INSERT, or None once another statement ran on the connection")
+
     def _bind_params(self, args,set_type=None):
         self.__check_state()
         if type(args) not in (tuple, list):
             args = [args,]
         args = list(args)
         for i in range(len(args)):
-            if args[i] is None:
-                pass
-            elif isinstance(args[i], bool):
-                if args[i] == True:
-                    args[i] = '1'
-                else:
-                    args[i] = '0'
-            elif isinstance(args[i], tuple):
-                args[i] = args[i]
-            elif isinstance(args[i], bytes):
-                args[i] = bytes_to_binstr(args[i])
-            else:
-                # Python3.X dosen't support unicode keyword.
-                try:
-                    mytest = unicode
-                except NameError:
-                    if isinstance(args[i], str):
-                        pass
-                    else:
-                        args[i] = str(args[i])
-                else:
-                    if isinstance(args[i], unicode):
-                        args[i] = args[i].encode(self.charset)
-                    else:
-                        args[i] = str(args[i])
-
-            if isinstance(args[i], bytes):
-                self._cs.bind_param(i+1, args[i], FIELD_TYPE.VARBIT)
-            elif not isinstance(args[i], tuple):
-                self._cs.bind_param(i+1, args[i])
-            else:
+            if isinstance(args[i], tuple):
                 if set_type is None:
                     data_type = int(FIELD_TYPE.CHAR)
                 else:
@@ -97,7 +200,11 @@ class BaseCursor(object):
 
                 s = self.con.connection.set()
                 s.imports(args[i], data_type)
-                self._cs.bind_set(i+1, s)
+                args[i] = s
+
+        # values are bound with the CCI type matching their Python type,
+        # see _cubrid.register_adapter() for binding other types
+        self._cs.bind_params(args)
 
     def execute(self, query, args=None, set_type=None):
         """
@@ -109,23 +216,15 @@ class BaseCursor(object):
         Returns long integer rows affected, if any
         """
         self.__check_state()
-
-        if not isinstance(query, (bytes, bytearray)):
-            stmt = query.encode(self.charset)
-        else:
-            stmt = query
-
-        if sys.version_info >= (3, 0):
-            stmt = stmt.decode()
-
-        self._cs.prepare(stmt)
+        self._prepare(query)
 
         if args is not None:
             self._bind_params(args, set_type)
 
         r = self._cs.execute()
         self.rowcount = self._cs.rowcount
-        self.description = self._cs.description
+        if self.con._commit_policy is not None:
+            self.con._executed(self._cs.sql_type)
         return r
 
     def executemany(self, query, args):
@@ -138,14 +237,180 @@ class BaseCursor(object):
 
         Returns long integer rows affected, if any.
 
-        This method improves performance on multiple-row INSERT and REPLACE.
-        Otherwise it is equivalent to looping over args with execute().
+        The statement is prepared once and the rows are sent in chunks of
+        executemany_chunksize rows, each in a single request. A failing
+        row does not stop the others, check rowstatus for the outcome of
+        every row. Rows holding SET or LOB values are executed one by one.
 
         """
 
         self.__check_state()
-        for p in args:
-            self.execute(query, *(p,))
+        self.rowstatus = []
+        rowcount = 0
+
+        args = iter(args)
+        prepared = False
+        while True:
+            rows = list(itertools.islice(args, self.executemany_chunksize))
+            if not rows:
+                break
+            rows = [p if type(p) in (tuple, list) else [p,] for p in rows]
+
+            # every chunk reuses the handle, unless execute() replaced it
+            if not prepared:
+                self._prepare(query)
+                prepared = True
+            try:
+                if not rows[0]:
+                    raise NotSupportedError("no parameters to bind")
+                status = self._cs.execute_array(rows)
+                rowcount += self._cs.rowcount
+                if self.con._commit_policy is not None:
+                    self.con._executed(self._cs.sql_type, len(rows))
+            except NotSupportedError:
+                # SET and LOB values and statements without parameters
+                # are executed row by row
+                prepared = False
+                status = []
+                for p in rows:
+                    try:
+                        r = self.execute(query, p)
+                    except DatabaseError as e:
+                        if len(e.args) == 2:
+                            err_no, err_msg = e.args
+                        else:
+                            err_no, err_msg = -1, str(e)
+                        status.append({'result': -1, 'err_no': err_no,
+                                'err_msg': err_msg})
+                        continue
+                    rowcount += max(self.rowcount, 0)
+                    status.append({'result': r, 'err_no': 0,
+                            'err_msg': 'success'})
+            self.rowstatus.extend(status)
+
+        self.rowcount = rowcount
+        return rowcount
+
+    def copy_from(self, table, source, columns=None, format='csv',
+            chunk_rows=1000, null='', header=False, progress=None):
+        """
+        Load rows into a table, streaming them in chunks.
+
+        table -- string, name of the table to load
+        source -- file object or path of a CSV/TSV file, or an iterable
+            of sequences holding the values of each row
+        columns -- optional sequence of the column names the values go to
+        format -- 'csv' or 'tsv', how files are parsed
+        chunk_rows -- number of rows sent in one request
+        null -- file field text loaded as NULL
+        header -- skip the first line of files
+        progress -- optional callable, called after each chunk with the
+            number of rows loaded and rejected so far
+
+        Each chunk is executed with array binding. In autocommit mode
+        every chunk is committed on its own, so a failure only rolls back
+        the current chunk. With autocommit off, or with a commit policy,
+        nothing is committed or rolled back: the rows are part of the
+        caller's transaction. Rows the server refuses, or with the wrong
+        number of values, do not stop the load.
+
+        Returns (loaded, rejected), rejected being a list of
+        (row number, row, error message) tuples.
+        """
+        self.__check_state()
+        if format not in ('csv', 'tsv'):
+            raise ValueError("format should be 'csv' or 'tsv'")
+
+        f = None
+        if isinstance(source, str):
+            if sys.version_info >= (3, 0):
+                f = open(source, newline='', encoding=self.charset)
+            else:
+                f = open(source, 'rb')
+            source = f
+
+        if hasattr(source, 'read'):
+            delimiter = '\t' if format == 'tsv' else ','
+            rows = csv.reader(source, delimiter=delimiter)
+            if header:
+                next(rows, None)
+            rows = ([None if v == null else v for v in row] for row in rows)
+            lineno = 1 if header else 0
+        else:
+            rows = iter(source)
+            lineno = 0
+
+        query = None
+        nvalues = len(columns) if columns else None
+        loaded = 0
+        rejected = []
+
+        # chunks are committed only when autocommit was on; a commit policy
+        # already groups the rows
+        autocommit = self.con.autocommit and self.con._commit_policy is None
+        if autocommit:
+            self.con.set_autocommit(False)
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_rows))
+                if not chunk:
+                    break
+
+                good = []
+                numbers = []
+                for row in chunk:
+                    lineno += 1
+                    if nvalues is None:
+                        nvalues = len(row)
+                    if len(row) != nvalues:
+                        rejected.append((lineno, row,
+                            "expected %d values, got %d" % (nvalues, len(row))))
+                    else:
+                        good.append(row)
+                        numbers.append(lineno)
+
+                if good:
+                    if query is None:
+                        query = 'insert into %s%s values (%s)' % (table,
+                                ' (%s)' % ', '.join(columns) if columns else '',
+                                ', '.join(['?'] * nvalues))
+                    self._prepare(query)
+                    status = self._cs.execute_array(good)
+                    if self.con._commit_policy is not None:
+                        self.con._executed(self._cs.sql_type, len(good))
+                    for n, row, st in zip(numbers, good, status):
+                        if st['err_no'] < 0:
+                            rejected.append((n, row, st['err_msg']))
+                        else:
+                            loaded += 1
+                if autocommit:
+                    self.con.commit()
+
+                if progress is not None:
+                    progress(loaded, len(rejected))
+        except Exception:
+            if autocommit:
+                self.con.rollback()
+            raise
+        finally:
+            if f is not None:
+                f.close()
+            if autocommit:
+                self.con.set_autocommit(True)
+
+        self.rowcount = loaded
+        return loaded, rejected
+
+    def _prepare(self, query):
+        if not isinstance(query, (bytes, bytearray)):
+            stmt = query.encode(self.charset)
+        else:
+            stmt = query
+
+        if sys.version_info >= (3, 0):
+            stmt = stmt.decode()
+
+        self._cs.prepare(stmt)
 
     def _fetch_row(self):
         self.__check_state()
@@ -167,15 +432,15 @@ class BaseCursor(object):
 
     def _fetch_many(self, size):
         self.__check_state()
-        rlist = []
-        i = 0
-        while size < 0 or i < size:
-            r = self.fetchone()
-            if not r:
-                break
-            rlist.append(r)
-            i = i+1
-        return rlist
+        rows = self._cs.fetch_many(size, self._fetch_type)
+
+        if rows and self.con.fetch_value_converter:
+            # user defined value converter
+            converter = self.con.fetch_value_converter
+            description = self._cs.description
+            rows = [converter(row, description) for row in rows]
+
+        return rows
 
     def fetchmany(self, size=None):
         """
@@ -198,6 +463,74 @@ class BaseCursor(object):
         self.__check_state()
         return self._fetch_many(-1)
 
+    def fetch_columns(self, n=None):
+        """
+        Fetch the next n rows of a query result (all remaining rows if n is None), returned column by column instead of as row tuples.
+        Returns a tuple (columns, nulls) with one item per column of the description. INT, SMALLINT, BIGINT, FLOAT and DOUBLE columns are array.array objects holding 0 for NULL, and their item in nulls is an array.array('B') set to 1 for the NULL rows. Other columns are lists holding None for NULL, and their item in nulls is None.
+        The connection's fetch value converter is not applied.
+        """
+        self.__check_state()
+        if n is None:
+            n = -1
+        return self._cs.fetch_columns(n)
+
+    def fetch_numpy(self, n=None, as_dict=False):
+        """
+        Fetch the next n rows of a query result (all remaining rows if n is None) into NumPy arrays.
+        INT, SMALLINT, BIGINT, FLOAT and DOUBLE columns get the matching NumPy dtype, DATE, DATETIME and TIMESTAMP columns get datetime64[D], [ms] and [s], and other columns get dtype object.
+        Returns a structured array with one field per column, or a dict of arrays keyed by column name if as_dict is true. A column name that is already taken gets a suffix: the second id column is named id_1. Columns holding NULL are returned as masked arrays, and the structured array is then a masked array.
+        Raises NotSupportedError if NumPy cannot be imported.
+        """
+        self.__check_state()
+        try:
+            import numpy
+        except ImportError:
+            raise NotSupportedError("fetch_numpy() requires NumPy")
+
+        if n is None:
+            n = -1
+        columns, nulls = self._cs.fetch_columns(n, True)
+        description = self._cs.description or ()
+
+        names = []
+        arrays = []
+        masks = []
+        for desc, column, null in zip(description, columns, nulls):
+            if null is None:
+                data = numpy.empty(len(column), dtype=object)
+                data[:] = column
+                mask = numpy.array([v is None for v in column], dtype=bool)
+            else:
+                # the array.array buffers are used without a copy
+                data = numpy.frombuffer(column, dtype=column.typecode)
+                if desc[1] in DATETIME64_UNITS:
+                    data = data.view('datetime64[%s]' % DATETIME64_UNITS[desc[1]])
+                mask = numpy.frombuffer(null, dtype=numpy.uint8).astype(bool)
+            names.append(desc[0])
+            arrays.append(data)
+            masks.append(mask)
+        names = _unique_names(names)
+
+        if as_dict:
+            result = {}
+            for name, data, mask in zip(names, arrays, masks):
+                if mask.any():
+                    data = numpy.ma.MaskedArray(data, mask=mask)
+                result[name] = data
+            return result
+
+        count = len(arrays[0]) if arrays else 0
+        result = numpy.empty(count, dtype=[(name, data.dtype)
+            for name, data in zip(names, arrays)])
+        for name, data in zip(names, arrays):
+            result[name] = data
+        if any(mask.any() for mask in masks):
+            mask = numpy.empty(count, dtype=[(name, bool) for name in names])
+            for name, m in zip(names, masks):
+                mask[name] = m
+            result = numpy.ma.MaskedArray(result, mask=mask)
+        return result
+
     def setinputsizes(self, *args):
         """Does nothing, required by DB API."""
         pass
@@ -242,9 +575,13 @@ class BaseCursor(object):
 
     def __next__(self):
         self.__check_state()
-        row = self.fetchone()
-        if row is None:
-            raise StopIteration
+        # the C cursor raises StopIteration when the result set is exhausted
+        row = next(self._cs)
+
+        if self.con.fetch_value_converter:
+            # user defined value converter
+            return self.con.fetch_value_converter(row, self._cs.description)
+
         return row
 
 
@@ -258,6 +595,11 @@ class CursorDictTupleMixIn(object):
     _fetch_type = 1
 
 
+class CursorNamedRowsMixIn(object):
+
+    _fetch_type = 2
+
+
 class Cursor(CursorTupleRowsMixIn, BaseCursor):
     '''
     This is the standard Cursor class that returns rows as tuples
@@ -270,3 +612,33 @@ class DictCursor(CursorDictTupleMixIn, BaseCursor):
     This is a Cursor class that returns rows as dictionaries and
     stores the result set in the client.
     '''
+
+
+class NamedRowCursor(CursorNamedRowsMixIn, BaseCursor):
+    '''
+    This is a Cursor class that returns rows as _cubrid.row objects,
+    which behave like tuples and also give access to the values by
+    column name, as row['name'] or row.name.
+    '''
+
+
+class SSCursor(CursorTupleRowsMixIn, BaseCursor):
+    '''
+    This is a Cursor class that returns rows as tuples and streams the
+    result set from the server. The client keeps at most fetchsize rows
+    of it at a time, as long as rows are read by iterating over the
+    cursor or with fetchone() and fetchmany(); fetchall() still builds
+    the whole list. The cursor only moves forward.
+    '''
+
+    def __init__(self, conn):
+        BaseCursor.__init__(self, conn)
+        self._cs.set_forward_only(True)
+        self.fetchsize = 100
+
+
+class SSDictCursor(CursorDictTupleMixIn, SSCursor):
+    '''
+    This is a Cursor class that returns rows as dictionaries and
+    streams the result set from the server, like SSCursor.
+    '''
@@ -0,0 +1,253 @@
+"""
+This module implements failover and load balancing across CUBRID
+brokers. It is used by Connection when it is given the brokers
+argument; the hosts of altHosts in the url are then added to them:
+
+    con = CUBRIDdb.connect('CUBRID:node1:33000:demodb:::', 'public',
+            brokers=['node2:33000'])
+
+Each connection stays on the broker it connected to. Without brokers,
+altHosts is handled by CCI, which also fails over established
+connections.
+
+The health of every broker is kept in a registry shared by the whole
+process. Connect and ping times feed a moving average of each broker's
+latency, and new connections go to the fastest healthy broker. After
+failure_threshold consecutive connect errors, the circuit of a broker
+opens and no connection is attempted to it for reset_timeout seconds,
+doubling with every further failure up to max_reset_timeout. Then a
+single connection attempt probes the broker again.
+
+"""
+import time
+import random
+import threading
+
+from CUBRIDdb import InterfaceError, OperationalError
+
+try:
+    _now = time.monotonic
+except AttributeError:
+    _now = time.time
+
+
+class BrokerState(object):
+    """The health of one broker, as seen by this process."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.latency = None
+        self.failures = 0
+        self.open_until = 0.0
+        self.connects = 0
+        self.errors = 0
+
+    def __repr__(self):
+        return "<broker %s:%d>" % (self.host, self.port)
+
+
+class BrokerRegistry(object):
+    """
+    The health of the brokers used by this process, see the module
+    documentation. The settings can be changed on the instance.
+    """
+
+    alpha = 0.3
+    failure_threshold = 2
+    reset_timeout = 2.0
+    max_reset_timeout = 60.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._brokers = {}
+
+    def get(self, host, port):
+        """Return the BrokerState of a broker."""
+        key = (host.lower(), port)
+        self._lock.acquire()
+        try:
+            state = self._brokers.get(key)
+            if state is None:
+                state = self._brokers[key] = BrokerState(host, port)
+            return state
+        finally:
+            self._lock.release()
+
+    def order(self, brokers):
+        """
+        Return the brokers a connection may be attempted to, those that
+        did not fail last first, then fastest first. Brokers whose latency
+        is not known yet keep their order and come before the others, so
+        that they get measured.
+        """
+        now = _now()
+        self._lock.acquire()
+        try:
+            closed = [b for b in brokers if b.failures < self.failure_threshold]
+            half_open = [b for b in brokers
+                    if b.failures >= self.failure_threshold and b.open_until <= now]
+        finally:
+            self._lock.release()
+        closed.sort(key=lambda b: (b.failures > 0, b.latency or 0.0))
+        return closed + half_open
+
+    def attempt(self, state):
+        """
+        Claim a connection attempt to the broker. Return False if its
+        circuit is open, or another thread is probing it.
+        """
+        now = _now()
+        self._lock.acquire()
+        try:
+            if state.failures < self.failure_threshold:
+                return True
+            if state.open_until > now:
+                return False
+            # half open: keep the circuit open for the others while probing
+            state.open_until = now + self._reset_timeout(state)
+            return True
+        finally:
+            self._lock.release()
+
+    def _reset_timeout(self, state):
+        n = state.failures - self.failure_threshold
+        return min(self.max_reset_timeout, self.reset_timeout * 2 ** n)
+
+    def _observe(self, state, latency):
+        if state.latency is None:
+            state.latency = latency
+        else:
+            state.latency += self.alpha * (latency - state.latency)
+
+    def success(self, state, latency):
+        """Record a successful connection that took latency seconds."""
+        self._lock.acquire()
+        try:
+            self._observe(state, latency)
+            state.connects += 1
+            state.failures = 0
+            state.open_until = 0.0
+        finally:
+            self._lock.release()
+
+    def failure(self, state):
+        """Record a failed connection attempt or a broken connection."""
+        self._lock.acquire()
+        try:
+            state.errors += 1
+            state.failures += 1
+            if state.failures >= self.failure_threshold:
+                state.open_until = _now() + self._reset_timeout(state)
+        finally:
+            self._lock.release()
+
+    def observe(self, state, latency):
+        """Record the round trip time of a request, e.g. a ping."""
+        self._lock.acquire()
+        try:
+            self._observe(state, latency)
+        finally:
+            self._lock.release()
+
+    def stats(self):
+        """
+        Return a list of dicts with the host, port, latency, consecutive
+        failures, connects and errors of every broker, and whether its
+        circuit is open.
+        """
+        now = _now()
+        self._lock.acquire()
+        try:
+            return [{'host': b.host, 'port': b.port, 'latency': b.latency,
+                     'failures': b.failures, 'connects': b.connects,
+                     'errors': b.errors,
+                     'open': (b.failures >= self.failure_threshold
+                              and b.open_until > now)}
+                    for b in self._brokers.values()]
+        finally:
+            self._lock.release()
+
+
+registry = BrokerRegistry()
+
+
+def _parse_host(host):
+    if isinstance(host, tuple):
+        return host[0], int(host[1])
+    name, port = host.rsplit(':', 1)
+    return name, int(port)
+
+
+def parse_url(url, brokers=None):
+    """
+    Split a connection url into the brokers it names, followed by
+    brokers, and a format string for the url of one broker.
+    The altHosts property is left out of that url.
+    """
+    base, sep, props = url.partition('?')
+    parts = base.split(':', 3)
+    if len(parts) < 4:
+        raise InterfaceError("invalid connection url: %s" % url)
+    hosts = [(parts[1], int(parts[2]))]
+
+    kept = []
+    for prop in props.split('&'):
+        if prop.lower().startswith('althosts='):
+            hosts.extend(_parse_host(h) for h in prop[9:].split(',') if h)
+        elif prop:
+            kept.append(prop)
+    for host in brokers or ():
+        hosts.append(_parse_host(host))
+
+    template = parts[0].replace('%', '%%') + ':%s:%d:' + parts[3].replace('%', '%%')
+    if kept:
+        template += '?' + '&'.join(kept).replace('%', '%%')
+
+    unique = []
+    for host in hosts:
+        if host not in unique:
+            unique.append(host)
+    return unique, template
+
+
+def connect(url, brokers, connect, retries=2, backoff=0.1):
+    """
+    Connect to the fastest healthy broker among those of url and
+    brokers, trying the next one on errors that are not reported by
+    the database itself. After a pass over all of them fails, wait
+    backoff seconds, doubling every time, and try again up to retries
+    times. connect is called with the url of a broker and returns a
+    connection.
+    Return the connection and the BrokerState of its broker.
+    """
+    hosts, template = parse_url(url, brokers)
+    states = [registry.get(host, port) for host, port in hosts]
+    error = None
+
+    for n in range(retries + 1):
+        if n:
+            delay = backoff * 2 ** (n - 1)
+            time.sleep(delay * random.uniform(0.5, 1.0))
+        for state in registry.order(states):
+            if not registry.attempt(state):
+                continue
+            start = _now()
+            try:
+                con = connect(template % (state.host, state.port))
+            except InterfaceError as e:
+                registry.failure(state)
+                error = e
+                continue
+            registry.success(state, _now() - start)
+            return con, state
+
+    if error is not None:
+        raise error
+    raise OperationalError("no broker available: %s"
+            % ', '.join('%s:%d' % host for host in hosts))
+
+
+def broker_stats():
+    """Return registry.stats()."""
+    return registry.stats()
@@ -0,0 +1,340 @@
+"""
+This module implements a connection pool for CUBRIDdb. ConnectionPool
+keeps connections open between uses, so that getting one does not pay
+for connecting to the broker and setting up the session again.
+
+    pool = ConnectionPool('CUBRID:localhost:33000:demodb:::', 'public',
+            minsize=2, maxsize=10)
+    with pool.connection() as con:
+        cur = con.cursor()
+        ...
+
+"""
+import os
+import time
+import threading
+
+import _cubrid
+from CUBRIDdb import Error, InterfaceError, OperationalError
+from CUBRIDdb.connections import Connection
+
+try:
+    _now = time.monotonic
+except AttributeError:
+    _now = time.time
+
+
+class PooledConnection(object):
+    """
+    A connection checked out of a ConnectionPool. It behaves like the
+    Connection it wraps, except that close() gives it back to the pool.
+    """
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+
+    def __getattr__(self, name):
+        if self._entry is None:
+            raise InterfaceError("The connection has been returned to the pool.")
+        return getattr(self._entry.con, name)
+
+    def close(self):
+        """Give the connection back to the pool."""
+        if self._entry is not None:
+            entry, self._entry = self._entry, None
+            self._pool._release(entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class _Entry(object):
+
+    def __init__(self, con, now):
+        self.con = con
+        self.pid = os.getpid()
+        self.created = now
+        self.last_used = now
+        self.autocommit = con.autocommit
+        self.isolation_level = con.connection.isolation_level
+        self.lock_timeout = con.lock_timeout
+
+    def reset(self):
+        # roll back and restore the session state the connection was
+        # opened with; the setters only reach the server on a change
+        con = self.con
+        con.rollback()
+        if con.autocommit != self.autocommit:
+            con.set_autocommit(self.autocommit)
+        if con.connection.isolation_level != self.isolation_level:
+            con.connection.set_isolation_level(
+                    getattr(_cubrid, self.isolation_level))
+        if con.lock_timeout != self.lock_timeout:
+            con.set_lock_timeout(self.lock_timeout)
+
+
+class _BasePool(object):
+    """
+    The options, expiry and usage metrics shared by ConnectionPool and
+    CUBRIDdb.aio.AsyncConnectionPool. Subclasses provide the locking.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs = kwargs.copy()
+        self.minsize = kwargs.pop('minsize', 0)
+        self.maxsize = kwargs.pop('maxsize', 10)
+        self.timeout = kwargs.pop('timeout', 30.0)
+        self.max_idle = kwargs.pop('max_idle', 600.0)
+        self.max_lifetime = kwargs.pop('max_lifetime', 3600.0)
+        self.ping = kwargs.pop('ping', True)
+        if self.maxsize < 1 or not 0 <= self.minsize <= self.maxsize:
+            raise ValueError("sizes should satisfy 0 <= minsize <= maxsize and maxsize >= 1")
+
+        self._args = args
+        self._kwargs = kwargs
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._stats = {
+            'created': 0,
+            'closed': 0,
+            'acquired': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'ping_failures': 0,
+            'wait_time': 0.0,
+            'max_wait_time': 0.0,
+        }
+
+    def _expired(self, entry, now):
+        if now - entry.created > self.max_lifetime:
+            return True
+        return (now - entry.last_used > self.max_idle
+                and self._size > self.minsize)
+
+    def _take_idle(self, now, discard):
+        # the lock is held; expired entries are added to discard
+        while self._idle:
+            entry = self._idle.pop()
+            if not self._expired(entry, now):
+                return entry
+            self._size -= 1
+            discard.append(entry)
+        return None
+
+    def _acquired(self, wait_time, waited):
+        # the lock is held
+        self._stats['acquired'] += 1
+        self._stats['wait_time'] += wait_time
+        self._stats['max_wait_time'] = max(self._stats['max_wait_time'], wait_time)
+        if waited:
+            self._stats['waits'] += 1
+
+    def _stats_snapshot(self):
+        # the lock is held
+        stats = dict(self._stats)
+        stats['size'] = self._size
+        stats['idle'] = len(self._idle)
+        return stats
+
+
+class ConnectionPool(_BasePool):
+    """
+    A pool of connections to one database. The positional and keyword
+    arguments are those of CUBRIDdb.connect(), plus these options:
+
+    minsize -- connections opened at once and kept open when idle
+    maxsize -- most connections open at the same time
+    timeout -- seconds acquire() waits for a connection by default
+    max_idle -- seconds a connection above minsize may stay idle
+    max_lifetime -- seconds after which a connection is reopened
+    ping -- check connections with ping() when they are checked out
+
+    Connections are reset when they are given back: the pending
+    transaction is rolled back, and autocommit, the isolation level and
+    the lock timeout they were opened with are restored. A process forked
+    from the one that opened the connections never uses them; it opens
+    its own.
+    """
+
+    def __init__(self, *args, **kwargs):
+        _BasePool.__init__(self, *args, **kwargs)
+        self._cond = threading.Condition()
+        self._pid = os.getpid()
+
+        for i in range(self.minsize):
+            self._idle.append(self._open())
+            self._size += 1
+
+    def _open(self):
+        con = Connection(*self._args, **self._kwargs)
+        self._count('created')
+        return _Entry(con, _now())
+
+    def _count(self, name):
+        self._cond.acquire()
+        self._stats[name] += 1
+        self._cond.release()
+
+    def _discard(self, entry):
+        # called without the lock held, closing talks to the server
+        self._count('closed')
+        if entry.pid != os.getpid():
+            entry.con.connection._detach()
+            return
+        try:
+            entry.con.close()
+        except Error:
+            pass
+
+    def _check_fork(self):
+        # the lock is held
+        if self._pid == os.getpid():
+            return
+        for entry in self._idle:
+            entry.con.connection._detach()
+        self._idle = []
+        self._size = 0
+        self._pid = os.getpid()
+
+    def acquire(self, timeout=None):
+        """
+        Check a connection out of the pool, waiting up to timeout seconds
+        (the pool's timeout if None) when maxsize connections are in use.
+        Raises OperationalError if none becomes available in time.
+        Returns a PooledConnection.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        start = _now()
+        waited = False
+
+        while True:
+            discard = []
+            entry = None
+            self._cond.acquire()
+            try:
+                self._check_fork()
+                while True:
+                    if self._closed:
+                        raise InterfaceError("The connection pool has been closed.")
+                    now = _now()
+                    entry = self._take_idle(now, discard)
+                    if entry is not None or self._size < self.maxsize:
+                        break
+                    remaining = start + timeout - now
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise OperationalError("no connection available within %s seconds" % timeout)
+                    waited = True
+                    self._cond.wait(remaining)
+                if entry is None:
+                    # the slot is taken now, the connection is opened below
+                    self._size += 1
+            finally:
+                self._cond.release()
+                for old in discard:
+                    self._discard(old)
+
+            if entry is None:
+                try:
+                    entry = self._open()
+                except Exception:
+                    self._cond.acquire()
+                    self._size -= 1
+                    self._cond.notify()
+                    self._cond.release()
+                    raise
+            elif self.ping and not self._check(entry):
+                continue
+            break
+
+        wait_time = _now() - start
+        self._cond.acquire()
+        self._acquired(wait_time, waited)
+        self._cond.release()
+        return PooledConnection(self, entry)
+
+    def _check(self, entry):
+        try:
+            if entry.con.ping():
+                return True
+        except Error:
+            pass
+        self._cond.acquire()
+        self._stats['ping_failures'] += 1
+        self._size -= 1
+        self._cond.notify()
+        self._cond.release()
+        self._discard(entry)
+        return False
+
+    def connection(self, timeout=None):
+        """
+        Same as acquire(), for use in a with statement; the connection
+        goes back to the pool at the end of the block.
+        """
+        return self.acquire(timeout)
+
+    def _release(self, entry):
+        keep = not self._closed and entry.pid == os.getpid()
+        if keep:
+            try:
+                entry.reset()
+            except Error:
+                keep = False
+
+        self._cond.acquire()
+        try:
+            self._check_fork()
+            if keep and entry.pid == self._pid:
+                entry.last_used = _now()
+                self._idle.append(entry)
+            elif entry.pid == self._pid:
+                self._size -= 1
+            self._cond.notify()
+        finally:
+            self._cond.release()
+
+        if not keep:
+            self._discard(entry)
+
+    def close(self):
+        """
+        Close the idle connections. Connections in use are closed when
+        they are given back.
+        """
+        self._cond.acquire()
+        try:
+            self._closed = True
+            self._check_fork()
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        finally:
+            self._cond.release()
+        for entry in idle:
+            self._discard(entry)
+
+    def stats(self):
+        """
+        Return a dict of usage metrics: size and idle connections, the
+        number of connections created, closed and acquired, how many
+        acquisitions waited or timed out, ping failures, and the total
+        and longest wait_time in seconds.
+        """
+        self._cond.acquire()
+        try:
+            return self._stats_snapshot()
+        finally:
+            self._cond.release()
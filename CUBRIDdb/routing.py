@@ -0,0 +1,270 @@
+"""
+This module implements read/write splitting. RoutingConnection sends
+read-only work to a pool of connections to replica brokers, and
+everything else to the master:
+
+    master = CUBRIDdb.connect('CUBRID:master:33000:demodb:::', 'public')
+    replicas = CUBRIDdb.pool.ConnectionPool(
+            'CUBRID:replica:33000:demodb:::', 'public', maxsize=10)
+    con = RoutingConnection(master, replicas)
+
+Read-only work is a SELECT outside of a transaction, or any statement
+run inside a read_only() block. A transaction starts with begin(), or
+with the first write to the master while autocommit is off, and ends
+with commit() or rollback(); reads made in it see its writes because
+they go to the master as well.
+
+Replicas may lag behind the master: a read following a write in
+autocommit mode can miss it, unless it is made in a transaction.
+
+"""
+import re
+import threading
+
+from CUBRIDdb import InterfaceError, ProgrammingError
+
+_comment = re.compile(r'\s*(?:--[^\n]*(?:\n|$)|/\*.*?\*/|//[^\n]*(?:\n|$))', re.S)
+_word = re.compile(r'[\s(]*([A-Za-z]+)')
+# SELECT ... FOR UPDATE, DML in a WITH clause, serials and session state
+_writes = re.compile(r'\b(?:insert|update|delete|merge|next_value|nextval'
+        r'|last_insert_id)\b', re.I)
+
+_read_keywords = frozenset(['select', 'with', 'show', 'desc', 'describe'])
+
+_cache = {}
+_cache_lock = threading.Lock()
+_cache_size = 4096
+
+
+def is_read_only(query):
+    """
+    Return whether a statement only reads data, from its leading
+    keyword. SELECTs that lock rows, use serials or contain DML are
+    treated as writes. Results are cached per SQL text.
+    """
+    result = _cache.get(query)
+    if result is not None:
+        return result
+
+    pos = 0
+    while True:
+        m = _comment.match(query, pos)
+        if m is None or m.end() == pos:
+            break
+        pos = m.end()
+    m = _word.match(query, pos)
+    result = (m is not None and m.group(1).lower() in _read_keywords
+              and _writes.search(query, m.end()) is None)
+
+    _cache_lock.acquire()
+    try:
+        if len(_cache) >= _cache_size:
+            _cache.clear()
+        _cache[query] = result
+    finally:
+        _cache_lock.release()
+    return result
+
+
+class _ReadOnlyBlock(object):
+
+    def __init__(self, con):
+        self._con = con
+
+    def __enter__(self):
+        self._con._enter_read_only()
+        return self._con
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._con._exit_read_only()
+
+
+class RoutingConnection(object):
+    """
+    A connection routing statements between a master Connection and a
+    CUBRIDdb.pool.ConnectionPool of replicas, see the module
+    documentation. Attributes it does not define are those of the
+    master.
+    """
+
+    def __init__(self, master, replicas):
+        self.master = master
+        self.replicas = replicas
+        self._in_transaction = False
+        self._restore_autocommit = False
+        self._local = threading.local()
+
+    def __getattr__(self, name):
+        return getattr(self.master, name)
+
+    @property
+    def in_transaction(self):
+        """True while reads go to the master to see the writes of a transaction."""
+        return self._in_transaction
+
+    def _enter_read_only(self):
+        depth = getattr(self._local, 'depth', 0)
+        if not depth:
+            self._local.replica = self.replicas.acquire()
+        self._local.depth = depth + 1
+
+    def _exit_read_only(self):
+        self._local.depth -= 1
+        if not self._local.depth:
+            replica, self._local.replica = self._local.replica, None
+            replica.close()
+
+    def _block_replica(self):
+        return getattr(self._local, 'replica', None)
+
+    def read_only(self):
+        """
+        Return a context manager in which the statements of this
+        connection's cursors go to one replica connection, held for the
+        whole block. Writes raise ProgrammingError there.
+        """
+        return _ReadOnlyBlock(self)
+
+    def cursor(self, dictCursor=None, cursorclass=None):
+        """
+        Return a new RoutingCursor, see Connection.cursor().
+        """
+        return RoutingCursor(self, dictCursor, cursorclass)
+
+    def begin(self):
+        """
+        Start a transaction on the master: autocommit is turned off and
+        reads go to the master until commit() or rollback(), which turn
+        autocommit back on.
+        """
+        if self.master.autocommit:
+            self.master.set_autocommit(False)
+            self._restore_autocommit = True
+        self._in_transaction = True
+
+    def _end(self):
+        self._in_transaction = False
+        if self._restore_autocommit:
+            self._restore_autocommit = False
+            self.master.set_autocommit(True)
+
+    def commit(self):
+        self.master.commit()
+        self._end()
+
+    def rollback(self):
+        self.master.rollback()
+        self._end()
+
+    def close(self):
+        """
+        Close the master connection. The replica pool is left open, as
+        it may be shared with other connections.
+        """
+        self.master.close()
+        self._in_transaction = False
+        self._restore_autocommit = False
+
+
+class RoutingCursor(object):
+    """
+    A cursor of a RoutingConnection. Every execute() picks the master or
+    a replica; the results are read from the cursor of that connection.
+    A replica connection is held until the next execute() or close().
+    """
+
+    def __init__(self, con, dictCursor=None, cursorclass=None):
+        self.con = con
+        self._dict_cursor = dictCursor
+        self._cursorclass = cursorclass
+        self._master_cursor = None
+        self._cursor = None
+        self._replica = None
+        self.arraysize = 1
+
+    def __getattr__(self, name):
+        if self._cursor is None:
+            raise AttributeError(name)
+        return getattr(self._cursor, name)
+
+    def _release(self):
+        if self._cursor is not None and self._cursor is not self._master_cursor:
+            self._cursor.close()
+        self._cursor = None
+        if self._replica is not None:
+            replica, self._replica = self._replica, None
+            replica.close()
+
+    def _route(self, query):
+        con = self.con
+        self._release()
+
+        replica = con._block_replica()
+        if replica is not None:
+            if not is_read_only(query):
+                raise ProgrammingError("write statement in a read-only block: %s" % query)
+        elif is_read_only(query) and not con._in_transaction:
+            replica = self._replica = con.replicas.acquire()
+        else:
+            if not con.master.autocommit:
+                con._in_transaction = True
+            if self._master_cursor is None:
+                self._master_cursor = con.master.cursor(self._dict_cursor,
+                        self._cursorclass)
+            self._cursor = self._master_cursor
+            return self._cursor
+
+        self._cursor = replica.cursor(self._dict_cursor, self._cursorclass)
+        return self._cursor
+
+    def _current(self):
+        if self._cursor is None:
+            raise InterfaceError("No statement has been executed.")
+        return self._cursor
+
+    @property
+    def description(self):
+        if self._cursor is None:
+            return None
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        if self._cursor is None:
+            return -1
+        return self._cursor.rowcount
+
+    @property
+    def on_master(self):
+        """True if the last statement went to the master."""
+        return self._cursor is not None and self._cursor is self._master_cursor
+
+    def execute(self, query, args=None, set_type=None):
+        cursor = self._route(query)
+        cursor.arraysize = self.arraysize
+        return cursor.execute(query, args, set_type)
+
+    def executemany(self, query, args):
+        cursor = self._route(query)
+        return cursor.executemany(query, args)
+
+    def fetchone(self):
+        return self._current().fetchone()
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        return self._current().fetchmany(size)
+
+    def fetchall(self):
+        return self._current().fetchall()
+
+    def __iter__(self):
+        return iter(self._current())
+
+    def close(self):
+        """Close the cursor and give back its replica connection."""
+        self._release()
+        if self._master_cursor is not None:
+            self._master_cursor.close()
+            self._master_cursor = None
@@ -113,6 +113,7 @@ class DatabaseFeatures(BaseDatabaseFeatures):
 
     can_introspect_small_integer_field = True
 
+    # CUBRID has no INSERT ... RETURNING, ids come from cursor.lastrowid
     can_return_id_from_insert = False
 
     can_rollback_ddl = True
@@ -256,6 +257,10 @@ class DatabaseOperations(BaseDatabaseOperations):
         return 9223372036854775807
 
     def last_insert_id(self, cursor, table_name, pk_name):
+        # The driver reads the generated id along with the INSERT.
+        if cursor.lastrowid is not None:
+            return cursor.lastrowid
+
         cursor.execute("SELECT LAST_INSERT_ID()")
         result = cursor.fetchone()
 
@@ -362,13 +367,9 @@ class DatabaseOperations(BaseDatabaseOperations):
         return converters
 
     def convert_binaryfield_value(self, value, expression, connection):
-        if not value.startswith('0B'):
-            raise ValueError('Unexpected value: %s' % value)
-        value = value[2:]
-        def gen_bytes():
-            for i in range(0, len(value), 8):
-                yield int(value[i:i + 8], 2)
-        value = bytes(gen_bytes())
+        # BIT and BIT VARYING columns are fetched as bytes
+        if value is not None:
+            value = bytes(value)
         return value
 
     def convert_textfield_value(self, value, expression, connection):
@@ -6,6 +6,7 @@
 #include <windows.h>
 #else
 #include <dlfcn.h>
+#include <time.h>
 #endif
 
 #ifndef Py_TYPE
@@ -35,6 +36,8 @@ static PyObject *_cubrid_programming_error;
 static PyObject *_cubrid_not_supported_error;
 
 static PyObject *_func_Decimal;
+static PyObject *_cubrid_array_type;
+static PyObject *_cubrid_adapters;
 
 static struct _cubrid_isolation
 {
@@ -109,6 +112,81 @@ static CCI_GET_LAST_INSERT_ID cci_get_last_insert_id_fp = NULL;
 typedef int Py_ssize_t;
 #endif
 
+/* Seconds from a monotonic clock, for the driver statistics. */
+static double
+_cubrid_monotonic (void)
+{
+#ifdef MS_WINDOWS
+  LARGE_INTEGER freq, now;
+
+  QueryPerformanceFrequency (&freq);
+  QueryPerformanceCounter (&now);
+  return (double) now.QuadPart / (double) freq.QuadPart;
+#else
+  struct timespec ts;
+
+  clock_gettime (CLOCK_MONOTONIC, &ts);
+  return (double) ts.tv_sec + (double) ts.tv_nsec / 1e9;
+#endif
+}
+
+/* Count a CCI call of the given phase that started at start, for the
+ * connection and, unless stats is NULL, for the cursor making it.
+ */
+static void
+_cubrid_stats_call (_cubrid_ConnectionObject * conn, _cubrid_stats * stats,
+		    int phase, double start)
+{
+  double elapsed = _cubrid_monotonic () - start;
+
+  conn->stats.calls[phase]++;
+  conn->stats.wait[phase] += elapsed;
+  if (stats)
+    {
+      stats->calls[phase]++;
+      stats->wait[phase] += elapsed;
+    }
+}
+
+/* Count a row of about bytes bytes, decoded since start. */
+static void
+_cubrid_stats_row (_cubrid_ConnectionObject * conn, _cubrid_stats * stats,
+		   long bytes, double start)
+{
+  double elapsed = _cubrid_monotonic () - start;
+
+  conn->stats.rows++;
+  conn->stats.bytes += bytes;
+  conn->stats.decode += elapsed;
+  stats->rows++;
+  stats->bytes += bytes;
+  stats->decode += elapsed;
+}
+
+static PyObject *
+_cubrid_stats_to_dict (_cubrid_stats * stats)
+{
+  return Py_BuildValue ("{s:{s:l,s:d},s:{s:l,s:d},s:{s:l,s:d},"
+			"s:{s:l,s:d},s:{s:l,s:d},s:l,s:l,s:d}",
+			"prepare",
+			"calls", stats->calls[CUBRID_STAT_PREPARE],
+			"wait", stats->wait[CUBRID_STAT_PREPARE],
+			"execute",
+			"calls", stats->calls[CUBRID_STAT_EXECUTE],
+			"wait", stats->wait[CUBRID_STAT_EXECUTE],
+			"fetch",
+			"calls", stats->calls[CUBRID_STAT_FETCH],
+			"wait", stats->wait[CUBRID_STAT_FETCH],
+			"cursor",
+			"calls", stats->calls[CUBRID_STAT_CURSOR],
+			"wait", stats->wait[CUBRID_STAT_CURSOR],
+			"end_tran",
+			"calls", stats->calls[CUBRID_STAT_END_TRAN],
+			"wait", stats->wait[CUBRID_STAT_END_TRAN],
+			"rows", stats->rows,
+			"bytes", stats->bytes, "decode", stats->decode);
+}
+
 static PyObject *
 _cubrid_return_PyUnicode_FromString (const char *buf, Py_ssize_t size,
 				     const char *encoding, const char *errors)
@@ -377,6 +455,243 @@ _cubrid_escape_string (PyObject * self, PyObject * args, PyObject * kwargs)
   return op;
 }
 
+/* Prepared statement cache. The request handles prepared by the cursors
+ * of a connection are kept open and handed out again when the same SQL
+ * text is prepared. When the cache is full the least recently used idle
+ * handle is closed.
+ */
+static unsigned long
+_cubrid_stmt_cache_hash (const char *sql)
+{
+  unsigned long hash = 5381;
+
+  while (*sql)
+    {
+      hash = hash * 33 + (unsigned char) *sql++;
+    }
+
+  return hash;
+}
+
+/* Drop entry i, closing its handle unless a cursor still uses it. The
+ * entry leaves the cache before the GIL is released to close the handle,
+ * so that other threads on the connection never see it.
+ */
+static void
+_cubrid_stmt_cache_remove (_cubrid_ConnectionObject * self, int i)
+{
+  _cubrid_stmt_cache_entry entry = self->stmt_cache[i];
+
+  self->stmt_cache[i] = self->stmt_cache[--self->stmt_cache_count];
+
+  if (!entry.in_use && self->handle > 0)
+    {
+      CUBRID_BEGIN_CCI (self);
+      cci_close_req_handle (entry.handle);
+      CUBRID_END_CCI (self);
+    }
+  free (entry.sql);
+}
+
+/* Index of the least recently used entry, idle ones first */
+static int
+_cubrid_stmt_cache_victim (_cubrid_ConnectionObject * self, int idle_only)
+{
+  _cubrid_stmt_cache_entry *entry;
+  int i, victim = -1;
+
+  for (i = 0; i < self->stmt_cache_count; i++)
+    {
+      entry = &self->stmt_cache[i];
+      if (idle_only && entry->in_use)
+	{
+	  continue;
+	}
+      if (victim < 0 || entry->last_used < self->stmt_cache[victim].last_used)
+	{
+	  victim = i;
+	}
+    }
+
+  return victim;
+}
+
+static int
+_cubrid_stmt_cache_resize (_cubrid_ConnectionObject * self, int size)
+{
+  _cubrid_stmt_cache_entry *cache;
+  int victim;
+
+  while (self->stmt_cache_count > size)
+    {
+      victim = _cubrid_stmt_cache_victim (self, 1);
+      if (victim < 0)
+	{
+	  victim = _cubrid_stmt_cache_victim (self, 0);
+	}
+      _cubrid_stmt_cache_remove (self, victim);
+    }
+
+  if (size == 0)
+    {
+      PyMem_Free (self->stmt_cache);
+      self->stmt_cache = NULL;
+    }
+  else
+    {
+      cache = PyMem_Realloc (self->stmt_cache,
+			     size * sizeof (_cubrid_stmt_cache_entry));
+      if (!cache)
+	{
+	  PyErr_NoMemory ();
+	  return -1;
+	}
+      self->stmt_cache = cache;
+    }
+  self->stmt_cache_size = size;
+
+  return 0;
+}
+
+/* Forget all entries. Their handles went away with the connection. */
+static void
+_cubrid_stmt_cache_clear (_cubrid_ConnectionObject * self)
+{
+  int i;
+
+  for (i = 0; i < self->stmt_cache_count; i++)
+    {
+      free (self->stmt_cache[i].sql);
+    }
+  self->stmt_cache_count = 0;
+}
+
+/* Return an idle handle prepared for sql and mark it in use, or 0 */
+static int
+_cubrid_stmt_cache_get (_cubrid_ConnectionObject * self, const char *sql)
+{
+  _cubrid_stmt_cache_entry *entry;
+  unsigned long hash;
+  int i;
+
+  if (self->stmt_cache_size <= 0)
+    {
+      return 0;
+    }
+
+  hash = _cubrid_stmt_cache_hash (sql);
+  for (i = 0; i < self->stmt_cache_count; i++)
+    {
+      entry = &self->stmt_cache[i];
+      if (!entry->in_use && entry->hash == hash && !strcmp (entry->sql, sql))
+	{
+	  entry->in_use = 1;
+	  entry->last_used = ++self->stmt_cache_clock;
+	  self->stmt_cache_hits++;
+	  return entry->handle;
+	}
+    }
+
+  self->stmt_cache_misses++;
+  return 0;
+}
+
+/* Keep a freshly prepared handle in the cache, marked in use */
+static void
+_cubrid_stmt_cache_add (_cubrid_ConnectionObject * self, const char *sql,
+			int handle)
+{
+  _cubrid_stmt_cache_entry *entry;
+  T_CCI_SQLX_CMD sql_type;
+  int victim, col_count;
+  char *copy;
+
+  if (self->stmt_cache_size <= 0)
+    {
+      return;
+    }
+
+  /* only DML and queries are worth keeping, DDL is run once */
+  cci_get_result_info (handle, &sql_type, &col_count);
+  switch (sql_type)
+    {
+    case SQLX_CMD_SELECT:
+    case SQLX_CMD_INSERT:
+    case SQLX_CMD_UPDATE:
+    case SQLX_CMD_DELETE:
+    case SQLX_CMD_CALL:
+      break;
+    default:
+      return;
+    }
+
+  if (self->stmt_cache_count >= self->stmt_cache_size)
+    {
+      victim = _cubrid_stmt_cache_victim (self, 1);
+      if (victim < 0)
+	{
+	  return;
+	}
+      _cubrid_stmt_cache_remove (self, victim);
+      /* another thread may have filled the slot while the GIL was free */
+      if (self->stmt_cache_count >= self->stmt_cache_size)
+	{
+	  return;
+	}
+    }
+
+  copy = strdup (sql);
+  if (!copy)
+    {
+      return;
+    }
+
+  entry = &self->stmt_cache[self->stmt_cache_count++];
+  entry->sql = copy;
+  entry->hash = _cubrid_stmt_cache_hash (sql);
+  entry->handle = handle;
+  entry->in_use = 1;
+  entry->last_used = ++self->stmt_cache_clock;
+}
+
+/* Stop caching a handle a cursor changed in a way the next user of the
+ * statement would not expect. The cursor closes it on reset.
+ */
+static void
+_cubrid_stmt_cache_forget (_cubrid_ConnectionObject * self, int handle)
+{
+  int i;
+
+  for (i = 0; i < self->stmt_cache_count; i++)
+    {
+      if (self->stmt_cache[i].in_use && self->stmt_cache[i].handle == handle)
+	{
+	  _cubrid_stmt_cache_remove (self, i);
+	  return;
+	}
+    }
+}
+
+/* Give a handle back to the cache. Return 0 if it is not cached and
+ * should be closed by the caller.
+ */
+static int
+_cubrid_stmt_cache_release (_cubrid_ConnectionObject * self, int handle)
+{
+  int i;
+
+  for (i = 0; i < self->stmt_cache_count; i++)
+    {
+      if (self->stmt_cache[i].in_use && self->stmt_cache[i].handle == handle)
+	{
+	  self->stmt_cache[i].in_use = 0;
+	  return 1;
+	}
+    }
+
+  return 0;
+}
+
 static PyObject *
 _cubrid_ConnectionObject_new (PyTypeObject * type, PyObject * args,
 			      PyObject * kwargs)
@@ -389,6 +704,13 @@ _cubrid_ConnectionObject_new (PyTypeObject * type, PyObject * args,
       return NULL;
     }
 
+  self->lock = PyThread_allocate_lock ();
+  if (!self->lock)
+    {
+      Py_DECREF (self);
+      return PyErr_NoMemory ();
+    }
+
   return (PyObject *) self;
 }
 
@@ -401,7 +723,7 @@ _cubrid_ConnectionObject_init (_cubrid_ConnectionObject * self,
   char *user = "public";
   char *passwd = "";
   char buf[1024] = { '\0' };
-  int con, res, level, autocommit, lock_timeout, max_string_len;
+  int con, res;
   T_CCI_ERROR error;
 
   if (!PyArg_ParseTupleAndKeywords (args, kwargs,
@@ -417,7 +739,9 @@ _cubrid_ConnectionObject_init (_cubrid_ConnectionObject * self,
 
   snprintf (buf, 1024, "cci:%s", url);
 
+  Py_BEGIN_ALLOW_THREADS
   con = cci_connect_with_url_ex (buf, user, passwd, &error);
+  Py_END_ALLOW_THREADS
   if (con < 0)
     {
       handle_error (con, &error);
@@ -425,7 +749,9 @@ _cubrid_ConnectionObject_init (_cubrid_ConnectionObject * self,
     }
 
   self->handle = con;
+  CUBRID_BEGIN_CCI (self);
   res = cci_set_autocommit (self->handle, CCI_AUTOCOMMIT_TRUE);
+  CUBRID_END_CCI (self);
   if (res < 0)
     {
       handle_error (res, &error);
@@ -434,70 +760,16 @@ _cubrid_ConnectionObject_init (_cubrid_ConnectionObject * self,
   self->url = strdup (url);
   self->user = strdup (user);
 
-  res =
-    cci_get_db_parameter (con, CCI_PARAM_LOCK_TIMEOUT, (void *) &lock_timeout,
-			  &error);
-  if (res < 0)
-    {
-      handle_error (res, &error);
-      return -1;
-    }
-
-  self->lock_timeout = _cubrid_return_PyInt_FromLong (lock_timeout);
-
-  res =
-    cci_get_db_parameter (con, CCI_PARAM_MAX_STRING_LENGTH,
-			  (void *) &max_string_len, &error);
-  if (res < 0)
-    {
-      //handle_error (res, &error);
-      //return -1;
-      max_string_len = 0;
-    }
-
-  self->max_string_len = _cubrid_return_PyInt_FromLong (max_string_len);
-
-  res =
-    cci_get_db_parameter (con, CCI_PARAM_ISOLATION_LEVEL, (void *) &level,
-			  &error);
-  if (res < 0)
-    {
-      handle_error (res, &error);
-      return -1;
-    }
-
-  res =
-    cci_get_db_parameter (con, CCI_PARAM_AUTO_COMMIT, (void *) &autocommit,
-			  &error);
-  if (res < 0)
-    {
-      handle_error (res, &error);
-      return -1;
-    }
-
-  if (level - 1 < TRAN_REP_CLASS_COMMIT_INSTANCE
-      || level - 1 > TRAN_SERIALIZABLE)
-    {
-      level = TRAN_SERIALIZABLE + 1;
-    }
-
-  self->isolation_level =
-    _cubrid_return_PyString_FromString (cubrid_isolation
-					[level - 4].isolation);
-  if (autocommit == CCI_AUTOCOMMIT_TRUE)
-    {
-      self->autocommit = _cubrid_return_PyBool_FromLong (1);
-    }
-  else
-    {
-      self->autocommit = _cubrid_return_PyBool_FromLong (0);
-    }
-  res = cci_end_tran (con, CCI_TRAN_COMMIT, &error);
-  if (res < 0)
-    {
-      handle_error (res, &error);
-      return -1;
-    }
+  /* autocommit was just set; the other session parameters are read
+   * from the server when they are first used */
+  self->autocommit = _cubrid_return_PyBool_FromLong (1);
+  self->isolation_level = NULL;
+  self->max_string_len = NULL;
+  self->lock_timeout = NULL;
+  self->pending_isolation = 0;
+  self->server_isolation = 0;
+  self->has_pending_lock_timeout = 0;
+  self->has_server_lock_timeout = 0;
 
   return 0;
 };
@@ -638,7 +910,9 @@ _cubrid_ConnectionObject_end_tran (_cubrid_ConnectionObject * self, int type)
   int res;
   T_CCI_ERROR error;
 
+  CUBRID_BEGIN_CCI_STAT (self);
   res = cci_end_tran (self->handle, type, &error);
+  CUBRID_END_CCI_STAT (self, NULL, CUBRID_STAT_END_TRAN);
   if (res < 0)
     {
       return handle_error (res, &error);
@@ -705,7 +979,9 @@ _cubrid_ConnectionObject_server_version (_cubrid_ConnectionObject * self,
       return NULL;
     }
 
+  CUBRID_BEGIN_CCI (self);
   res = cci_get_db_version (self->handle, db_ver, sizeof (db_ver));
+  CUBRID_END_CCI (self);
   if (res < 0)
     {
       return handle_error (res, NULL);
@@ -769,27 +1045,26 @@ _cubrid_ConnectionObject_set_autocommit (_cubrid_ConnectionObject * self,
       return handle_error (CUBRID_ER_INVALID_PARAM, NULL);
     }
   mode = PyObject_IsTrue (autocommit_obj);
-  if (mode != 0)
-    {
-      res = cci_set_autocommit (self->handle, CCI_AUTOCOMMIT_TRUE);
-      if (res < 0)
-	{
-	  return handle_error (res, NULL);
-	}
 
-      self->autocommit = _cubrid_return_PyBool_FromLong (1);
-    }
-  else
+  /* nothing to send when the mode does not change */
+  if (self->autocommit && PyObject_IsTrue (self->autocommit) == mode)
     {
-      res = cci_set_autocommit (self->handle, CCI_AUTOCOMMIT_FALSE);
-      if (res < 0)
-	{
-	  return handle_error (res, NULL);
-	}
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
 
-      self->autocommit = _cubrid_return_PyBool_FromLong (0);
+  CUBRID_BEGIN_CCI (self);
+  res = cci_set_autocommit (self->handle,
+			    mode ? CCI_AUTOCOMMIT_TRUE : CCI_AUTOCOMMIT_FALSE);
+  CUBRID_END_CCI (self);
+  if (res < 0)
+    {
+      return handle_error (res, NULL);
     }
 
+  Py_XDECREF (self->autocommit);
+  self->autocommit = _cubrid_return_PyBool_FromLong (mode);
+
   Py_INCREF (Py_None);
   return Py_None;
 }
@@ -798,7 +1073,8 @@ static char _cubrid_ConnectionObject_set_isolation_level__doc__[] =
   "set_isolation(isolation_level)\n\
 Set the transaction isolation level for the current session.\n\
 The level defines the different phenomena can happen in the\n\
-database between concurrent transactions.\n\
+database between concurrent transactions. The level is sent to the\n\
+server with the next statement, unless it is already in effect.\n\
 \n\
 isolation_level maybe::\n\
   CUBRID_REP_CLASS_COMMIT_INSTANCE\n\
@@ -817,20 +1093,28 @@ static PyObject *
 _cubrid_ConnectionObject_set_isolation_level (_cubrid_ConnectionObject * self,
 					      PyObject * args)
 {
-  int level, res;
-  T_CCI_ERROR error;
+  int level;
 
   if (!PyArg_ParseTuple (args, "i", &level))
     {
       return NULL;
     }
 
-  res = cci_set_isolation_level (self->handle, level, &error);
-  if (res < 0)
+  if (level < TRAN_REP_CLASS_COMMIT_INSTANCE || level > TRAN_SERIALIZABLE)
     {
-      return handle_error (res, &error);
+      return handle_error (CUBRID_ER_INVALID_PARAM, NULL);
     }
 
+  /* sent to the server with the next statement, if it changes */
+  if (level == self->server_isolation)
+    {
+      self->pending_isolation = 0;
+    }
+  else
+    {
+      self->pending_isolation = level;
+    }
+  Py_XDECREF (self->isolation_level);
   self->isolation_level =
     _cubrid_return_PyString_FromString (cubrid_isolation
 					[level - 4].isolation);
@@ -839,82 +1123,410 @@ _cubrid_ConnectionObject_set_isolation_level (_cubrid_ConnectionObject * self,
   return Py_None;
 }
 
-static char _cubrid_ConnectionObject_ping__doc__[] = "ping()\n\
-Checks whether or not the connection to the server is working. This \n\
-function can be used by clients that remain idle for a long while,\n\
-to check whether or not the server has closed the connection and reconnect\n\
-if necessary.\n\
-\n\
-Return values::\n\
-  1 when connected\n\
-  0 when not connect\n\
+static char _cubrid_ConnectionObject_set_lock_timeout__doc__[] =
+  "set_lock_timeout(timeout)\n\
+Set how many milliseconds the statements of the session wait for a\n\
+lock: -1 waits forever, 0 does not wait. The timeout is sent to the\n\
+server with the next statement, unless it is already in effect.\n\
 \n\
 Example::\n\
   import _cubrid\n\
   con = _cubrid.connect(\"CUBRID:localhost:33000:demodb:::\", \"public\")\n\
-  print con.ping()\n\
+  con.set_lock_timeout(5000)\n\
+  print con.lock_timeout\n\
   con.close()";
 
 static PyObject *
-_cubrid_ConnectionObject_ping (_cubrid_ConnectionObject * self,
-			       PyObject * args)
+_cubrid_ConnectionObject_set_lock_timeout (_cubrid_ConnectionObject * self,
+					   PyObject * args)
 {
-  int res;
-  T_CCI_ERROR error;
-  char *query = "select 1+1 from db_root";
-  int req_handle = 0, result = 0, ind = 0;
-  int connected = 0;
+  int timeout;
 
-  if (!PyArg_ParseTuple (args, ""))
+  if (!PyArg_ParseTuple (args, "i", &timeout))
     {
       return NULL;
     }
 
-  res = cci_prepare (self->handle, query, 0, &error);
-  if (res < 0)
+  if (timeout < -1)
     {
-      return handle_error (res, &error);
+      return handle_error (CUBRID_ER_INVALID_PARAM, NULL);
     }
 
-  req_handle = res;
-
-  res = cci_execute (req_handle, 0, 0, &error);
-  if (res < 0)
+  /* sent to the server with the next statement, if it changes */
+  if (self->has_server_lock_timeout && timeout == self->server_lock_timeout)
     {
-      return handle_error (res, &error);
+      self->has_pending_lock_timeout = 0;
     }
-
-  while (1)
+  else
     {
-      res = cci_cursor (req_handle, 1, CCI_CURSOR_CURRENT, &error);
-      if (res == CCI_ER_NO_MORE_DATA)
-	{
-	  break;
-	}
-      if (res < 0)
-	{
-	  return handle_error (res, &error);
-	}
+      self->pending_lock_timeout = timeout;
+      self->has_pending_lock_timeout = 1;
+    }
+  Py_XDECREF (self->lock_timeout);
+  self->lock_timeout = _cubrid_return_PyInt_FromLong (timeout);
+
+  Py_INCREF (Py_None);
+  return Py_None;
+}
+
+/* Send the session changes deferred until a statement needs them.
+ * Changes made several times before that are sent once, with their
+ * last value. Return -1 with an exception set on error.
+ */
+static int
+_cubrid_ConnectionObject_apply_pending (_cubrid_ConnectionObject * self)
+{
+  int res, level, timeout;
+  T_CCI_ERROR error;
+
+  if (self->pending_isolation)
+    {
+      level = self->pending_isolation;
+      self->pending_isolation = 0;
 
-      res = cci_fetch (req_handle, &error);
+      CUBRID_BEGIN_CCI (self);
+      res = cci_set_isolation_level (self->handle, level, &error);
+      CUBRID_END_CCI (self);
       if (res < 0)
 	{
-	  return handle_error (res, &error);
+	  self->server_isolation = 0;
+	  Py_CLEAR (self->isolation_level);
+	  handle_error (res, &error);
+	  return -1;
 	}
+      self->server_isolation = level;
+    }
+
+  if (self->has_pending_lock_timeout)
+    {
+      timeout = self->pending_lock_timeout;
+      self->has_pending_lock_timeout = 0;
 
-      res = cci_get_data (req_handle, 1, CCI_A_TYPE_INT, &result, &ind);
+      CUBRID_BEGIN_CCI (self);
+      res = cci_set_db_parameter (self->handle, CCI_PARAM_LOCK_TIMEOUT,
+				  (void *) &timeout, &error);
+      CUBRID_END_CCI (self);
       if (res < 0)
 	{
-	  return handle_error (res, &error);
+	  self->has_server_lock_timeout = 0;
+	  Py_CLEAR (self->lock_timeout);
+	  handle_error (res, &error);
+	  return -1;
+	}
+      self->server_lock_timeout = timeout;
+      self->has_server_lock_timeout = 1;
+    }
+
+  return 0;
+}
+
+/* Read a session parameter from the server. */
+static int
+_cubrid_ConnectionObject_get_db_parameter (_cubrid_ConnectionObject * self,
+					   int param, int *value)
+{
+  int res;
+  T_CCI_ERROR error;
+
+  CUBRID_BEGIN_CCI (self);
+  res = cci_get_db_parameter (self->handle, param, (void *) value, &error);
+  CUBRID_END_CCI (self);
+  if (res < 0)
+    {
+      handle_error (res, &error);
+    }
+
+  return res;
+}
+
+static PyObject *
+_cubrid_ConnectionObject_get_isolation_level (_cubrid_ConnectionObject *
+					      self, void *closure)
+{
+  int level;
+
+  if (!self->isolation_level && self->handle > 0)
+    {
+      if (_cubrid_ConnectionObject_get_db_parameter
+	  (self, CCI_PARAM_ISOLATION_LEVEL, &level) < 0)
+	{
+	  return NULL;
+	}
+
+      if (level - 1 < TRAN_REP_CLASS_COMMIT_INSTANCE
+	  || level - 1 > TRAN_SERIALIZABLE)
+	{
+	  level = TRAN_SERIALIZABLE + 1;
+	}
+      /* known to be in effect, setting it again is skipped */
+      if (level <= TRAN_SERIALIZABLE)
+	{
+	  self->server_isolation = level;
+	}
+      self->isolation_level =
+	_cubrid_return_PyString_FromString (cubrid_isolation
+					    [level - 4].isolation);
+    }
+
+  if (!self->isolation_level)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+  Py_INCREF (self->isolation_level);
+  return self->isolation_level;
+}
+
+static PyObject *
+_cubrid_ConnectionObject_get_lock_timeout (_cubrid_ConnectionObject * self,
+					   void *closure)
+{
+  int lock_timeout;
+
+  if (!self->lock_timeout && self->handle > 0)
+    {
+      if (_cubrid_ConnectionObject_get_db_parameter
+	  (self, CCI_PARAM_LOCK_TIMEOUT, &lock_timeout) < 0)
+	{
+	  return NULL;
+	}
+      self->server_lock_timeout = lock_timeout;
+      self->has_server_lock_timeout = 1;
+      self->lock_timeout = _cubrid_return_PyInt_FromLong (lock_timeout);
+    }
+
+  if (!self->lock_timeout)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+  Py_INCREF (self->lock_timeout);
+  return self->lock_timeout;
+}
+
+static PyObject *
+_cubrid_ConnectionObject_get_max_string_len (_cubrid_ConnectionObject *
+					     self, void *closure)
+{
+  int max_string_len;
+
+  if (!self->max_string_len && self->handle > 0)
+    {
+      if (_cubrid_ConnectionObject_get_db_parameter
+	  (self, CCI_PARAM_MAX_STRING_LENGTH, &max_string_len) < 0)
+	{
+	  /* not every server knows this parameter */
+	  PyErr_Clear ();
+	  max_string_len = 0;
 	}
+      self->max_string_len = _cubrid_return_PyInt_FromLong (max_string_len);
+    }
+
+  if (!self->max_string_len)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+  Py_INCREF (self->max_string_len);
+  return self->max_string_len;
+}
+
+static char _cubrid_ConnectionObject_set_stmt_cache_size__doc__[] =
+  "set_stmt_cache_size(size)\n\
+Set how many prepared statements the connection keeps open for reuse.\n\
+When a cursor prepares SQL text found in the cache, the prepared\n\
+request handle is reused instead of preparing it again on the server.\n\
+Only queries and DML statements are cached. When the cache is full the\n\
+least recently used statement is closed. A size of 0, the default,\n\
+disables the cache.\n\
+\n\
+Example::\n\
+  import _cubrid\n\
+  con = _cubrid.connect(\"CUBRID:localhost:33000:demodb:::\", \"public\")\n\
+  con.set_stmt_cache_size(64)\n\
+  con.close()";
+
+static PyObject *
+_cubrid_ConnectionObject_set_stmt_cache_size (_cubrid_ConnectionObject *
+					      self, PyObject * args)
+{
+  int size;
+
+  if (!PyArg_ParseTuple (args, "i", &size))
+    {
+      return NULL;
+    }
+
+  if (size < 0)
+    {
+      PyErr_SetString (PyExc_ValueError,
+		       "statement cache size must not be negative");
+      return NULL;
+    }
+
+  if (_cubrid_stmt_cache_resize (self, size) < 0)
+    {
+      return NULL;
+    }
+
+  Py_INCREF (Py_None);
+  return Py_None;
+}
+
+static char _cubrid_ConnectionObject_stmt_cache_info__doc__[] =
+  "stmt_cache_info()\n\
+Return a dict describing the prepared statement cache, with the keys\n\
+size, count, hits and misses.";
+
+static PyObject *
+_cubrid_ConnectionObject_stmt_cache_info (_cubrid_ConnectionObject * self,
+					  PyObject * args)
+{
+  if (!PyArg_ParseTuple (args, ""))
+    {
+      return NULL;
+    }
+
+  return Py_BuildValue ("{s:i,s:i,s:l,s:l}",
+			"size", self->stmt_cache_size,
+			"count", self->stmt_cache_count,
+			"hits", self->stmt_cache_hits,
+			"misses", self->stmt_cache_misses);
+}
+
+static char _cubrid_ConnectionObject_set_stats_enabled__doc__[] =
+  "set_stats_enabled(flag)\n\
+Turn the driver statistics of the connection and its cursors on or off.\n\
+They are off by default; the counters keep their values while off.";
+
+static PyObject *
+_cubrid_ConnectionObject_set_stats_enabled (_cubrid_ConnectionObject * self,
+					    PyObject * args)
+{
+  PyObject *flag;
+
+  if (!PyArg_ParseTuple (args, "O", &flag))
+    {
+      return NULL;
+    }
+
+  self->stats_enabled = PyObject_IsTrue (flag) ? 1 : 0;
 
-      if (result == 2)
+  Py_INCREF (Py_None);
+  return Py_None;
+}
+
+static char _cubrid_ConnectionObject_stats__doc__[] = "stats()\n\
+Return a dict of the driver statistics of the connection. The keys\n\
+prepare, execute, fetch, cursor and end_tran hold dicts with calls, the\n\
+number of such CCI calls, and wait, the seconds spent in them with the\n\
+GIL released. rows is the number of rows decoded, bytes their\n\
+approximate size and decode the seconds spent decoding them.";
+
+static PyObject *
+_cubrid_ConnectionObject_stats (_cubrid_ConnectionObject * self,
+				PyObject * args)
+{
+  if (!PyArg_ParseTuple (args, ""))
+    {
+      return NULL;
+    }
+
+  return _cubrid_stats_to_dict (&self->stats);
+}
+
+static char _cubrid_ConnectionObject_reset_stats__doc__[] =
+  "reset_stats()\n\
+Set the driver statistics of the connection back to zero.";
+
+static PyObject *
+_cubrid_ConnectionObject_reset_stats (_cubrid_ConnectionObject * self,
+				      PyObject * args)
+{
+  if (!PyArg_ParseTuple (args, ""))
+    {
+      return NULL;
+    }
+
+  memset (&self->stats, 0, sizeof (self->stats));
+
+  Py_INCREF (Py_None);
+  return Py_None;
+}
+
+static char _cubrid_ConnectionObject_ping__doc__[] = "ping()\n\
+Checks whether or not the connection to the server is working. This \n\
+function can be used by clients that remain idle for a long while,\n\
+to check whether or not the server has closed the connection and reconnect\n\
+if necessary.\n\
+\n\
+Return values::\n\
+  1 when connected\n\
+  0 when not connect\n\
+\n\
+Example::\n\
+  import _cubrid\n\
+  con = _cubrid.connect(\"CUBRID:localhost:33000:demodb:::\", \"public\")\n\
+  print con.ping()\n\
+  con.close()";
+
+static PyObject *
+_cubrid_ConnectionObject_ping (_cubrid_ConnectionObject * self,
+			       PyObject * args)
+{
+  int res;
+  T_CCI_ERROR error;
+  char *query = "select 1+1 from db_root";
+  int req_handle = 0, result = 0, ind = 0;
+  int connected = 0;
+
+  if (!PyArg_ParseTuple (args, ""))
+    {
+      return NULL;
+    }
+
+  CUBRID_BEGIN_CCI (self);
+  res = cci_prepare (self->handle, query, 0, &error);
+  if (res >= 0)
+    {
+      req_handle = res;
+
+      res = cci_execute (req_handle, 0, 0, &error);
+      while (res >= 0)
 	{
-	  connected = 1;
+	  res = cci_cursor (req_handle, 1, CCI_CURSOR_CURRENT, &error);
+	  if (res < 0)
+	    {
+	      break;
+	    }
+
+	  res = cci_fetch (req_handle, &error);
+	  if (res < 0)
+	    {
+	      break;
+	    }
+
+	  res = cci_get_data (req_handle, 1, CCI_A_TYPE_INT, &result, &ind);
+	  if (res < 0)
+	    {
+	      break;
+	    }
+
+	  if (result == 2)
+	    {
+	      connected = 1;
+	    }
 	}
+
+      cci_close_req_handle (req_handle);
+    }
+  CUBRID_END_CCI (self);
+
+  if (res < 0 && res != CCI_ER_NO_MORE_DATA)
+    {
+      return handle_error (res, &error);
     }
 
-  cci_close_req_handle (req_handle);
   return _cubrid_return_PyInt_FromLong (connected);
 }
 
@@ -1011,7 +1623,15 @@ _cubrid_ConnectionObject_batch_execute (_cubrid_ConnectionObject * self,
       p_value = PyTuple_GET_ITEM (p_tube, i);
       sql[i] = PyString_AsString (p_value);
     }
+  if (_cubrid_ConnectionObject_apply_pending (self) < 0)
+    {
+      free (sql);
+      return NULL;
+    }
+  CUBRID_BEGIN_CCI_STAT (self);
   n_executed = cci_execute_batch (self->handle, count, sql, &result, &cci_error);
+  CUBRID_END_CCI_STAT (self, NULL, CUBRID_STAT_EXECUTE);
+  self->executed++;
   if (n_executed < 0)
     {
       free(sql);
@@ -1079,7 +1699,9 @@ _cubrid_ConnectionObject_last_insert_id (_cubrid_ConnectionObject * self,
   T_CCI_ERROR error;
 
   /* cci_last_id set last_id as allocated string */
+  CUBRID_BEGIN_CCI (self);
   res = cci_get_last_insert_id (self->handle, &name, &error);
+  CUBRID_END_CCI (self);
 
   if (res < 0)
     {
@@ -1324,9 +1946,11 @@ _cubrid_ConnectionObject_schema_info (_cubrid_ConnectionObject * self,
       break;
     }
 
+  CUBRID_BEGIN_CCI (self);
   res =
     cci_schema_info (self->handle, type, class_name, attr_name, (char) flag,
 		     &error);
+  CUBRID_END_CCI (self);
   if (res < 0)
     {
       return handle_error (res, &error);
@@ -1340,7 +1964,9 @@ _cubrid_ConnectionObject_schema_info (_cubrid_ConnectionObject * self,
       return handle_error (CUBRID_ER_CANNOT_GET_COLUMN_INFO, NULL);
     }
 
+  CUBRID_BEGIN_CCI_STAT (self);
   res = cci_cursor (request, 1, CCI_CURSOR_CURRENT, &error);
+  CUBRID_END_CCI_STAT (self, NULL, CUBRID_STAT_CURSOR);
   if (res == CCI_ER_NO_MORE_DATA)
     {
       Py_INCREF (Py_None);
@@ -1351,7 +1977,9 @@ _cubrid_ConnectionObject_schema_info (_cubrid_ConnectionObject * self,
       return handle_error (res, &error);
     }
 
+  CUBRID_BEGIN_CCI_STAT (self);
   res = cci_fetch (request, &error);
+  CUBRID_END_CCI_STAT (self, NULL, CUBRID_STAT_FETCH);
   if (res < 0)
     {
       return handle_error (res, &error);
@@ -1361,13 +1989,17 @@ _cubrid_ConnectionObject_schema_info (_cubrid_ConnectionObject * self,
     _cubrid_ConnectionObject_fetch_schema (self, request, col_info,
 					   col_count);
 
+  CUBRID_BEGIN_CCI_STAT (self);
   res = cci_cursor (request, 1, CCI_CURSOR_CURRENT, &error);
+  CUBRID_END_CCI_STAT (self, NULL, CUBRID_STAT_CURSOR);
   if (res < 0 && res != CCI_ER_NO_MORE_DATA)
     {
       return handle_error (res, &error);
     }
 
+  CUBRID_BEGIN_CCI (self);
   cci_close_req_handle (request);
+  CUBRID_END_CCI (self);
 
   return result;
 }
@@ -1437,12 +2069,15 @@ _cubrid_ConnectionObject_close (_cubrid_ConnectionObject * self,
       Py_INCREF (Py_None);
       return Py_None;
     }
+  CUBRID_BEGIN_CCI (self);
   err_code = cci_disconnect (self->handle, &error);
+  CUBRID_END_CCI (self);
   if (err_code < 0)
     {
       return handle_error (err_code, &error);
     }
   self->handle = 0;
+  _cubrid_stmt_cache_clear (self);
   if (self->url)
     {
       free (self->url);
@@ -1467,6 +2102,50 @@ _cubrid_ConnectionObject_close (_cubrid_ConnectionObject * self,
       self->autocommit = NULL;
     }
 
+  Py_CLEAR (self->lock_timeout);
+  Py_CLEAR (self->max_string_len);
+  self->pending_isolation = 0;
+  self->server_isolation = 0;
+  self->has_pending_lock_timeout = 0;
+  self->has_server_lock_timeout = 0;
+
+  Py_INCREF (Py_None);
+  return Py_None;
+}
+
+static char _cubrid_ConnectionObject__detach__doc__[] =
+  "Only used internally. This function should not be used by user.";
+
+/* Drop the CCI handle without disconnecting. After fork() the socket
+ * is shared with the parent process, which still uses the session.
+ */
+static PyObject *
+_cubrid_ConnectionObject__detach (_cubrid_ConnectionObject * self,
+				  PyObject * args)
+{
+  if (!PyArg_ParseTuple (args, ""))
+    {
+      return NULL;
+    }
+
+  self->handle = 0;
+  _cubrid_stmt_cache_clear (self);
+
+  free (self->url);
+  self->url = NULL;
+  free (self->user);
+  self->user = NULL;
+
+  /* close() does nothing once the handle is 0, release them here */
+  Py_CLEAR (self->isolation_level);
+  Py_CLEAR (self->autocommit);
+  Py_CLEAR (self->lock_timeout);
+  Py_CLEAR (self->max_string_len);
+  self->pending_isolation = 0;
+  self->server_isolation = 0;
+  self->has_pending_lock_timeout = 0;
+  self->has_server_lock_timeout = 0;
+
   Py_INCREF (Py_None);
   return Py_None;
 }
@@ -1479,6 +2158,14 @@ _cubrid_ConnectionObject_dealloc (_cubrid_ConnectionObject * self)
   o = _cubrid_ConnectionObject_close (self, NULL);
   Py_XDECREF (o);
 
+  _cubrid_stmt_cache_clear (self);
+  PyMem_Free (self->stmt_cache);
+
+  if (self->lock)
+    {
+      PyThread_free_lock (self->lock);
+    }
+
   Py_TYPE (self)->tp_free ((PyObject *) self);
 }
 
@@ -1513,19 +2200,57 @@ _cubrid_CursorObject_init (_cubrid_CursorObject * self, PyObject * args,
   self->state = CURSOR_STATE_OPENED;
   self->handle = 0;
   self->connection = conn->handle;
-  Py_INCREF (Py_None);
-  self->description = Py_None;
+  self->conn = conn;
+  self->description = NULL;
   self->bind_num = -1;
+  self->bound = NULL;
   self->col_count = -1;
   self->sql_type = 0;
   self->row_count = -1;
   self->cursor_pos = 0;
+  self->fetch_type = 0;
+  self->fetch_size = 0;
+  self->fetch_target = CUBRID_FETCH_TARGET_DEFAULT;
+  self->fetch_batch = 0;
+  self->fetch_batch_left = 0;
+  self->row_width = 0;
+  self->rows_fetched = 0;
+  self->round_trips = 0;
+  self->forward_only = 0;
+  self->lastrowid = NULL;
+  self->lastrowid_stmt = 0;
+  self->numeric_type = CUBRID_NUMERIC_AS_DECIMAL;
+  self->col_info = NULL;
+  self->columns = NULL;
+  self->n_columns = 0;
+  self->row_index = NULL;
+  self->bind_refs = NULL;
+  memset (&self->stats, 0, sizeof (self->stats));
 
   memset (self->charset, 0, sizeof (self->charset));
 
   return 0;
 }
 
+static void
+_cubrid_CursorObject_free_columns (_cubrid_CursorObject * self)
+{
+  int i;
+
+  if (self->columns)
+    {
+      for (i = 0; i < self->n_columns; i++)
+	{
+	  Py_XDECREF (self->columns[i].key);
+	}
+      PyMem_Free (self->columns);
+      self->columns = NULL;
+    }
+  self->n_columns = 0;
+  Py_CLEAR (self->row_index);
+  Py_CLEAR (self->description);
+}
+
 static char _cubrid_CursorObject__set_charset_name__doc__[] =
   "Only used internally. This function should not be used by user.";
 
@@ -1547,6 +2272,7 @@ _cubrid_CursorObject__set_charset_name (_cubrid_CursorObject * self,
   if (charset != NULL && *charset != '\0')
     {
       snprintf (self->charset, sizeof (self->charset), "%s", charset);
+      _cubrid_CursorObject_free_columns (self);
     }
 
   Py_INCREF (Py_None);
@@ -1560,14 +2286,17 @@ _cubrid_CursorObject_reset (_cubrid_CursorObject * self)
 {
   if (self->handle)
     {
-      cci_close_req_handle (self->handle);
-      self->handle = 0;
-
-      if (self->description)
+      if (!_cubrid_stmt_cache_release (self->conn, self->handle))
 	{
-	  Py_DECREF (self->description);
-	  self->description = NULL;
+	  CUBRID_BEGIN_CCI (self->conn);
+	  cci_close_req_handle (self->handle);
+	  CUBRID_END_CCI (self->conn);
 	}
+      self->handle = 0;
+      Py_CLEAR (self->bind_refs);
+      PyMem_Free (self->bound);
+      self->bound = NULL;
+
       self->bind_num = -1;
       self->col_count = -1;
       self->sql_type = 0;
@@ -1576,7 +2305,34 @@ _cubrid_CursorObject_reset (_cubrid_CursorObject * self)
     }
 }
 
-static char _cubrid_CursorObject_prepare__doc__[] = "prepare(sql)\n\
+static void
+_cubrid_CursorObject_set_bound (_cubrid_CursorObject * self, int index)
+{
+  if (self->bound && index >= 1 && index <= self->bind_num)
+    {
+      self->bound[index - 1] = 1;
+    }
+}
+
+/* Fail unless every parameter was bound since prepare() */
+static int
+_cubrid_CursorObject_check_bound (_cubrid_CursorObject * self)
+{
+  int i;
+
+  for (i = 0; self->bound && i < self->bind_num; i++)
+    {
+      if (!self->bound[i])
+	{
+	  handle_error (CUBRID_ER_PARAM_UNBIND, NULL);
+	  return -1;
+	}
+    }
+
+  return 0;
+}
+
+static char _cubrid_CursorObject_prepare__doc__[] = "prepare(sql)\n\
 This function creates a prepared statement. A prepared statement is a\n\
 server-side object that can be used to optimize performance. You can \n\
 use this statement effectively to execute repeatedly or to process \n\
@@ -1605,13 +2361,43 @@ _cubrid_CursorObject_prepare (_cubrid_CursorObject * self, PyObject * args)
     }
 
   _cubrid_CursorObject_reset (self);
-  res = cci_prepare (self->connection, stmt, 0, &error);
-  if (res < 0)
+  if (_cubrid_ConnectionObject_apply_pending (self->conn) < 0)
     {
-      return handle_error (res, &error);
+      return NULL;
+    }
+  res = _cubrid_stmt_cache_get (self->conn, stmt);
+  if (!res)
+    {
+      CUBRID_BEGIN_CCI_STAT (self->conn);
+      res = cci_prepare (self->conn->handle, stmt, 0, &error);
+      CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_PREPARE);
+      if (res < 0)
+	{
+	  return handle_error (res, &error);
+	}
+      _cubrid_stmt_cache_add (self->conn, stmt, res);
     }
   self->handle = res;
   self->bind_num = cci_get_bind_num (res);
+  /* a cached handle keeps the values bound by its previous user, those
+   * of this cursor are tracked so that execute() can refuse the others */
+  if (self->bind_num > 0)
+    {
+      self->bound = PyMem_Malloc (self->bind_num);
+      if (!self->bound)
+	{
+	  return PyErr_NoMemory ();
+	}
+      memset (self->bound, 0, self->bind_num);
+    }
+  if (self->fetch_size > 0)
+    {
+      cci_fetch_size (res, self->fetch_size);
+    }
+  else if (self->fetch_target > 0)
+    {
+      cci_fetch_size (res, CUBRID_FETCH_SIZE_INITIAL);
+    }
   Py_INCREF (Py_None);
   return Py_None;
 }
@@ -1644,15 +2430,31 @@ The following shows the types of substitute values::\n\
 \n\
 Parameters::\n\
   index: int, index for binding\n\
-  value: string, actual value for binding\n\
+  value: string, actual value for binding. bytes and bytearray values\n\
+         are bound as BIT VARYING, or BIT if bind_type says so\n\
   bind_type(optional):column type of database \n";
 
+/* bytes (Python 3) and bytearray values are bound as BIT VARYING */
+static int
+_cubrid_is_binary (PyObject * o)
+{
+#if PY_MAJOR_VERSION >= 3
+  if (PyBytes_Check (o))
+    {
+      return 1;
+    }
+#endif
+  return PyByteArray_Check (o);
+}
+
 static PyObject *
 _cubrid_CursorObject_bind_param (_cubrid_CursorObject * self, PyObject * args)
 {
   int res, index = -1;
+  PyObject *value_obj;
   char *value = NULL;
   int type = 0;
+  T_CCI_BIT bit;
 
   if (self->state == CURSOR_STATE_CLOSED)
     {
@@ -1663,7 +2465,7 @@ _cubrid_CursorObject_bind_param (_cubrid_CursorObject * self, PyObject * args)
       return handle_error (CUBRID_ER_SQL_UNPREPARE, NULL);
     }
 
-  if (!PyArg_ParseTuple (args, "iz|i", &index, &value, &type))
+  if (!PyArg_ParseTuple (args, "iO|i", &index, &value_obj, &type))
     {
       return NULL;
     }
@@ -1672,27 +2474,417 @@ _cubrid_CursorObject_bind_param (_cubrid_CursorObject * self, PyObject * args)
     {
       return handle_error (CUBRID_ER_PARAM_UNBIND, NULL);
     }
-  if (type != 0)
+
+  if (_cubrid_is_binary (value_obj))
     {
-      int a_type = CCI_A_TYPE_STR;
-      if (type == CCI_U_TYPE_BIT || type == CCI_U_TYPE_VARBIT)
-        {
-          a_type = CCI_A_TYPE_BIT;
-        }
+      if (PyByteArray_Check (value_obj))
+	{
+	  bit.buf = PyByteArray_AS_STRING (value_obj);
+	  bit.size = (int) PyByteArray_GET_SIZE (value_obj);
+	}
+      else
+	{
+	  bit.buf = PyBytes_AS_STRING (value_obj);
+	  bit.size = (int) PyBytes_GET_SIZE (value_obj);
+	}
+      if (type != CCI_U_TYPE_BIT)
+	{
+	  type = CCI_U_TYPE_VARBIT;
+	}
 
-      res = cci_bind_param (self->handle, index, a_type, value, type, 0);
+      /* the value is copied by CCI, the buffer only has to live
+       * until cci_bind_param() returns */
+      res = cci_bind_param (self->handle, index, CCI_A_TYPE_BIT, &bit, type,
+			    0);
     }
   else
     {
-      res =
-        cci_bind_param (self->handle, index, CCI_A_TYPE_STR, value,
-            CCI_U_TYPE_CHAR, 0);
+      if (value_obj != Py_None)
+	{
+#if PY_MAJOR_VERSION >= 3
+	  if (PyUnicode_Check (value_obj))
+	    {
+	      value = (char *) PyUnicode_AsUTF8 (value_obj);
+	    }
+	  else
+#endif
+	    {
+	      value = PyString_AsString (value_obj);
+	    }
+	  if (!value)
+	    {
+	      return NULL;
+	    }
+	}
+
+      res = cci_bind_param (self->handle, index, CCI_A_TYPE_STR, value,
+			    type ? type : CCI_U_TYPE_CHAR, 0);
     }
 
   if (res < 0)
     {
       return handle_error (res, NULL);
     }
+  _cubrid_CursorObject_set_bound (self, index);
+
+  Py_INCREF (Py_None);
+  return Py_None;
+}
+
+/* Return the text a value is bound as. *str receives a new reference
+ * owning the returned buffer.
+ */
+static char *
+_cubrid_CursorObject_str_value (_cubrid_CursorObject * self,
+				PyObject * value, PyObject ** str)
+{
+  char *buf;
+
+#if PY_MAJOR_VERSION >= 3
+  if (PyUnicode_Check (value))
+    {
+      Py_INCREF (value);
+      *str = value;
+    }
+  else
+    {
+      *str = PyObject_Str (value);
+    }
+  if (!*str)
+    {
+      return NULL;
+    }
+  buf = (char *) PyUnicode_AsUTF8 (*str);
+#else
+  if (PyUnicode_Check (value))
+    {
+      *str = PyUnicode_AsEncodedString (value,
+					*self->charset ? self->charset :
+					"utf-8", NULL);
+    }
+  else if (PyString_Check (value))
+    {
+      Py_INCREF (value);
+      *str = value;
+    }
+  else
+    {
+      *str = PyObject_Str (value);
+    }
+  if (!*str)
+    {
+      return NULL;
+    }
+  buf = PyString_AsString (*str);
+#endif
+  if (!buf)
+    {
+      Py_CLEAR (*str);
+    }
+
+  return buf;
+}
+
+/* Bind a value as a string, with the given CUBRID type. */
+static int
+_cubrid_CursorObject_bind_str (_cubrid_CursorObject * self, int index,
+			       PyObject * value, int u_type)
+{
+  int res;
+  char *buf;
+  PyObject *str;
+
+  if (!(buf = _cubrid_CursorObject_str_value (self, value, &str)))
+    {
+      return -1;
+    }
+
+  res = cci_bind_param (self->handle, index, CCI_A_TYPE_STR, buf, u_type, 0);
+  Py_DECREF (str);
+
+  return res;
+}
+
+/* Fill date from a datetime, date or time object. */
+static void
+_cubrid_date_from_value (PyObject * value, T_CCI_DATE * date)
+{
+  memset (date, 0, sizeof (T_CCI_DATE));
+
+  if (PyDate_Check (value))
+    {
+      date->yr = PyDateTime_GET_YEAR (value);
+      date->mon = PyDateTime_GET_MONTH (value);
+      date->day = PyDateTime_GET_DAY (value);
+    }
+  if (PyDateTime_Check (value))
+    {
+      date->hh = PyDateTime_DATE_GET_HOUR (value);
+      date->mm = PyDateTime_DATE_GET_MINUTE (value);
+      date->ss = PyDateTime_DATE_GET_SECOND (value);
+      date->ms = PyDateTime_DATE_GET_MICROSECOND (value) / 1000;
+    }
+  else if (PyTime_Check (value))
+    {
+      date->hh = PyDateTime_TIME_GET_HOUR (value);
+      date->mm = PyDateTime_TIME_GET_MINUTE (value);
+      date->ss = PyDateTime_TIME_GET_SECOND (value);
+    }
+}
+
+/* Bind one parameter with the CCI type matching its Python type. */
+static int
+_cubrid_CursorObject_bind_native (_cubrid_CursorObject * self, int index,
+				  PyObject * value)
+{
+  int res, overflow, num;
+  CUBRID_LONG_LONG lnum;
+  double dnum;
+  T_CCI_BIT bit;
+  T_CCI_DATE date;
+
+  if (value == Py_None)
+    {
+      res = cci_bind_param (self->handle, index, CCI_A_TYPE_STR, NULL,
+			    CCI_U_TYPE_CHAR, 0);
+    }
+  else if (PyBool_Check (value))
+    {
+      num = (value == Py_True);
+      res = cci_bind_param (self->handle, index, CCI_A_TYPE_INT, &num,
+			    CCI_U_TYPE_INT, 0);
+    }
+#if PY_MAJOR_VERSION < 3
+  else if (PyInt_Check (value) || PyLong_Check (value))
+#else
+  else if (PyLong_Check (value))
+#endif
+    {
+      lnum = PyLong_AsLongLongAndOverflow (value, &overflow);
+      if (lnum == -1 && PyErr_Occurred ())
+	{
+	  return -1;
+	}
+
+      if (overflow)
+	{
+	  res = _cubrid_CursorObject_bind_str (self, index, value,
+					       CCI_U_TYPE_NUMERIC);
+	}
+      else if (lnum >= INT_MIN && lnum <= INT_MAX)
+	{
+	  num = (int) lnum;
+	  res = cci_bind_param (self->handle, index, CCI_A_TYPE_INT, &num,
+				CCI_U_TYPE_INT, 0);
+	}
+      else
+	{
+	  res = cci_bind_param (self->handle, index, CCI_A_TYPE_BIGINT, &lnum,
+				CCI_U_TYPE_BIGINT, 0);
+	}
+    }
+  else if (PyFloat_Check (value))
+    {
+      dnum = PyFloat_AS_DOUBLE (value);
+      res = cci_bind_param (self->handle, index, CCI_A_TYPE_DOUBLE, &dnum,
+			    CCI_U_TYPE_DOUBLE, 0);
+    }
+  else if (PyDateTime_Check (value))
+    {
+      _cubrid_date_from_value (value, &date);
+      res = cci_bind_param (self->handle, index, CCI_A_TYPE_DATE, &date,
+			    CCI_U_TYPE_DATETIME, 0);
+    }
+  else if (PyDate_Check (value))
+    {
+      _cubrid_date_from_value (value, &date);
+      res = cci_bind_param (self->handle, index, CCI_A_TYPE_DATE, &date,
+			    CCI_U_TYPE_DATE, 0);
+    }
+  else if (PyTime_Check (value))
+    {
+      _cubrid_date_from_value (value, &date);
+      res = cci_bind_param (self->handle, index, CCI_A_TYPE_DATE, &date,
+			    CCI_U_TYPE_TIME, 0);
+    }
+  else if (_cubrid_is_binary (value))
+    {
+      if (PyByteArray_Check (value))
+	{
+	  bit.buf = PyByteArray_AS_STRING (value);
+	  bit.size = (int) PyByteArray_GET_SIZE (value);
+	}
+      else
+	{
+	  bit.buf = PyBytes_AS_STRING (value);
+	  bit.size = (int) PyBytes_GET_SIZE (value);
+	}
+      res = cci_bind_param (self->handle, index, CCI_A_TYPE_BIT, &bit,
+			    CCI_U_TYPE_VARBIT, 0);
+    }
+  else if (PyObject_TypeCheck (value, &_cubrid_LobObject_type))
+    {
+      _cubrid_LobObject *lob = (_cubrid_LobObject *) value;
+
+      if (lob->type == CUBRID_BLOB)
+	{
+	  res = cci_bind_param (self->handle, index, CCI_A_TYPE_BLOB,
+				(void *) lob->blob, CCI_U_TYPE_BLOB,
+				CCI_BIND_PTR);
+	}
+      else
+	{
+	  res = cci_bind_param (self->handle, index, CCI_A_TYPE_CLOB,
+				(void *) lob->clob, CCI_U_TYPE_CLOB,
+				CCI_BIND_PTR);
+	}
+    }
+  else if (PyObject_TypeCheck (value, &_cubrid_SetObject_type))
+    {
+      res = cci_bind_param (self->handle, index, CCI_A_TYPE_SET,
+			    (void *) ((_cubrid_SetObject *) value)->data,
+			    CCI_U_TYPE_SET, CCI_BIND_PTR);
+    }
+  else if (Py_TYPE (value) == (PyTypeObject *) _func_Decimal)
+    {
+      res = _cubrid_CursorObject_bind_str (self, index, value,
+					   CCI_U_TYPE_NUMERIC);
+    }
+  else
+    {
+      res = _cubrid_CursorObject_bind_str (self, index, value,
+					   CCI_U_TYPE_CHAR);
+    }
+
+  if (res < 0)
+    {
+      if (!PyErr_Occurred ())
+	{
+	  handle_error (res, NULL);
+	}
+      return -1;
+    }
+
+  return 0;
+}
+
+/* Return a new reference to value, converted first when an adapter is
+ * registered for its exact type.
+ */
+static PyObject *
+_cubrid_adapt_value (PyObject * value)
+{
+  PyObject *adapter;
+
+  if (PyDict_Size (_cubrid_adapters) > 0)
+    {
+      adapter =
+	PyDict_GetItem (_cubrid_adapters, (PyObject *) Py_TYPE (value));
+      if (adapter)
+	{
+	  return PyObject_CallFunctionObjArgs (adapter, value, NULL);
+	}
+    }
+
+  Py_INCREF (value);
+  return value;
+}
+
+/* Bind one parameter, going through the adapter registry. */
+static int
+_cubrid_CursorObject_bind_value (_cubrid_CursorObject * self, int index,
+				 PyObject * value)
+{
+  int res;
+
+  if (!(value = _cubrid_adapt_value (value)))
+    {
+      return -1;
+    }
+  res = _cubrid_CursorObject_bind_native (self, index, value);
+  Py_DECREF (value);
+
+  return res;
+}
+
+static char _cubrid_CursorObject_bind_params__doc__[] =
+  "bind_params(params)\n\
+bind all the parameters of the prepared statement in one call. Every\n\
+value is bound with the CUBRID type matching its Python type::\n\
+  None                    NULL\n\
+  bool, int               INT, or BIGINT if it does not fit\n\
+  float                   DOUBLE\n\
+  decimal.Decimal         NUMERIC\n\
+  datetime.datetime       DATETIME\n\
+  datetime.date           DATE\n\
+  datetime.time           TIME\n\
+  bytes, bytearray        BIT VARYING\n\
+  lob, set                BLOB/CLOB, SET\n\
+  str and other types     CHAR, from str(value)\n\
+Adapters registered with register_adapter() are applied first.\n\
+\n\
+Parameters::\n\
+  params: sequence, one value per parameter marker\n\
+\n\
+Example::\n\
+  import _cubrid\n\
+  con = _cubrid.connect('CUBRID:localhost:33000:demodb:::', 'public')\n\
+  cur = con.cursor()\n\
+  cur.prepare('insert into test_cubrid values (?, ?)')\n\
+  cur.bind_params((1, 'abc'))\n\
+  cur.execute()\n\
+  cur.close()\n\
+  con.close()";
+
+static PyObject *
+_cubrid_CursorObject_bind_params (_cubrid_CursorObject * self,
+				  PyObject * args)
+{
+  int i;
+  Py_ssize_t n;
+  PyObject *params, *seq;
+
+  if (self->state == CURSOR_STATE_CLOSED)
+    {
+      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
+    }
+  if (!self->handle)
+    {
+      return handle_error (CUBRID_ER_SQL_UNPREPARE, NULL);
+    }
+  if (!PyArg_ParseTuple (args, "O", &params))
+    {
+      return NULL;
+    }
+
+  if (!(seq = PySequence_Fast (params, "params must be a sequence")))
+    {
+      return NULL;
+    }
+
+  n = PySequence_Fast_GET_SIZE (seq);
+  if (n > self->bind_num)
+    {
+      Py_DECREF (seq);
+      return handle_error (CUBRID_ER_PARAM_UNBIND, NULL);
+    }
+
+  for (i = 0; i < n; i++)
+    {
+      if (_cubrid_CursorObject_bind_value (self, i + 1,
+					   PySequence_Fast_GET_ITEM (seq,
+								     i)) < 0)
+	{
+	  Py_DECREF (seq);
+	  return NULL;
+	}
+      _cubrid_CursorObject_set_bound (self, i + 1);
+    }
+
+  /* LOB and SET values are bound by pointer, keep them alive until the
+   * statement is executed */
+  Py_XDECREF (self->bind_refs);
+  self->bind_refs = seq;
 
   Py_INCREF (Py_None);
   return Py_None;
@@ -1767,6 +2959,7 @@ _cubrid_CursorObject_bind_lob (_cubrid_CursorObject * self, PyObject * args)
 	  return handle_error (res, NULL);
 	}
     }
+  _cubrid_CursorObject_set_bound (self, index);
 
   Py_INCREF (Py_None);
   return Py_None;
@@ -1812,59 +3005,63 @@ _cubrid_CursorObject_bind_Set (_cubrid_CursorObject * self, PyObject * args)
     {
       return handle_error (res, NULL);
     }
+  _cubrid_CursorObject_set_bound (self, index);
 
   Py_INCREF (Py_None);
   return Py_None;
 }
 
+/* Build the DB API description of the current result set from the column
+ * table. It is kept until the columns of the result set change.
+ */
 static int
 _cubrid_CursorObject_set_description (_cubrid_CursorObject * self)
 {
   PyObject *desc, *item;
   int i;
-  int datatype, precision, scale, nullable;
+  _cubrid_column *col;
 
-  if (self->state == CURSOR_STATE_CLOSED)
+  if (!(desc = PyTuple_New (self->n_columns)))
     {
-      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
-    }
-  if (self->col_count == 0)
-    {
-      Py_XDECREF (self->description);
-      self->description = PyTuple_New (0);
-      return 1;
+      return -1;
     }
 
-  desc = (PyObject *) PyTuple_New (self->col_count);
-
-  for (i = 1; i <= self->col_count; i++)
+  for (i = 0, col = self->columns; i < self->n_columns; i++, col++)
     {
-      char *colName = NULL;
+      item = Py_BuildValue ("(Oiiiiii)", col->key, col->type, 0, 0,
+			    col->precision, col->scale, col->nullable);
+      if (!item)
+	{
+	  Py_DECREF (desc);
+	  return -1;
+	}
 
-      item = PyTuple_New (7);
+      PyTuple_SET_ITEM (desc, i, item);
+    }
 
-      colName = CCI_GET_RESULT_INFO_NAME (self->col_info, i);
-      precision = CCI_GET_RESULT_INFO_PRECISION (self->col_info, i);
-      scale = CCI_GET_RESULT_INFO_SCALE (self->col_info, i);
-      nullable =
-	(CCI_GET_RESULT_INFO_IS_NON_NULL (self->col_info, i)) ? 0 : 1;
-      datatype = CCI_GET_RESULT_INFO_TYPE (self->col_info, i);
+  Py_XDECREF (self->description);
+  self->description = desc;
 
-      PyTuple_SetItem (item, 0, _cubrid_return_PyString_FromString (colName));
-      PyTuple_SetItem (item, 1, _cubrid_return_PyInt_FromLong (datatype));
-      PyTuple_SetItem (item, 2, _cubrid_return_PyInt_FromLong (0));
-      PyTuple_SetItem (item, 3, _cubrid_return_PyInt_FromLong (0));
-      PyTuple_SetItem (item, 4, _cubrid_return_PyInt_FromLong (precision));
-      PyTuple_SetItem (item, 5, _cubrid_return_PyInt_FromLong (scale));
-      PyTuple_SetItem (item, 6, _cubrid_return_PyInt_FromLong (nullable));
+  return 0;
+}
 
-      PyTuple_SetItem (desc, i - 1, item);
+static PyObject *
+_cubrid_CursorObject_get_description (_cubrid_CursorObject * self,
+				      void *closure)
+{
+  if (self->sql_type != SQLX_CMD_SELECT || self->col_count < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
     }
 
-  Py_XDECREF (self->description);
-  self->description = desc;
+  if (!self->description && _cubrid_CursorObject_set_description (self) < 0)
+    {
+      return NULL;
+    }
 
-  return 1;
+  Py_INCREF (self->description);
+  return self->description;
 }
 
 static char _cubrid_CursorObject_result_info__doc__[] = "result_info(n)\n\
@@ -2022,510 +3219,2156 @@ _cubrid_CursorObject_result_info (_cubrid_CursorObject * self,
   return result;
 }
 
-static char _cubrid_CursorObject_execute__doc__[] =
-  "execute([option[,max_col_size]])\n\
-Executes a prepared Query.\n\
-A option can be used when retrieving the query result from the server.\n\
-A option can be classified as synchronous or asynchronous. \n\
-If the option is set to CUBRID_EXEC_QUERY_ALL, a synchronous mode(sync_mode) \n\
-is used to retrieve query results immediately after executing prepared queries. \n\
-If it is set to CUBRID_EXEC_ASYNC, an asynchronous mode (async_mode) is used to\n\
-retrieve the result immediately each time a query result is created.\n\
-The option is set to CUBRID_EXEC_QUERY_ALL by default, and in such\n\
-cases the following rules are applied:\n\
-  - The return value is the result of the first query.\n\
-  - If an error occurs in any query, the execution is processed\n\
-    as a failure.\n\
-  - For a query composed of in a query composed of q1 q2 q3\n\
-    if an error occurs in q2 after q1 succeeds the execution,\n\
-    the result of q1 remains valid. That is, the previous successful\n\
-    query executions are not rolled back when an error occurs.\n\
-  - If a query is executed successfully, the result of the second\n\
-    query can be obtained using next_result().\n\
-max_col is a value that is used to determine the size of the column\n\
-to be transferred to the client when the type of the column of the\n\
-prepared query is CHAR, VARCHAR, NCHAR, VARNCHAR, BIT or VARBIT.\n\
-If it is set to 0, all data is transferred.\n\
-\n\
-Parameters::\n\
-  option: Exec option, option maybe the following values:\n\
-    CUBRID_EXEC_ASYNC\n\
-    CUBRID_EXEC_QUERY_ALL\n\
-    CUBRID_EXEC_QUERY_INFO\n\
-    CUBRID_EXEC_ONLY_QUERY_PLAN\n\
-    CUBRID_EXEC_THREAD\n\
-\n\
-Return values::\n\
-  SELECT: Returns the number of results in sync mode,\n\
-          returns 0 in asynchronism mode.\n\
-  INSERT, UPDATE: Returns the number of tuples reflected.\n\
-  Others queries: 0\n";
+/* DB type to Python type mapping
+* 
+* int, short, bigint		-> Integer
+* float, double, monetary	-> Float
+* numeric   			-> Decimal
+* bit, varbit			-> bytes
+* time 					-> datetime.time
+* date 					-> datetime.date
+* datetime 				-> datetime.datetime
+* timestamp 			-> datetime.datetime
+* collection			-> List
+* another type			-> String
+*
+* The decoder of every column is chosen once per result set by
+* _cubrid_CursorObject_set_columns(), so fetching a row is a plain loop
+* over the column table.
+*/
 
 static PyObject *
-_cubrid_CursorObject_execute (_cubrid_CursorObject * self, PyObject * args)
+_cubrid_decode_bit (_cubrid_CursorObject * self, _cubrid_column * col)
 {
-  int res, option = 0, max_col_size = 0;
-  T_CCI_ERROR error;
-  T_CCI_COL_INFO *res_col_info;
-  T_CCI_SQLX_CMD res_sql_type;
-  int res_col_count;
+  int res, ind;
+  T_CCI_BIT bit;
 
-  if (self->state == CURSOR_STATE_CLOSED)
+  res = cci_get_data (self->handle, col->index, CCI_A_TYPE_BIT, &bit, &ind);
+  if (res < 0)
     {
-      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
+      return handle_error (res, NULL);
     }
-  if (!PyArg_ParseTuple (args, "|ii", &option, &max_col_size))
+  if (ind < 0)
     {
-      return NULL;
+      Py_INCREF (Py_None);
+      return Py_None;
     }
 
-  res = cci_execute (self->handle, option, max_col_size, &error);
+  return PyBytes_FromStringAndSize (bit.buf, bit.size);
+}
+
+static PyObject *
+_cubrid_decode_int (_cubrid_CursorObject * self, _cubrid_column * col)
+{
+  int res, ind, num;
+
+  res = cci_get_data (self->handle, col->index, CCI_A_TYPE_INT, &num, &ind);
   if (res < 0)
     {
-      return handle_error (res, &error);
+      return handle_error (res, NULL);
+    }
+  if (ind < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
     }
 
-  res_col_info =
-    cci_get_result_info (self->handle, &res_sql_type, &res_col_count);
-  if (res_sql_type == SQLX_CMD_SELECT && !res_col_info)
+  return _cubrid_return_PyInt_FromLong (num);
+}
+
+static PyObject *
+_cubrid_decode_bigint (_cubrid_CursorObject * self, _cubrid_column * col)
+{
+  int res, ind;
+  CUBRID_LONG_LONG num;
+
+  res =
+    cci_get_data (self->handle, col->index, CCI_A_TYPE_BIGINT, &num, &ind);
+  if (res < 0)
     {
-      return handle_error (CUBRID_ER_CANNOT_GET_COLUMN_INFO, NULL);
+      return handle_error (res, NULL);
+    }
+  if (ind < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
     }
 
-  self->col_info = res_col_info;
-  self->sql_type = res_sql_type;
-  self->col_count = res_col_count;
+  return PyLong_FromLongLong (num);
+}
 
-  switch (res_sql_type)
+static PyObject *
+_cubrid_decode_float (_cubrid_CursorObject * self, _cubrid_column * col)
+{
+  int res, ind;
+  double num;
+
+  res =
+    cci_get_data (self->handle, col->index, CCI_A_TYPE_DOUBLE, &num, &ind);
+  if (res < 0)
     {
-    case SQLX_CMD_SELECT:
-    case SQLX_CMD_INSERT:
-    case SQLX_CMD_UPDATE:
-    case SQLX_CMD_DELETE:
-    case SQLX_CMD_CALL:
-      self->row_count = res;
-      break;
-    default:
-      self->row_count = -1;
-      break;
+      return handle_error (res, NULL);
+    }
+  if (ind < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
     }
 
-  if (res_sql_type == SQLX_CMD_SELECT)
+  return PyFloat_FromDouble (num);
+}
+
+/* NUMERIC values are fetched as strings, then turned into the Python type
+ * selected with _set_numeric_type(): Decimal (default), int, float or str.
+ */
+static PyObject *
+_cubrid_decode_numeric (_cubrid_CursorObject * self, _cubrid_column * col)
+{
+  int res, ind;
+  char *buffer;
+  PyObject *val, *tmpval;
+
+  res = cci_get_data (self->handle, col->index, CCI_A_TYPE_STR, &buffer, &ind);
+  if (res < 0)
     {
-      int ret;
+      return handle_error (res, NULL);
+    }
+  if (ind < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
 
-      _cubrid_CursorObject_set_description (self);
-      ret = cci_cursor (self->handle, 1, CCI_CURSOR_CURRENT, &error);
-      if (ret < 0 && ret != CCI_ER_NO_MORE_DATA)
-	{
-	  return handle_error (ret, &error);
-	}
+  tmpval = _cubrid_return_PyString_FromString (buffer);
+  if (!tmpval)
+    {
+      return NULL;
     }
+#if PY_VERSION_HEX >= 0x03090000
+  val = PyObject_CallOneArg (_func_Decimal, tmpval);
+#else
+  val = PyObject_CallFunctionObjArgs (_func_Decimal, tmpval, NULL);
+#endif
+  Py_DECREF (tmpval);
 
-  return _cubrid_return_PyInt_FromLong (res);
+  return val;
 }
 
-/* DB type to Python type mapping
-* 
-* int, short 			-> Integer
-* float, double, numeric 	-> Float
-* numeric   			-> Decimal
-* time 					-> datetime.time
-* date 					-> datetime.date
-* datetime 				-> datetime.datetime
-* timestamp 			-> datetime.datetime
-* another type			-> String
-*/
+static PyObject *
+_cubrid_decode_numeric_int (_cubrid_CursorObject * self,
+			    _cubrid_column * col)
+{
+  int res, ind;
+  char *buffer, *point;
+  char digits[64];
+  size_t len;
+
+  res = cci_get_data (self->handle, col->index, CCI_A_TYPE_STR, &buffer, &ind);
+  if (res < 0)
+    {
+      return handle_error (res, NULL);
+    }
+  if (ind < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+
+  /* drop the fraction, like int(Decimal) does */
+  point = strchr (buffer, '.');
+  len = point ? (size_t) (point - buffer) : strlen (buffer);
+  if (len >= sizeof (digits))
+    {
+      return handle_error (CUBRID_ER_INVALID_PARAM, NULL);
+    }
+  memcpy (digits, buffer, len);
+  digits[len] = '\0';
+
+  /* up to 18 digits always fit in a long long */
+  if (len <= 18)
+    {
+      return PyLong_FromLongLong (strtoll (digits, NULL, 10));
+    }
+
+  return PyLong_FromString (digits, NULL, 10);
+}
 
 static PyObject *
-_cubrid_CursorObject_dbval_to_pyvalue (_cubrid_CursorObject * self, int type,
-				       int index)
+_cubrid_decode_numeric_float (_cubrid_CursorObject * self,
+			      _cubrid_column * col)
 {
   int res, ind;
-  PyObject *val, *tmpval;
   char *buffer;
-  int num;
+  double num;
+
+  res = cci_get_data (self->handle, col->index, CCI_A_TYPE_STR, &buffer, &ind);
+  if (res < 0)
+    {
+      return handle_error (res, NULL);
+    }
+  if (ind < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+
+  num = PyOS_string_to_double (buffer, NULL, NULL);
+  if (num == -1.0 && PyErr_Occurred ())
+    {
+      return NULL;
+    }
+
+  return PyFloat_FromDouble (num);
+}
+
+static PyObject *
+_cubrid_decode_date (_cubrid_CursorObject * self, _cubrid_column * col)
+{
+  int res, ind;
   T_CCI_DATE dt;
-  char *str_buffer;
-  int len;
 
-  if (self->state == CURSOR_STATE_CLOSED)
+  res = cci_get_data (self->handle, col->index, CCI_A_TYPE_DATE, &dt, &ind);
+  if (res < 0)
     {
-      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
+      return handle_error (res, NULL);
     }
-  switch (type)
+  if (ind < 0)
     {
-    case CCI_U_TYPE_BIT:	//CCI_A_TYPE_BIT
-      res = cci_get_data (self->handle, index, CCI_A_TYPE_STR, &buffer, &ind);
-      if (res < 0)
-        {
-          return handle_error (res, NULL);
-        }
-      if (ind < 0)
-        {
-          Py_INCREF (Py_None);
-          val = Py_None;
-        }
-      else
-        {
-          len = strlen (buffer);
-          str_buffer = (char *) malloc (len + 1);
-          if (str_buffer == NULL)
-            {
-              Py_INCREF (Py_None);
-              return Py_None;
-            }
-          memset (str_buffer, 0, len + 1);
-          memcpy (str_buffer, buffer, len);
-          val = _cubrid_return_PyString_FromString (str_buffer);
-          free (str_buffer);
-        }
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
 
-      break;
-    case CCI_U_TYPE_INT:
-    case CCI_U_TYPE_SHORT:
-      res = cci_get_data (self->handle, index, CCI_A_TYPE_INT, &num, &ind);
-      if (res < 0)
-	{
-	  return handle_error (res, NULL);
-	}
-      if (ind < 0)
+  return PyDate_FromDate (dt.yr, dt.mon, dt.day);
+}
+
+static PyObject *
+_cubrid_decode_time (_cubrid_CursorObject * self, _cubrid_column * col)
+{
+  int res, ind;
+  T_CCI_DATE dt;
+
+  res = cci_get_data (self->handle, col->index, CCI_A_TYPE_DATE, &dt, &ind);
+  if (res < 0)
+    {
+      return handle_error (res, NULL);
+    }
+  if (ind < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+
+  return PyTime_FromTime (dt.hh, dt.mm, dt.ss, 0);
+}
+
+static PyObject *
+_cubrid_decode_datetime (_cubrid_CursorObject * self, _cubrid_column * col)
+{
+  int res, ind;
+  T_CCI_DATE dt;
+
+  res = cci_get_data (self->handle, col->index, CCI_A_TYPE_DATE, &dt, &ind);
+  if (res < 0)
+    {
+      return handle_error (res, NULL);
+    }
+  if (ind < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+
+  return PyDateTime_FromDateAndTime (dt.yr, dt.mon, dt.day, dt.hh, dt.mm,
+				     dt.ss, dt.ms * 1000);
+}
+
+static PyObject *
+_cubrid_decode_timestamp (_cubrid_CursorObject * self, _cubrid_column * col)
+{
+  int res, ind;
+  T_CCI_DATE dt;
+
+  res = cci_get_data (self->handle, col->index, CCI_A_TYPE_DATE, &dt, &ind);
+  if (res < 0)
+    {
+      return handle_error (res, NULL);
+    }
+  if (ind < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+
+  return PyDateTime_FromDateAndTime (dt.yr, dt.mon, dt.day, dt.hh, dt.mm,
+				     dt.ss, 0);
+}
+
+static PyObject *
+_cubrid_decode_string (_cubrid_CursorObject * self, _cubrid_column * col)
+{
+  int res, ind;
+  char *buffer;
+
+  res = cci_get_data (self->handle, col->index, CCI_A_TYPE_STR, &buffer, &ind);
+  if (res < 0)
+    {
+      return handle_error (res, NULL);
+    }
+  if (ind < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+
+  return _cubrid_return_PyString_FromString (buffer);
+}
+
+static PyObject *
+_cubrid_decode_unicode (_cubrid_CursorObject * self, _cubrid_column * col)
+{
+  int res, ind;
+  char *buffer;
+
+  res = cci_get_data (self->handle, col->index, CCI_A_TYPE_STR, &buffer, &ind);
+  if (res < 0)
+    {
+      return handle_error (res, NULL);
+    }
+  if (ind < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+
+  return _cubrid_return_PyUnicode_FromString (buffer, strlen (buffer),
+					      self->charset, NULL);
+}
+
+/* Collection(set, multiset, sequence) 	-> List, 
+* Collection' item  -> String 
+*/
+
+static PyObject *
+_cubrid_decode_set (_cubrid_CursorObject * self, _cubrid_column * col)
+{
+  int i, res, ind;
+  PyObject *val;
+  T_CCI_SET set = NULL;
+  int set_size;
+  PyObject *e;
+  char *buffer;
+
+  res = cci_get_data (self->handle, col->index, CCI_A_TYPE_SET, &set, &ind);
+  if (res < 0)
+    {
+      return handle_error (res, NULL);
+    }
+
+  if (ind < 0)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+
+  set_size = cci_set_size (set);
+  val = PyList_New (set_size);
+  if (!val)
+    {
+      cci_set_free (set);
+      return NULL;
+    }
+
+  for (i = 0; i < set_size; i++)
+    {
+      res = cci_set_get (set, i + 1, CCI_A_TYPE_STR, &buffer, &ind);
+      if (res < 0)
+	{
+	  Py_DECREF (val);
+	  cci_set_free (set);
+	  return handle_error (res, NULL);
+	}
+
+      e = _cubrid_return_PyString_FromString (buffer);
+      PyList_SetItem (val, i, e);
+    }
+
+  cci_set_free (set);
+  return val;
+}
+
+static _cubrid_decoder
+_cubrid_CursorObject_get_decoder (_cubrid_CursorObject * self, int type)
+{
+  if (CCI_IS_COLLECTION_TYPE (type))
+    {
+      return _cubrid_decode_set;
+    }
+
+  switch (type)
+    {
+    case CCI_U_TYPE_BIT:
+    case CCI_U_TYPE_VARBIT:
+      return _cubrid_decode_bit;
+    case CCI_U_TYPE_INT:
+    case CCI_U_TYPE_SHORT:
+      return _cubrid_decode_int;
+    case CCI_U_TYPE_BIGINT:
+      return _cubrid_decode_bigint;
+    case CCI_U_TYPE_FLOAT:
+    case CCI_U_TYPE_DOUBLE:
+    case CCI_U_TYPE_MONETARY:
+      return _cubrid_decode_float;
+    case CCI_U_TYPE_NUMERIC:
+      switch (self->numeric_type)
+	{
+	case CUBRID_NUMERIC_AS_INT:
+	  return _cubrid_decode_numeric_int;
+	case CUBRID_NUMERIC_AS_FLOAT:
+	  return _cubrid_decode_numeric_float;
+	case CUBRID_NUMERIC_AS_STR:
+	  return _cubrid_decode_string;
+	default:
+	  return _cubrid_decode_numeric;
+	}
+    case CCI_U_TYPE_DATE:
+      return _cubrid_decode_date;
+    case CCI_U_TYPE_TIME:
+      return _cubrid_decode_time;
+    case CCI_U_TYPE_DATETIME:
+      return _cubrid_decode_datetime;
+    case CCI_U_TYPE_TIMESTAMP:
+      return _cubrid_decode_timestamp;
+    default:
+      if (*(self->charset) != '\0')
+	{
+	  return _cubrid_decode_unicode;
+	}
+      return _cubrid_decode_string;
+    }
+}
+
+/* Check whether the column table describes the current result set, so
+ * that it can be kept when the same query is executed again.
+ */
+static int
+_cubrid_CursorObject_columns_match (_cubrid_CursorObject * self)
+{
+  int i;
+  char *name;
+  _cubrid_column *col;
+
+  if (!self->columns || self->n_columns != self->col_count)
+    {
+      return 0;
+    }
+
+  for (i = 0, col = self->columns; i < self->n_columns; i++, col++)
+    {
+      name = CCI_GET_RESULT_INFO_NAME (self->col_info, i + 1);
+      if (col->type != CCI_GET_RESULT_INFO_TYPE (self->col_info, i + 1)
+	  || col->precision !=
+	  CCI_GET_RESULT_INFO_PRECISION (self->col_info, i + 1)
+	  || col->scale != CCI_GET_RESULT_INFO_SCALE (self->col_info, i + 1)
+	  || col->nullable !=
+	  !CCI_GET_RESULT_INFO_IS_NON_NULL (self->col_info, i + 1)
+#if PY_MAJOR_VERSION >= 3
+	  || PyUnicode_CompareWithASCIIString (col->key, name) != 0)
+#else
+	  || strcmp (PyString_AS_STRING (col->key), name) != 0)
+#endif
+	{
+	  return 0;
+	}
+    }
+
+  return 1;
+}
+
+/* Build the column table of the current result set. It caches the column
+ * metadata, the interned column name and the decoder of every column, so
+ * that fetching does not have to look them up for each cell. The table,
+ * and the description and row index built from it, are kept as long as
+ * the executed queries return the same columns.
+ */
+static int
+_cubrid_CursorObject_set_columns (_cubrid_CursorObject * self)
+{
+  int i, type;
+  _cubrid_column *col;
+
+  if (!self->col_info || self->col_count <= 0)
+    {
+      _cubrid_CursorObject_free_columns (self);
+      return 0;
+    }
+
+  if (_cubrid_CursorObject_columns_match (self))
+    {
+      for (i = 0, col = self->columns; i < self->n_columns; i++, col++)
+	{
+	  col->name = CCI_GET_RESULT_INFO_NAME (self->col_info, i + 1);
+	}
+      return 0;
+    }
+
+  _cubrid_CursorObject_free_columns (self);
+
+  self->columns = PyMem_Malloc (sizeof (_cubrid_column) * self->col_count);
+  if (!self->columns)
+    {
+      handle_error (CUBRID_ER_NO_MORE_MEMORY, NULL);
+      return -1;
+    }
+
+  for (i = 0; i < self->col_count; i++)
+    {
+      col = &self->columns[i];
+      type = CCI_GET_RESULT_INFO_TYPE (self->col_info, i + 1);
+
+      col->index = i + 1;
+      col->type = type;
+      col->precision = CCI_GET_RESULT_INFO_PRECISION (self->col_info, i + 1);
+      col->scale = CCI_GET_RESULT_INFO_SCALE (self->col_info, i + 1);
+      col->nullable = !CCI_GET_RESULT_INFO_IS_NON_NULL (self->col_info, i + 1);
+      col->name = CCI_GET_RESULT_INFO_NAME (self->col_info, i + 1);
+#if PY_MAJOR_VERSION >= 3
+      col->key = PyUnicode_InternFromString (col->name);
+#else
+      col->key = PyString_InternFromString (col->name);
+#endif
+      col->decode = _cubrid_CursorObject_get_decoder (self, type);
+
+      self->n_columns = i + 1;
+      if (!col->key)
+	{
+	  _cubrid_CursorObject_free_columns (self);
+	  return -1;
+	}
+    }
+
+  return 0;
+}
+
+static PyObject *
+_cubrid_row_to_tuple (_cubrid_CursorObject * self)
+{
+  int i;
+  PyObject *row, *val;
+  _cubrid_column *col;
+
+  if (!(row = PyTuple_New (self->col_count)))
+    {
+      return NULL;
+    }
+
+  for (i = 0, col = self->columns; i < self->col_count; i++, col++)
+    {
+      if (!(val = col->decode (self, col)))
+	{
+	  Py_DECREF (row);
+	  return NULL;
+	}
+      PyTuple_SET_ITEM (row, i, val);
+    }
+
+  return row;
+}
+
+static PyObject *
+_cubrid_row_to_dict (_cubrid_CursorObject * self)
+{
+  int i;
+  PyObject *row, *val;
+  _cubrid_column *col;
+
+  if (!(row = PyDict_New ()))
+    {
+      return NULL;
+    }
+
+  for (i = 0, col = self->columns; i < self->col_count; i++, col++)
+    {
+      if (!(val = col->decode (self, col)))
+	{
+	  Py_DECREF (row);
+	  return NULL;
+	}
+      if (PyDict_SetItem (row, col->key, val) < 0)
+	{
+	  Py_DECREF (val);
+	  Py_DECREF (row);
+	  return NULL;
+	}
+      Py_DECREF (val);
+    }
+
+  return row;
+}
+
+/* Build the column name index shared by the rows of the result set. When
+ * several columns have the same name, the first one wins.
+ */
+static int
+_cubrid_CursorObject_set_row_index (_cubrid_CursorObject * self)
+{
+  int i;
+  PyObject *index, *key, *pos;
+
+  if (!(index = PyDict_New ()))
+    {
+      return -1;
+    }
+
+  for (i = 0; i < self->col_count; i++)
+    {
+      key = self->columns[i].key;
+      if (PyDict_GetItem (index, key))
+	{
+	  continue;
+	}
+
+      pos = _cubrid_return_PyInt_FromLong (i);
+      if (!pos || PyDict_SetItem (index, key, pos) < 0)
+	{
+	  Py_XDECREF (pos);
+	  Py_DECREF (index);
+	  return -1;
+	}
+      Py_DECREF (pos);
+    }
+
+  self->row_index = index;
+
+  return 0;
+}
+
+static PyObject *
+_cubrid_row_to_row (_cubrid_CursorObject * self)
+{
+  int i;
+  PyObject *val;
+  _cubrid_RowObject *row;
+  _cubrid_column *col;
+
+  if (!self->row_index && _cubrid_CursorObject_set_row_index (self) < 0)
+    {
+      return NULL;
+    }
+
+  row = PyObject_NewVar (_cubrid_RowObject, &_cubrid_RowObject_type,
+			 self->col_count);
+  if (!row)
+    {
+      return NULL;
+    }
+
+  Py_INCREF (self->row_index);
+  row->index = self->row_index;
+  for (i = 0; i < self->col_count; i++)
+    {
+      row->items[i] = NULL;
+    }
+
+  for (i = 0, col = self->columns; i < self->col_count; i++, col++)
+    {
+      if (!(val = col->decode (self, col)))
+	{
+	  Py_DECREF (row);
+	  return NULL;
+	}
+      row->items[i] = val;
+    }
+
+  return (PyObject *) row;
+}
+
+/* Adaptive fetch size. Rows are transferred from the server in batches
+ * of the CCI fetch size. Unless a fixed size was set, every batch is
+ * sized so that it carries about fetch_target bytes, from the average
+ * row width. The first batch is small and the next ones double while
+ * the rows keep being read, so a caller reading a few rows does not pull
+ * a large batch. Round trips are counted from the batch boundaries.
+ */
+static int
+_cubrid_value_width (PyObject * value)
+{
+  if (value == Py_None)
+    {
+      return 1;
+    }
+  if (PyUnicode_Check (value))
+    {
+#if PY_MAJOR_VERSION >= 3
+      return (int) PyUnicode_GET_LENGTH (value);
+#else
+      return (int) PyUnicode_GET_SIZE (value);
+#endif
+    }
+  if (PyBytes_Check (value))
+    {
+      return (int) PyBytes_GET_SIZE (value);
+    }
+  return 8;
+}
+
+static int
+_cubrid_row_width (PyObject * row)
+{
+  Py_ssize_t i, pos = 0;
+  PyObject *key, *value;
+  int width = 0;
+
+  if (PyTuple_Check (row))
+    {
+      for (i = 0; i < PyTuple_GET_SIZE (row); i++)
+	{
+	  width += _cubrid_value_width (PyTuple_GET_ITEM (row, i));
+	}
+    }
+  else if (PyDict_Check (row))
+    {
+      while (PyDict_Next (row, &pos, &key, &value))
+	{
+	  width += _cubrid_value_width (value);
+	}
+    }
+  else if (PyObject_TypeCheck (row, &_cubrid_RowObject_type))
+    {
+      for (i = 0; i < Py_SIZE (row); i++)
+	{
+	  width += _cubrid_value_width (((_cubrid_RowObject *) row)->items[i]);
+	}
+    }
+
+  return width > 0 ? width : 1;
+}
+
+/* Reset the fetch statistics for a new result set. The row width is
+ * estimated from the column types until rows are read.
+ */
+static void
+_cubrid_CursorObject_start_fetch (_cubrid_CursorObject * self)
+{
+  int i, width = 0;
+
+  for (i = 0; i < self->n_columns; i++)
+    {
+      switch (self->columns[i].type)
+	{
+	case CCI_U_TYPE_CHAR:
+	case CCI_U_TYPE_STRING:
+	case CCI_U_TYPE_NCHAR:
+	case CCI_U_TYPE_VARNCHAR:
+	case CCI_U_TYPE_BIT:
+	case CCI_U_TYPE_VARBIT:
+	case CCI_U_TYPE_NUMERIC:
+	  width += self->columns[i].precision < CUBRID_FETCH_WIDTH_MAX ?
+	    self->columns[i].precision : CUBRID_FETCH_WIDTH_MAX;
+	  break;
+	default:
+	  width += 8;
+	  break;
+	}
+    }
+
+  self->row_width = width > 0 ? width : 1;
+  self->rows_fetched = 0;
+  self->round_trips = 1;
+  self->fetch_batch = self->fetch_size > 0 ?
+    self->fetch_size : CUBRID_FETCH_SIZE_INITIAL;
+  self->fetch_batch_left = self->fetch_batch;
+}
+
+/* Account for one row read from the result set. row is sampled for its
+ * width when it starts a batch; it may be NULL.
+ */
+static void
+_cubrid_CursorObject_row_fetched (_cubrid_CursorObject * self,
+				  PyObject * row)
+{
+  int size, limit;
+
+  if (row && self->fetch_batch_left == self->fetch_batch)
+    {
+      self->row_width = (self->row_width + 3 * _cubrid_row_width (row)) / 4;
+      if (self->row_width < 1)
+	{
+	  self->row_width = 1;
+	}
+    }
+
+  self->rows_fetched++;
+  if (--self->fetch_batch_left > 0)
+    {
+      return;
+    }
+
+  /* the batch is used up, the next row is fetched from the server */
+  self->round_trips++;
+  size = self->fetch_batch;
+  if (self->fetch_size == 0 && self->fetch_target > 0)
+    {
+      limit = self->fetch_target / self->row_width;
+      size = size < limit / 2 ? size * 2 : limit;
+      if (size < 1)
+	{
+	  size = 1;
+	}
+      if (size != self->fetch_batch)
+	{
+	  cci_fetch_size (self->handle, size);
+	}
+    }
+  self->fetch_batch = size;
+  self->fetch_batch_left = size;
+}
+
+/* The AUTO_INCREMENT value generated by the last INSERT of the cursor,
+ * read from the server on first access, as long as no other statement
+ * was executed on the connection since. The insert succeeded, so failing
+ * to read it returns None instead of raising.
+ */
+static PyObject *
+_cubrid_CursorObject_get_lastrowid (_cubrid_CursorObject * self,
+				    void *closure)
+{
+  char *name = NULL;
+  int res;
+  T_CCI_ERROR error;
+
+  if (!self->lastrowid && self->lastrowid_stmt
+      && self->lastrowid_stmt == self->conn->executed
+      && self->conn->handle > 0)
+    {
+      self->lastrowid_stmt = 0;
+
+      CUBRID_BEGIN_CCI (self->conn);
+      res = cci_get_last_insert_id (self->conn->handle, &name, &error);
+      CUBRID_END_CCI (self->conn);
+      if (res >= 0 && name && *name)
+	{
+	  self->lastrowid = PyLong_FromString (name, NULL, 10);
+	  if (!self->lastrowid)
+	    {
+	      PyErr_Clear ();
+	    }
+	}
+    }
+
+  if (!self->lastrowid)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+  Py_INCREF (self->lastrowid);
+  return self->lastrowid;
+}
+
+static char _cubrid_CursorObject_execute__doc__[] =
+  "execute([option[,max_col_size]])\n\
+Executes a prepared Query.\n\
+A option can be used when retrieving the query result from the server.\n\
+A option can be classified as synchronous or asynchronous. \n\
+If the option is set to CUBRID_EXEC_QUERY_ALL, a synchronous mode(sync_mode) \n\
+is used to retrieve query results immediately after executing prepared queries. \n\
+If it is set to CUBRID_EXEC_ASYNC, an asynchronous mode (async_mode) is used to\n\
+retrieve the result immediately each time a query result is created.\n\
+The option is set to CUBRID_EXEC_QUERY_ALL by default, and in such\n\
+cases the following rules are applied:\n\
+  - The return value is the result of the first query.\n\
+  - If an error occurs in any query, the execution is processed\n\
+    as a failure.\n\
+  - For a query composed of in a query composed of q1 q2 q3\n\
+    if an error occurs in q2 after q1 succeeds the execution,\n\
+    the result of q1 remains valid. That is, the previous successful\n\
+    query executions are not rolled back when an error occurs.\n\
+  - If a query is executed successfully, the result of the second\n\
+    query can be obtained using next_result().\n\
+max_col is a value that is used to determine the size of the column\n\
+to be transferred to the client when the type of the column of the\n\
+prepared query is CHAR, VARCHAR, NCHAR, VARNCHAR, BIT or VARBIT.\n\
+If it is set to 0, all data is transferred.\n\
+\n\
+Parameters::\n\
+  option: Exec option, option maybe the following values:\n\
+    CUBRID_EXEC_ASYNC\n\
+    CUBRID_EXEC_QUERY_ALL\n\
+    CUBRID_EXEC_QUERY_INFO\n\
+    CUBRID_EXEC_ONLY_QUERY_PLAN\n\
+    CUBRID_EXEC_THREAD\n\
+\n\
+Return values::\n\
+  SELECT: Returns the number of results in sync mode,\n\
+          returns 0 in asynchronism mode.\n\
+  INSERT, UPDATE: Returns the number of tuples reflected.\n\
+  Others queries: 0\n";
+
+static PyObject *
+_cubrid_CursorObject_execute (_cubrid_CursorObject * self, PyObject * args)
+{
+  int res, option = 0, max_col_size = 0;
+  T_CCI_ERROR error;
+  T_CCI_COL_INFO *res_col_info;
+  T_CCI_SQLX_CMD res_sql_type;
+  int res_col_count;
+
+  if (self->state == CURSOR_STATE_CLOSED)
+    {
+      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
+    }
+  if (!PyArg_ParseTuple (args, "|ii", &option, &max_col_size))
+    {
+      return NULL;
+    }
+
+  if (_cubrid_CursorObject_check_bound (self) < 0)
+    {
+      return NULL;
+    }
+
+  Py_CLEAR (self->lastrowid);
+  self->lastrowid_stmt = 0;
+
+  CUBRID_BEGIN_CCI_STAT (self->conn);
+  res = cci_execute (self->handle, option, max_col_size, &error);
+  CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_EXECUTE);
+  self->conn->executed++;
+  if (res < 0)
+    {
+      return handle_error (res, &error);
+    }
+
+  res_col_info =
+    cci_get_result_info (self->handle, &res_sql_type, &res_col_count);
+  if (res_sql_type == SQLX_CMD_SELECT && !res_col_info)
+    {
+      return handle_error (CUBRID_ER_CANNOT_GET_COLUMN_INFO, NULL);
+    }
+
+  self->col_info = res_col_info;
+  self->sql_type = res_sql_type;
+  self->col_count = res_col_count;
+
+  switch (res_sql_type)
+    {
+    case SQLX_CMD_SELECT:
+    case SQLX_CMD_INSERT:
+    case SQLX_CMD_UPDATE:
+    case SQLX_CMD_DELETE:
+    case SQLX_CMD_CALL:
+      self->row_count = res;
+      break;
+    default:
+      self->row_count = -1;
+      break;
+    }
+
+  /* the generated value is read by the lastrowid getter, if asked for */
+  if (res_sql_type == SQLX_CMD_INSERT && res > 0)
+    {
+      self->lastrowid_stmt = self->conn->executed;
+    }
+
+  if (_cubrid_CursorObject_set_columns (self) < 0)
+    {
+      return NULL;
+    }
+
+  if (res_sql_type == SQLX_CMD_SELECT)
+    {
+      int ret;
+
+      _cubrid_CursorObject_start_fetch (self);
+
+      CUBRID_BEGIN_CCI_STAT (self->conn);
+      ret = cci_cursor (self->handle, 1, CCI_CURSOR_CURRENT, &error);
+      CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_CURSOR);
+      if (ret < 0 && ret != CCI_ER_NO_MORE_DATA)
+	{
+	  return handle_error (ret, &error);
+	}
+    }
+
+  return _cubrid_return_PyInt_FromLong (res);
+}
+
+static char _cubrid_CursorObject_execute_array__doc__[] =
+  "execute_array(rows)\n\
+Execute the prepared statement once for every parameter sequence in\n\
+rows, sending them all in a single request. Each parameter column is\n\
+bound as an array with the CUBRID type matching its Python values, like\n\
+bind_params() does. Columns mixing types that have no common CUBRID\n\
+type are sent as strings. LOB and SET values cannot be bound this way\n\
+and raise NotSupportedError.\n\
+\n\
+Return a tuple with one dict per row, with the keys result (the number\n\
+of rows affected), err_no and err_msg. A failing row does not stop the\n\
+following ones. rowcount is set to the total of rows affected.\n\
+\n\
+Example::\n\
+  import _cubrid\n\
+  con = _cubrid.connect('CUBRID:localhost:33000:demodb:::', 'public')\n\
+  cur = con.cursor()\n\
+  cur.prepare('insert into test_cubrid values (?, ?)')\n\
+  status = cur.execute_array([(1, 'a'), (2, 'b')])\n\
+  cur.close()\n\
+  con.close()";
+
+/* CUBRID type a value is sent as by execute_array(), -1 if it cannot be
+ * bound as part of an array */
+static int
+_cubrid_array_u_type (PyObject * value)
+{
+  int overflow;
+  CUBRID_LONG_LONG lnum;
+
+  if (value == Py_None)
+    {
+      return CCI_U_TYPE_NULL;
+    }
+  if (PyBool_Check (value))
+    {
+      return CCI_U_TYPE_INT;
+    }
+#if PY_MAJOR_VERSION < 3
+  if (PyInt_Check (value) || PyLong_Check (value))
+#else
+  if (PyLong_Check (value))
+#endif
+    {
+      lnum = PyLong_AsLongLongAndOverflow (value, &overflow);
+      if (overflow)
+	{
+	  return CCI_U_TYPE_NUMERIC;
+	}
+      if (lnum >= INT_MIN && lnum <= INT_MAX)
+	{
+	  return CCI_U_TYPE_INT;
+	}
+      return CCI_U_TYPE_BIGINT;
+    }
+  if (PyFloat_Check (value))
+    {
+      return CCI_U_TYPE_DOUBLE;
+    }
+  if (PyDateTime_Check (value))
+    {
+      return CCI_U_TYPE_DATETIME;
+    }
+  if (PyDate_Check (value))
+    {
+      return CCI_U_TYPE_DATE;
+    }
+  if (PyTime_Check (value))
+    {
+      return CCI_U_TYPE_TIME;
+    }
+  if (_cubrid_is_binary (value))
+    {
+      return CCI_U_TYPE_VARBIT;
+    }
+  if (Py_TYPE (value) == (PyTypeObject *) _func_Decimal)
+    {
+      return CCI_U_TYPE_NUMERIC;
+    }
+  if (PyObject_TypeCheck (value, &_cubrid_LobObject_type)
+      || PyObject_TypeCheck (value, &_cubrid_SetObject_type)
+      || PyTuple_Check (value))
+    {
+      return -1;
+    }
+
+  return CCI_U_TYPE_CHAR;
+}
+
+/* Common CUBRID type of two values of a column */
+static int
+_cubrid_array_merge_u_type (int a, int b)
+{
+  if (a == CCI_U_TYPE_NULL || a == b)
+    {
+      return b;
+    }
+  if (b == CCI_U_TYPE_NULL)
+    {
+      return a;
+    }
+
+  if ((a == CCI_U_TYPE_INT || a == CCI_U_TYPE_BIGINT
+       || a == CCI_U_TYPE_NUMERIC) && (b == CCI_U_TYPE_INT
+				       || b == CCI_U_TYPE_BIGINT
+				       || b == CCI_U_TYPE_NUMERIC))
+    {
+      if (a == CCI_U_TYPE_NUMERIC || b == CCI_U_TYPE_NUMERIC)
+	{
+	  return CCI_U_TYPE_NUMERIC;
+	}
+      return CCI_U_TYPE_BIGINT;
+    }
+  if ((a == CCI_U_TYPE_INT && b == CCI_U_TYPE_DOUBLE)
+      || (a == CCI_U_TYPE_DOUBLE && b == CCI_U_TYPE_INT))
+    {
+      return CCI_U_TYPE_DOUBLE;
+    }
+  if ((a == CCI_U_TYPE_DATE && b == CCI_U_TYPE_DATETIME)
+      || (a == CCI_U_TYPE_DATETIME && b == CCI_U_TYPE_DATE))
+    {
+      return CCI_U_TYPE_DATETIME;
+    }
+
+  return CCI_U_TYPE_CHAR;
+}
+
+/* Fill the array of column j and bind it. keep receives the objects
+ * owning string buffers until the statement is executed.
+ */
+static int
+_cubrid_CursorObject_bind_array (_cubrid_CursorObject * self,
+				 PyObject ** cells, int n_rows, int n_cols,
+				 int j, void **values, int **nulls,
+				 PyObject * keep)
+{
+  int i, u_type = CCI_U_TYPE_NULL, a_type, res;
+  size_t size;
+  PyObject *value, *str;
+  T_CCI_BIT *bit;
+  char *buf;
+
+  for (i = 0; i < n_rows; i++)
+    {
+      res = _cubrid_array_u_type (cells[i * n_cols + j]);
+      if (res < 0)
+	{
+	  PyErr_SetString (_cubrid_not_supported_error,
+			   "LOB and SET values cannot be bound as arrays");
+	  return -1;
+	}
+      u_type = _cubrid_array_merge_u_type (u_type, res);
+    }
+
+  switch (u_type)
+    {
+    case CCI_U_TYPE_INT:
+      a_type = CCI_A_TYPE_INT;
+      size = sizeof (int);
+      break;
+    case CCI_U_TYPE_BIGINT:
+      a_type = CCI_A_TYPE_BIGINT;
+      size = sizeof (CUBRID_LONG_LONG);
+      break;
+    case CCI_U_TYPE_DOUBLE:
+      a_type = CCI_A_TYPE_DOUBLE;
+      size = sizeof (double);
+      break;
+    case CCI_U_TYPE_DATE:
+    case CCI_U_TYPE_TIME:
+    case CCI_U_TYPE_DATETIME:
+      a_type = CCI_A_TYPE_DATE;
+      size = sizeof (T_CCI_DATE);
+      break;
+    case CCI_U_TYPE_VARBIT:
+      a_type = CCI_A_TYPE_BIT;
+      size = sizeof (T_CCI_BIT);
+      break;
+    case CCI_U_TYPE_NULL:
+      u_type = CCI_U_TYPE_CHAR;
+      /* fall through */
+    default:
+      a_type = CCI_A_TYPE_STR;
+      size = sizeof (char *);
+      break;
+    }
+
+  values[j] = PyMem_Malloc (size * n_rows);
+  nulls[j] = PyMem_Malloc (sizeof (int) * n_rows);
+  if (!values[j] || !nulls[j])
+    {
+      PyErr_NoMemory ();
+      return -1;
+    }
+  memset (values[j], 0, size * n_rows);
+  memset (nulls[j], 0, sizeof (int) * n_rows);
+
+  for (i = 0; i < n_rows; i++)
+    {
+      value = cells[i * n_cols + j];
+      if (value == Py_None)
 	{
-	  Py_INCREF (Py_None);
-	  return Py_None;
+	  nulls[j][i] = 1;
+	  continue;
 	}
-      else
+
+      switch (a_type)
+	{
+	case CCI_A_TYPE_INT:
+	  ((int *) values[j])[i] = (int) PyLong_AsLong (value);
+	  break;
+	case CCI_A_TYPE_BIGINT:
+	  ((CUBRID_LONG_LONG *) values[j])[i] = PyLong_AsLongLong (value);
+	  break;
+	case CCI_A_TYPE_DOUBLE:
+	  ((double *) values[j])[i] = PyFloat_AsDouble (value);
+	  break;
+	case CCI_A_TYPE_DATE:
+	  _cubrid_date_from_value (value, &((T_CCI_DATE *) values[j])[i]);
+	  break;
+	case CCI_A_TYPE_BIT:
+	  bit = &((T_CCI_BIT *) values[j])[i];
+	  if (PyByteArray_Check (value))
+	    {
+	      bit->buf = PyByteArray_AS_STRING (value);
+	      bit->size = (int) PyByteArray_GET_SIZE (value);
+	    }
+	  else
+	    {
+	      bit->buf = PyBytes_AS_STRING (value);
+	      bit->size = (int) PyBytes_GET_SIZE (value);
+	    }
+	  break;
+	default:
+	  if (!(buf = _cubrid_CursorObject_str_value (self, value, &str)))
+	    {
+	      return -1;
+	    }
+	  res = PyList_Append (keep, str);
+	  Py_DECREF (str);
+	  if (res < 0)
+	    {
+	      return -1;
+	    }
+	  ((char **) values[j])[i] = buf;
+	  break;
+	}
+      if (PyErr_Occurred ())
+	{
+	  return -1;
+	}
+    }
+
+  res = cci_bind_param_array (self->handle, j + 1, a_type, values[j],
+			      nulls[j], u_type);
+  if (res < 0)
+    {
+      handle_error (res, NULL);
+      return -1;
+    }
+
+  return 0;
+}
+
+static PyObject *
+_cubrid_CursorObject_execute_array (_cubrid_CursorObject * self,
+				    PyObject * args)
+{
+  int i, j, n_rows, n_cols, res, res_cols, row_count = 0;
+  T_CCI_QUERY_RESULT *qr = NULL;
+  T_CCI_SQLX_CMD sql_type;
+  T_CCI_ERROR error;
+  PyObject *rows, *seq, *row, *value, *keep = NULL, *result = NULL;
+  PyObject **cells = NULL;
+  void **values = NULL;
+  int **nulls = NULL;
+
+  if (self->state == CURSOR_STATE_CLOSED)
+    {
+      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
+    }
+  if (!self->handle)
+    {
+      return handle_error (CUBRID_ER_SQL_UNPREPARE, NULL);
+    }
+  if (!PyArg_ParseTuple (args, "O", &rows))
+    {
+      return NULL;
+    }
+
+  if (!(seq = PySequence_Fast (rows, "rows must be a sequence")))
+    {
+      return NULL;
+    }
+
+  n_rows = (int) PySequence_Fast_GET_SIZE (seq);
+  n_cols = self->bind_num;
+  if (n_rows == 0)
+    {
+      Py_DECREF (seq);
+      self->row_count = 0;
+      return PyTuple_New (0);
+    }
+
+  /* keep holds the row sequences, the adapted values and the strings
+   * the bound arrays point to */
+  keep = PyList_New (0);
+  cells = PyMem_Malloc (sizeof (PyObject *) * n_rows * (n_cols + 1));
+  values = PyMem_Malloc (sizeof (void *) * (n_cols + 1));
+  nulls = PyMem_Malloc (sizeof (int *) * (n_cols + 1));
+  if (!keep || !cells || !values || !nulls)
+    {
+      PyErr_NoMemory ();
+      goto Error;
+    }
+  memset (values, 0, sizeof (void *) * (n_cols + 1));
+  memset (nulls, 0, sizeof (int *) * (n_cols + 1));
+
+  for (i = 0; i < n_rows; i++)
+    {
+      row = PySequence_Fast (PySequence_Fast_GET_ITEM (seq, i),
+			     "every row must be a sequence");
+      if (!row)
+	{
+	  goto Error;
+	}
+      res = PyList_Append (keep, row);
+      Py_DECREF (row);
+      if (res < 0)
+	{
+	  goto Error;
+	}
+      if (PySequence_Fast_GET_SIZE (row) != n_cols)
+	{
+	  handle_error (CUBRID_ER_PARAM_UNBIND, NULL);
+	  goto Error;
+	}
+
+      for (j = 0; j < n_cols; j++)
+	{
+	  value = _cubrid_adapt_value (PySequence_Fast_GET_ITEM (row, j));
+	  if (!value)
+	    {
+	      goto Error;
+	    }
+	  res = PyList_Append (keep, value);
+	  Py_DECREF (value);
+	  if (res < 0)
+	    {
+	      goto Error;
+	    }
+	  cells[i * n_cols + j] = value;
+	}
+    }
+
+  /* a handle used for array binding is not given back to the cache */
+  _cubrid_stmt_cache_forget (self->conn, self->handle);
+
+  res = cci_bind_param_array_size (self->handle, n_rows);
+  if (res < 0)
+    {
+      handle_error (res, NULL);
+      goto Error;
+    }
+
+  for (j = 0; j < n_cols; j++)
+    {
+      if (_cubrid_CursorObject_bind_array (self, cells, n_rows, n_cols, j,
+					   values, nulls, keep) < 0)
+	{
+	  goto Error;
+	}
+    }
+
+  Py_CLEAR (self->lastrowid);
+  self->lastrowid_stmt = 0;
+
+  CUBRID_BEGIN_CCI_STAT (self->conn);
+  res = cci_execute_array (self->handle, &qr, &error);
+  CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_EXECUTE);
+  self->conn->executed++;
+  if (res < 0)
+    {
+      handle_error (res, &error);
+      goto Error;
+    }
+
+  if (!(result = PyTuple_New (res)))
+    {
+      goto Error;
+    }
+  for (i = 0; i < res; i++)
+    {
+      if (CCI_QUERY_RESULT_RESULT (qr, i + 1) > 0)
+	{
+	  row_count += CCI_QUERY_RESULT_RESULT (qr, i + 1);
+	}
+      value = Py_BuildValue ("{s:i,s:i,s:s}",
+			     "result", CCI_QUERY_RESULT_RESULT (qr, i + 1),
+			     "err_no", CCI_QUERY_RESULT_ERR_NO (qr, i + 1),
+			     "err_msg",
+			     CCI_QUERY_RESULT_ERR_NO (qr, i + 1) >= 0 ?
+			     "success" : CCI_QUERY_RESULT_ERR_MSG (qr,
+								   i + 1));
+      if (!value)
+	{
+	  Py_CLEAR (result);
+	  goto Error;
+	}
+      PyTuple_SET_ITEM (result, i, value);
+    }
+
+  self->row_count = row_count;
+  self->col_count = 0;
+  /* n_cols is still needed to free the bound arrays */
+  cci_get_result_info (self->handle, &sql_type, &res_cols);
+  self->sql_type = sql_type;
+
+Error:
+  if (qr)
+    {
+      cci_query_result_free (qr, res);
+    }
+  if (values)
+    {
+      for (j = 0; j < n_cols; j++)
+	{
+	  PyMem_Free (values[j]);
+	  PyMem_Free (nulls[j]);
+	}
+    }
+  PyMem_Free (values);
+  PyMem_Free (nulls);
+  PyMem_Free (cells);
+  Py_XDECREF (keep);
+  Py_DECREF (seq);
+
+  return result;
+}
+
+static char _cubrid_CursorObject_fetch__doc__[] = "fetch_row()\n\
+get a single row from the query result. The cursor automatically moves\n\
+to the next row after getting the result.\n\
+\n\
+Example::\n\
+  import _cubrid\n\
+  con = _cubrid.connect('CUBRID:localhost:33000:demodb:::', 'public')\n\
+  cur = con.cursor()\n\
+  cur.prepare('select * from test_cubrid')\n\
+  cur.execute()\n\
+  row = cur.fetch_row()\n\
+  while row:\n\
+    print row\n\
+    row = cur.fetch_row()\n\
+  cur.close()\n\
+  con.close()";
+
+/* Check that the cursor points at a row of the result set. Return 0 when
+ * it does, CCI_ER_NO_MORE_DATA when the result set is exhausted, and -1
+ * with an exception set on error.
+ */
+static int
+_cubrid_CursorObject_check_pos (_cubrid_CursorObject * self)
+{
+  int res;
+  T_CCI_ERROR error;
+
+  CUBRID_BEGIN_CCI_STAT (self->conn);
+  res = cci_cursor (self->handle, 0, CCI_CURSOR_CURRENT, &error);
+  CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_CURSOR);
+  if (res == CCI_ER_NO_MORE_DATA)
+    {
+      return CCI_ER_NO_MORE_DATA;
+    }
+  else if (res < 0)
+    {
+      handle_error (res, &error);
+      return -1;
+    }
+
+  return 0;
+}
+
+/* Fetch the row at the current cursor position and move the cursor to
+ * the next row. The caller must have checked the position first. *more is
+ * set to 0 when the row fetched was the last one of the result set.
+ */
+static PyObject *
+_cubrid_CursorObject_fetch_current (_cubrid_CursorObject * self, int how,
+				    int *more)
+{
+  int res;
+  T_CCI_ERROR error;
+  PyObject *row;
+  double start = 0;
+
+  if (self->col_count > 0 && !self->columns)
+    {
+      return handle_error (CUBRID_ER_CANNOT_GET_COLUMN_INFO, NULL);
+    }
+
+  CUBRID_BEGIN_CCI_STAT (self->conn);
+  res = cci_fetch (self->handle, &error);
+  CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_FETCH);
+  if (res < 0)
+    {
+      return handle_error (res, &error);
+    }
+
+  if (self->conn->stats_enabled)
+    {
+      start = _cubrid_monotonic ();
+    }
+  switch (how)
+    {
+    case 0:
+      row = _cubrid_row_to_tuple (self);
+      break;
+    case 1:
+      row = _cubrid_row_to_dict (self);
+      break;
+    default:
+      row = _cubrid_row_to_row (self);
+      break;
+    }
+  if (!row)
+    {
+      return NULL;
+    }
+  if (self->conn->stats_enabled)
+    {
+      _cubrid_stats_row (self->conn, &self->stats, _cubrid_row_width (row),
+			 start);
+    }
+  _cubrid_CursorObject_row_fetched (self, row);
+
+  CUBRID_BEGIN_CCI_STAT (self->conn);
+  res = cci_cursor (self->handle, 1, CCI_CURSOR_CURRENT, &error);
+  CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_CURSOR);
+  if (res < 0 && res != CCI_ER_NO_MORE_DATA)
+    {
+      Py_DECREF (row);
+      return handle_error (res, &error);
+    }
+
+  *more = (res != CCI_ER_NO_MORE_DATA);
+  self->cursor_pos += 1;
+
+  return row;
+}
+
+static PyObject *
+_cubrid_CursorObject_fetch (_cubrid_CursorObject * self, PyObject * args)
+{
+  int res, how = 0, more;
+
+  if (self->state == CURSOR_STATE_CLOSED)
+    {
+      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
+    }
+  if (!PyArg_ParseTuple (args, "|i", &how))
+    {
+      return NULL;
+    }
+
+  if (how < 0 || how > 2)
+    {
+      return handle_error (CUBRID_ER_INVALID_PARAM, NULL);
+    }
+
+  res = _cubrid_CursorObject_check_pos (self);
+  if (res == CCI_ER_NO_MORE_DATA)
+    {
+      Py_INCREF (Py_None);
+      return Py_None;
+    }
+  else if (res < 0)
+    {
+      return NULL;
+    }
+
+  return _cubrid_CursorObject_fetch_current (self, how, &more);
+}
+
+static char _cubrid_CursorObject_fetch_many__doc__[] =
+  "fetch_many([n[, how]])\n\
+get up to n rows from the query result in a single call. The rows are\n\
+returned in a list and the cursor is moved past the last row returned.\n\
+If n is negative or not given, all the remaining rows are returned.\n\
+An empty list is returned when no more rows are available.\n\
+\n\
+Parameters::\n\
+  n: int, the maximum number of rows to fetch\n\
+  how: int, 0 to get rows as tuples (default), 1 to get rows as dicts,\n\
+       2 to get rows as _cubrid.row objects\n\
+\n\
+Example::\n\
+  import _cubrid\n\
+  con = _cubrid.connect('CUBRID:localhost:33000:demodb:::', 'public')\n\
+  cur = con.cursor()\n\
+  cur.prepare('select * from test_cubrid')\n\
+  cur.execute()\n\
+  rows = cur.fetch_many(100)\n\
+  while rows:\n\
+    print rows\n\
+    rows = cur.fetch_many(100)\n\
+  cur.close()\n\
+  con.close()";
+
+static PyObject *
+_cubrid_CursorObject_fetch_many (_cubrid_CursorObject * self,
+				 PyObject * args)
+{
+  int res, n = -1, how = 0, more = 1, count = 0;
+  PyObject *rows, *row;
+
+  if (self->state == CURSOR_STATE_CLOSED)
+    {
+      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
+    }
+  if (!PyArg_ParseTuple (args, "|ii", &n, &how))
+    {
+      return NULL;
+    }
+
+  if (how < 0 || how > 2)
+    {
+      return handle_error (CUBRID_ER_INVALID_PARAM, NULL);
+    }
+
+  if (!(rows = PyList_New (0)))
+    {
+      return NULL;
+    }
+
+  if (n == 0)
+    {
+      return rows;
+    }
+
+  res = _cubrid_CursorObject_check_pos (self);
+  if (res == CCI_ER_NO_MORE_DATA)
+    {
+      return rows;
+    }
+  else if (res < 0)
+    {
+      Py_DECREF (rows);
+      return NULL;
+    }
+
+  while (more && (n < 0 || count < n))
+    {
+      row = _cubrid_CursorObject_fetch_current (self, how, &more);
+      if (!row)
 	{
-	  val = _cubrid_return_PyInt_FromLong (num);
+	  Py_DECREF (rows);
+	  return NULL;
 	}
-      break;
-    case CCI_U_TYPE_FLOAT:
-    case CCI_U_TYPE_DOUBLE:
-      res = cci_get_data (self->handle, index, CCI_A_TYPE_STR, &buffer, &ind);
-      if (res < 0)
+
+      if (PyList_Append (rows, row) < 0)
 	{
-	  return handle_error (res, NULL);
+	  Py_DECREF (row);
+	  Py_DECREF (rows);
+	  return NULL;
 	}
-      if (ind < 0)
+      Py_DECREF (row);
+      count++;
+    }
+
+  return rows;
+}
+
+/* array.array typecode used by fetch_columns() for a column, 0 when the
+ * column is returned as a list. With temporal set, DATE, DATETIME and
+ * TIMESTAMP columns are returned as 64 bit counts since the epoch.
+ */
+static char
+_cubrid_column_typecode (_cubrid_column * col, int temporal)
+{
+  switch (col->type)
+    {
+    case CCI_U_TYPE_DATE:
+    case CCI_U_TYPE_DATETIME:
+    case CCI_U_TYPE_TIMESTAMP:
+      if (!temporal)
 	{
-	  Py_INCREF (Py_None);
-	  val = Py_None;
+	  return 0;
 	}
-      else
-	{
-	  tmpval = _cubrid_return_PyString_FromString (buffer);
-#if PY_MAJOR_VERSION >= 3
-	  val = PyFloat_FromString (tmpval);
+      /* fall through */
+    case CCI_U_TYPE_BIGINT:
+#if PY_VERSION_HEX >= 0x03030000
+      return 'q';
 #else
-	  val = PyFloat_FromString (tmpval, NULL);
+      return 'l';
 #endif
-	  Py_DECREF (tmpval);
-	}
-      break;
-    case CCI_U_TYPE_NUMERIC:
-      res = cci_get_data (self->handle, index, CCI_A_TYPE_STR, &buffer, &ind);
-      if (res < 0)
-	{
-	  return handle_error (res, NULL);
-	}
-      if (ind < 0)
-	{
-	  Py_INCREF (Py_None);
-	  val = Py_None;
-	}
-      else
+    case CCI_U_TYPE_SHORT:
+      return 'h';
+    case CCI_U_TYPE_INT:
+      return 'i';
+    case CCI_U_TYPE_FLOAT:
+    case CCI_U_TYPE_DOUBLE:
+      return 'd';
+    default:
+      return 0;
+    }
+}
+
+static int
+_cubrid_column_itemsize (char typecode)
+{
+  switch (typecode)
+    {
+    case 'h':
+      return sizeof (short);
+    case 'i':
+      return sizeof (int);
+    case 'q':
+      return sizeof (CUBRID_LONG_LONG);
+    case 'l':
+      return sizeof (long);
+    default:
+      return sizeof (double);
+    }
+}
+
+/* Number of days from 1970-01-01 to the given date of the proleptic
+ * Gregorian calendar.
+ */
+static CUBRID_LONG_LONG
+_cubrid_days_from_civil (int y, int m, int d)
+{
+  int era, yoe, doy, doe;
+
+  y -= (m <= 2);
+  era = (y >= 0 ? y : y - 399) / 400;
+  yoe = y - era * 400;
+  doy = (153 * (m + (m > 2 ? -3 : 9)) + 2) / 5 + d - 1;
+  doe = yoe * 365 + yoe / 4 - yoe / 100 + doy;
+
+  return (CUBRID_LONG_LONG) era * 146097 + doe - 719468;
+}
+
+/* DATE as days, DATETIME as milliseconds and TIMESTAMP as seconds since
+ * 1970-01-01 00:00:00, the units of numpy datetime64[D], [ms] and [s].
+ */
+static CUBRID_LONG_LONG
+_cubrid_date_to_epoch (int type, T_CCI_DATE * dt)
+{
+  CUBRID_LONG_LONG days, secs;
+
+  days = _cubrid_days_from_civil (dt->yr, dt->mon, dt->day);
+  if (type == CCI_U_TYPE_DATE)
+    {
+      return days;
+    }
+
+  secs = days * 86400 + dt->hh * 3600 + dt->mm * 60 + dt->ss;
+  if (type == CCI_U_TYPE_TIMESTAMP)
+    {
+      return secs;
+    }
+
+  return secs * 1000 + dt->ms;
+}
+
+/* Store the value of the column at the current row into its buffer. NULL
+ * is stored as 0 and flagged in the null mask.
+ */
+static int
+_cubrid_column_buffer_put (_cubrid_CursorObject * self, _cubrid_column * col,
+			   _cubrid_column_buffer * b, int row)
+{
+  int res, ind, ival = 0;
+  CUBRID_LONG_LONG lval = 0;
+  double dval = 0;
+  short sval;
+  long l;
+  T_CCI_DATE dt;
+  char *p = b->data + (size_t) row * b->itemsize;
+
+  if (b->temporal)
+    {
+      res = cci_get_data (self->handle, col->index, CCI_A_TYPE_DATE, &dt,
+			  &ind);
+      if (res >= 0 && ind >= 0)
 	{
-	  tmpval = PyTuple_New (1);
-	  PyTuple_SetItem (tmpval, 0, Py_BuildValue ("s", buffer));
-	  val = PyObject_CallObject (_func_Decimal, tmpval);
-	  Py_DECREF (tmpval);
+	  lval = _cubrid_date_to_epoch (col->type, &dt);
 	}
+    }
+  else if (b->typecode == 'h' || b->typecode == 'i')
+    {
+      res = cci_get_data (self->handle, col->index, CCI_A_TYPE_INT, &ival,
+			  &ind);
+    }
+  else if (b->typecode == 'q' || b->typecode == 'l')
+    {
+      res = cci_get_data (self->handle, col->index, CCI_A_TYPE_BIGINT,
+			  &lval, &ind);
+    }
+  else
+    {
+      res = cci_get_data (self->handle, col->index, CCI_A_TYPE_DOUBLE,
+			  &dval, &ind);
+    }
+  if (res < 0)
+    {
+      handle_error (res, NULL);
+      return -1;
+    }
+
+  b->nulls[row] = (ind < 0);
+  if (ind < 0)
+    {
+      ival = 0;
+      lval = 0;
+      dval = 0;
+    }
+
+  switch (b->typecode)
+    {
+    case 'h':
+      sval = (short) ival;
+      memcpy (p, &sval, sizeof (sval));
       break;
-    case CCI_U_TYPE_DATE:
-      res = cci_get_data (self->handle, index, CCI_A_TYPE_DATE, &dt, &ind);
-      if (res < 0)
-	{
-	  return handle_error (res, NULL);
-	}
-      if (ind < 0)
-	{
-	  Py_INCREF (Py_None);
-	  val = Py_None;
-	}
-      else
-	{
-	  val = PyDate_FromDate (dt.yr, dt.mon, dt.day);
-	}
+    case 'i':
+      memcpy (p, &ival, sizeof (ival));
       break;
-    case CCI_U_TYPE_TIME:
-      res = cci_get_data (self->handle, index, CCI_A_TYPE_DATE, &dt, &ind);
-      if (res < 0)
-	{
-	  return handle_error (res, NULL);
-	}
-      if (ind < 0)
-	{
-	  Py_INCREF (Py_None);
-	  val = Py_None;
-	}
-      else
-	{
-	  val = PyTime_FromTime (dt.hh, dt.mm, dt.ss, 0);
-	}
+    case 'q':
+      memcpy (p, &lval, sizeof (lval));
       break;
-    case CCI_U_TYPE_DATETIME:
-      res = cci_get_data (self->handle, index, CCI_A_TYPE_DATE, &dt, &ind);
-      if (res < 0)
-	{
-	  return handle_error (res, NULL);
-	}
-      if (ind < 0)
-	{
-	  Py_INCREF (Py_None);
-	  val = Py_None;
-	}
-      else
-	{
-	  val =
-	    PyDateTime_FromDateAndTime (dt.yr, dt.mon, dt.day, dt.hh, dt.mm,
-					dt.ss, dt.ms * 1000);
-	}
+    case 'l':
+      l = (long) lval;
+      memcpy (p, &l, sizeof (l));
       break;
-    case CCI_U_TYPE_TIMESTAMP:
-      res = cci_get_data (self->handle, index, CCI_A_TYPE_DATE, &dt, &ind);
-      if (res < 0)
-	{
-	  return handle_error (res, NULL);
-	}
-      if (ind < 0)
+    default:
+      memcpy (p, &dval, sizeof (dval));
+      break;
+    }
+
+  return 0;
+}
+
+static PyObject *
+_cubrid_column_buffer_to_array (char typecode, char *data, Py_ssize_t size)
+{
+  char code[2] = { typecode, '\0' };
+  PyObject *bytes, *array;
+
+  if (!(bytes = PyBytes_FromStringAndSize (data, size)))
+    {
+      return NULL;
+    }
+
+  array = PyObject_CallFunction (_cubrid_array_type, "sO", code, bytes);
+  Py_DECREF (bytes);
+
+  return array;
+}
+
+static void
+_cubrid_column_buffers_free (_cubrid_column_buffer * bufs, int count)
+{
+  int i;
+
+  for (i = 0; i < count; i++)
+    {
+      PyMem_Free (bufs[i].data);
+      PyMem_Free (bufs[i].nulls);
+      Py_XDECREF (bufs[i].list);
+    }
+  PyMem_Free (bufs);
+}
+
+static char _cubrid_CursorObject_fetch_columns__doc__[] =
+  "fetch_columns([n[, temporal]])\n\
+get up to n rows from the query result, returned column by column. If n\n\
+is negative or not given, all the remaining rows are returned.\n\
+Returns a tuple (columns, nulls) with one item per column. INT, SMALLINT,\n\
+BIGINT, FLOAT and DOUBLE columns are returned as array.array objects, NULL\n\
+being stored as 0, and their item in nulls is an array.array('B') set to 1\n\
+for the NULL rows. Other columns are returned as lists holding None for\n\
+NULL, and their item in nulls is None.\n\
+If temporal is true, DATE, DATETIME and TIMESTAMP columns are returned as\n\
+64 bit arrays of days, milliseconds and seconds since 1970-01-01.\n\
+\n\
+Example::\n\
+  import _cubrid\n\
+  con = _cubrid.connect('CUBRID:localhost:33000:demodb:::', 'public')\n\
+  cur = con.cursor()\n\
+  cur.prepare('select id, name from test_cubrid')\n\
+  cur.execute()\n\
+  (ids, names), (id_nulls, name_nulls) = cur.fetch_columns()\n\
+  cur.close()\n\
+  con.close()";
+
+static PyObject *
+_cubrid_CursorObject_fetch_columns (_cubrid_CursorObject * self,
+				    PyObject * args)
+{
+  int res, i, type, n = -1, temporal = 0, ncol, count = 0, cap = 0, more;
+  long bytes = 0;
+  double start = 0;
+  char *p;
+  T_CCI_ERROR error;
+  _cubrid_column *col;
+  _cubrid_column_buffer *bufs, *b;
+  PyObject *columns = NULL, *nulls = NULL, *val;
+
+  if (self->state == CURSOR_STATE_CLOSED)
+    {
+      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
+    }
+  if (!PyArg_ParseTuple (args, "|ii", &n, &temporal))
+    {
+      return NULL;
+    }
+  if (self->col_count > 0 && !self->columns)
+    {
+      return handle_error (CUBRID_ER_CANNOT_GET_COLUMN_INFO, NULL);
+    }
+
+  ncol = (self->col_count > 0) ? self->col_count : 0;
+  bufs = PyMem_Malloc (sizeof (_cubrid_column_buffer) * (ncol + 1));
+  if (!bufs)
+    {
+      return PyErr_NoMemory ();
+    }
+  memset (bufs, 0, sizeof (_cubrid_column_buffer) * (ncol + 1));
+
+  for (i = 0; i < ncol; i++)
+    {
+      b = &bufs[i];
+      b->typecode = _cubrid_column_typecode (&self->columns[i], temporal);
+      type = self->columns[i].type;
+      b->temporal = temporal && (type == CCI_U_TYPE_DATE
+				 || type == CCI_U_TYPE_DATETIME
+				 || type == CCI_U_TYPE_TIMESTAMP);
+      b->itemsize = _cubrid_column_itemsize (b->typecode);
+      if (!b->typecode && !(b->list = PyList_New (0)))
 	{
-	  Py_INCREF (Py_None);
-	  val = Py_None;
+	  goto error;
 	}
-      else
+    }
+
+  res = (n == 0) ? CCI_ER_NO_MORE_DATA : _cubrid_CursorObject_check_pos (self);
+  if (res == -1)
+    {
+      goto error;
+    }
+  more = (res == 0);
+
+  while (more && (n < 0 || count < n))
+    {
+      if (count == cap)
 	{
-	  val =
-	    PyDateTime_FromDateAndTime (dt.yr, dt.mon, dt.day, dt.hh, dt.mm,
-					dt.ss, 0);
+	  cap = cap ? cap * 2 : 64;
+	  for (i = 0, b = bufs; i < ncol; i++, b++)
+	    {
+	      if (!b->typecode)
+		{
+		  continue;
+		}
+	      p = PyMem_Realloc (b->data, (size_t) cap * b->itemsize);
+	      if (!p)
+		{
+		  PyErr_NoMemory ();
+		  goto error;
+		}
+	      b->data = p;
+	      p = PyMem_Realloc (b->nulls, cap);
+	      if (!p)
+		{
+		  PyErr_NoMemory ();
+		  goto error;
+		}
+	      b->nulls = p;
+	    }
 	}
-      break;
-    default:
-      res = cci_get_data (self->handle, index, CCI_A_TYPE_STR, &buffer, &ind);
+
+      CUBRID_BEGIN_CCI_STAT (self->conn);
+      res = cci_fetch (self->handle, &error);
+      CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_FETCH);
       if (res < 0)
 	{
-	  return handle_error (res, NULL);
+	  handle_error (res, &error);
+	  goto error;
 	}
-      if (ind < 0)
+
+      if (self->conn->stats_enabled)
 	{
-	  Py_INCREF (Py_None);
-	  val = Py_None;
+	  start = _cubrid_monotonic ();
+	  bytes = 0;
 	}
-      else
+      for (i = 0, b = bufs, col = self->columns; i < ncol; i++, b++, col++)
 	{
-	  if (self->charset != NULL && *(self->charset) != '\0')
+	  if (b->typecode)
 	    {
-	      val =
-		_cubrid_return_PyUnicode_FromString (buffer, strlen (buffer),
-						     self->charset, NULL);
+	      if (_cubrid_column_buffer_put (self, col, b, count) < 0)
+		{
+		  goto error;
+		}
+	      bytes += b->itemsize;
+	      continue;
 	    }
-	  else
+
+	  if (!(val = col->decode (self, col)))
+	    {
+	      goto error;
+	    }
+	  bytes += _cubrid_value_width (val);
+	  if (PyList_Append (b->list, val) < 0)
 	    {
-	      val = _cubrid_return_PyString_FromString (buffer);
+	      Py_DECREF (val);
+	      goto error;
 	    }
+	  Py_DECREF (val);
 	}
-      break;
-    }
-
-  return val;
-}
-
-/* Collection(set, multiset, sequence) 	-> List, 
-* Collection' item  -> String 
-*/
+      if (self->conn->stats_enabled)
+	{
+	  _cubrid_stats_row (self->conn, &self->stats, bytes, start);
+	}
+      _cubrid_CursorObject_row_fetched (self, NULL);
 
-static PyObject *
-_cubrid_CursorObject_dbset_to_pyvalue (_cubrid_CursorObject * self, int index)
-{
-  int i, res, ind;
-  PyObject *val;
-  T_CCI_SET set = NULL;
-  int set_size;
-  PyObject *e;
-  char *buffer;
+      CUBRID_BEGIN_CCI_STAT (self->conn);
+      res = cci_cursor (self->handle, 1, CCI_CURSOR_CURRENT, &error);
+      CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_CURSOR);
+      if (res < 0 && res != CCI_ER_NO_MORE_DATA)
+	{
+	  handle_error (res, &error);
+	  goto error;
+	}
 
-  if (self->state == CURSOR_STATE_CLOSED)
-    {
-      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
-    }
-  res = cci_get_data (self->handle, index, CCI_A_TYPE_SET, &set, &ind);
-  if (res < 0)
-    {
-      return handle_error (res, NULL);
+      more = (res != CCI_ER_NO_MORE_DATA);
+      self->cursor_pos += 1;
+      count++;
     }
 
-  if (ind < 0)
+  if (!(columns = PyList_New (ncol)) || !(nulls = PyList_New (ncol)))
     {
-      Py_INCREF (Py_None);
-      return Py_None;
+      goto error;
     }
 
-  set_size = cci_set_size (set);
-  val = PyList_New (set_size);
-
-  for (i = 0; i < set_size; i++)
+  for (i = 0, b = bufs; i < ncol; i++, b++)
     {
-      res = cci_set_get (set, i + 1, CCI_A_TYPE_STR, &buffer, &ind);
-      if (res < 0)
+      if (!b->typecode)
 	{
-	  return handle_error (res, NULL);
+	  PyList_SET_ITEM (columns, i, b->list);
+	  b->list = NULL;
+	  Py_INCREF (Py_None);
+	  PyList_SET_ITEM (nulls, i, Py_None);
+	  continue;
 	}
 
-      e = _cubrid_return_PyString_FromString (buffer);
-      PyList_SetItem (val, i, e);
+      val = _cubrid_column_buffer_to_array (b->typecode, b->data,
+					    (Py_ssize_t) count * b->itemsize);
+      if (!val)
+	{
+	  goto error;
+	}
+      PyList_SET_ITEM (columns, i, val);
+
+      val = _cubrid_column_buffer_to_array ('B', b->nulls, count);
+      if (!val)
+	{
+	  goto error;
+	}
+      PyList_SET_ITEM (nulls, i, val);
     }
 
-  cci_set_free (set);
+  _cubrid_column_buffers_free (bufs, ncol);
+
+  val = PyTuple_Pack (2, columns, nulls);
+  Py_DECREF (columns);
+  Py_DECREF (nulls);
+
   return val;
+
+error:
+  _cubrid_column_buffers_free (bufs, ncol);
+  Py_XDECREF (columns);
+  Py_XDECREF (nulls);
+
+  return NULL;
 }
 
 static PyObject *
-_cubrid_row_to_tuple (_cubrid_CursorObject * self)
+_cubrid_CursorObject_iternext (_cubrid_CursorObject * self)
 {
-  int i, type;
-  PyObject *row, *val;
+  int res, more;
 
   if (self->state == CURSOR_STATE_CLOSED)
     {
       return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
     }
-  row = PyTuple_New (self->col_count);
 
-  for (i = 0; i < self->col_count; i++)
+  res = _cubrid_CursorObject_check_pos (self);
+  if (res == CCI_ER_NO_MORE_DATA)
     {
-      type = CCI_GET_RESULT_INFO_TYPE (self->col_info, i + 1);
-
-      if (CCI_IS_COLLECTION_TYPE (type))
-        {
-          val = _cubrid_CursorObject_dbset_to_pyvalue (self, i + 1);
-        }
-      else
-        {
-          val = _cubrid_CursorObject_dbval_to_pyvalue (self, type, i + 1);
-        }
-      PyTuple_SetItem (row, i, val);
+      /* NULL without an exception set ends the iteration */
+      return NULL;
+    }
+  else if (res < 0)
+    {
+      return NULL;
     }
 
-  return row;
+  return _cubrid_CursorObject_fetch_current (self, self->fetch_type, &more);
 }
 
+static char _cubrid_CursorObject__set_fetch_type__doc__[] =
+  "Only used internally. This function should not be used by user.";
+
 static PyObject *
-_cubrid_row_to_dict (_cubrid_CursorObject * self)
+_cubrid_CursorObject__set_fetch_type (_cubrid_CursorObject * self,
+				      PyObject * args)
 {
-  PyObject *row, *val;
-  int i, type;
+  int how;
 
   if (self->state == CURSOR_STATE_CLOSED)
     {
       return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
     }
-  if (!(row = PyDict_New ()))
+  if (!PyArg_ParseTuple (args, "i", &how))
     {
       return NULL;
     }
 
-  for (i = 0; i < self->col_count; i++)
+  if (how < 0 || how > 2)
     {
-      char *col_name = CCI_GET_RESULT_INFO_NAME (self->col_info, i + 1);
-
-      type = CCI_GET_RESULT_INFO_TYPE (self->col_info, i + 1);
-
-      if (CCI_IS_COLLECTION_TYPE (type))
-	{
-	  val = _cubrid_CursorObject_dbset_to_pyvalue (self, i + 1);
-	}
-      else
-	{
-	  val = _cubrid_CursorObject_dbval_to_pyvalue (self, type, i + 1);
-	}
-      PyMapping_SetItemString (row, col_name, val);
+      return handle_error (CUBRID_ER_INVALID_PARAM, NULL);
     }
 
-  return row;
+  self->fetch_type = how;
+
+  Py_INCREF (Py_None);
+  return Py_None;
 }
 
-static char _cubrid_CursorObject_fetch__doc__[] = "fetch_row()\n\
-get a single row from the query result. The cursor automatically moves\n\
-to the next row after getting the result.\n\
-\n\
-Example::\n\
-  import _cubrid\n\
-  con = _cubrid.connect('CUBRID:localhost:33000:demodb:::', 'public')\n\
-  cur = con.cursor()\n\
-  cur.prepare('select * from test_cubrid')\n\
-  cur.execute()\n\
-  row = cur.fetch_row()\n\
-  while row:\n\
-    print row\n\
-    row = cur.fetch_row()\n\
-  cur.close()\n\
-  con.close()";
+static char _cubrid_CursorObject__set_numeric_type__doc__[] =
+  "Only used internally. This function should not be used by user.";
 
 static PyObject *
-_cubrid_CursorObject_fetch (_cubrid_CursorObject * self, PyObject * args)
+_cubrid_CursorObject__set_numeric_type (_cubrid_CursorObject * self,
+					PyObject * args)
 {
-  int res, how = 0;
-  T_CCI_ERROR error;
-  PyObject *row;
+  int numeric_type;
 
   if (self->state == CURSOR_STATE_CLOSED)
     {
       return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
     }
-  if (!PyArg_ParseTuple (args, "|i", &how))
+  if (!PyArg_ParseTuple (args, "i", &numeric_type))
     {
       return NULL;
     }
 
-  if (how < 0 || how > 1)
+  if (numeric_type < CUBRID_NUMERIC_AS_DECIMAL
+      || numeric_type > CUBRID_NUMERIC_AS_STR)
     {
       return handle_error (CUBRID_ER_INVALID_PARAM, NULL);
     }
 
-  res = cci_cursor (self->handle, 0, CCI_CURSOR_CURRENT, &error);
-  if (res == CCI_ER_NO_MORE_DATA)
-    {
-      Py_INCREF (Py_None);
-      return Py_None;
-    }
-  else if (res < 0)
-    {
-      return handle_error (res, &error);
-    }
-
-  res = cci_fetch (self->handle, &error);
-  if (res < 0)
-    {
-      return handle_error (res, &error);
-    }
-
-  if (how == 0)
-    {
-      row = _cubrid_row_to_tuple (self);
-    }
-  else
-    {
-      row = _cubrid_row_to_dict (self);
-    }
+  self->numeric_type = numeric_type;
 
-  res = cci_cursor (self->handle, 1, CCI_CURSOR_CURRENT, &error);
-  if (res < 0 && res != CCI_ER_NO_MORE_DATA)
+  /* pick the new decoder for the result set being fetched */
+  if (self->columns)
     {
-      return handle_error (res, &error);
+      _cubrid_CursorObject_free_columns (self);
+      if (_cubrid_CursorObject_set_columns (self) < 0)
+	{
+	  return NULL;
+	}
     }
 
-  self->cursor_pos += 1;
-
-  return row;
+  Py_INCREF (Py_None);
+  return Py_None;
 }
 
 static char _cubrid_CursorObject_fetch_lob__doc__[] = "fetch_lob(col, lob)\n\
@@ -2564,7 +5407,9 @@ _cubrid_CursorObject_fetch_lob (_cubrid_CursorObject * self, PyObject * args)
       return NULL;
     }
 
+  CUBRID_BEGIN_CCI_STAT (self->conn);
   res = cci_cursor (self->handle, 0, CCI_CURSOR_CURRENT, &error);
+  CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_CURSOR);
   if (res == CCI_ER_NO_MORE_DATA)
     {
       Py_INCREF (Py_None);
@@ -2575,7 +5420,9 @@ _cubrid_CursorObject_fetch_lob (_cubrid_CursorObject * self, PyObject * args)
       return handle_error (res, &error);
     }
 
+  CUBRID_BEGIN_CCI_STAT (self->conn);
   res = cci_fetch (self->handle, &error);
+  CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_FETCH);
   if (res < 0)
     {
       return handle_error (res, &error);
@@ -2604,7 +5451,9 @@ _cubrid_CursorObject_fetch_lob (_cubrid_CursorObject * self, PyObject * args)
 	}
     }
 
+  CUBRID_BEGIN_CCI_STAT (self->conn);
   res = cci_cursor (self->handle, 1, CCI_CURSOR_CURRENT, &error);
+  CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_CURSOR);
   if (res < 0 && res != CCI_ER_NO_MORE_DATA)
     {
       return handle_error (res, &error);
@@ -2612,46 +5461,207 @@ _cubrid_CursorObject_fetch_lob (_cubrid_CursorObject * self, PyObject * args)
 
   self->cursor_pos += 1;
 
-  Py_INCREF (Py_None);
-  return Py_None;
+  Py_INCREF (Py_None);
+  return Py_None;
+}
+
+static char _cubrid_CursorObject_affected_rows__doc__[] = "affected_rows()\n\
+get the number of rows affected by the SQL sentence (INSERT,\n\
+DELETE, UPDATE).\n\
+\n\
+Return values::\n\
+  Success: Number of rows affected by the SQL sentence\n\
+  Failure: -1";
+
+static PyObject *
+_cubrid_CursorObject_affected_rows (_cubrid_CursorObject * self,
+				    PyObject * args)
+{
+  int affected_rows;
+
+  if (self->state == CURSOR_STATE_CLOSED)
+    {
+      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
+    }
+  if (!PyArg_ParseTuple (args, ""))
+    {
+      return NULL;
+    }
+
+  switch (self->sql_type)
+    {
+    case SQLX_CMD_INSERT:
+    case SQLX_CMD_UPDATE:
+    case SQLX_CMD_DELETE:
+      affected_rows = self->row_count;
+      break;
+    default:
+      affected_rows = -1;
+      break;
+    }
+
+  return _cubrid_return_PyInt_FromLong (affected_rows);
+}
+
+static char _cubrid_CursorObject_set_fetch_size__doc__[] =
+  "set_fetch_size(size)\n\
+Set how many rows are transferred from the server per request when\n\
+fetching. The client buffers only one such batch of rows at a time.\n\
+The size applies to the current and the following statements of the\n\
+cursor. 0, the default, lets the size adapt to the row width, see\n\
+set_fetch_target().\n\
+\n\
+size: int, number of rows per request.";
+
+static PyObject *
+_cubrid_CursorObject_set_fetch_size (_cubrid_CursorObject * self,
+				     PyObject * args)
+{
+  int size, res;
+
+  if (self->state == CURSOR_STATE_CLOSED)
+    {
+      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
+    }
+  if (!PyArg_ParseTuple (args, "i", &size))
+    {
+      return NULL;
+    }
+
+  if (size < 0)
+    {
+      return handle_error (CUBRID_ER_INVALID_PARAM, NULL);
+    }
+
+  self->fetch_size = size;
+  if (size > 0)
+    {
+      self->fetch_batch = size;
+      self->fetch_batch_left = size;
+    }
+  if (self->handle && size > 0)
+    {
+      res = cci_fetch_size (self->handle, size);
+      if (res < 0)
+	{
+	  return handle_error (res, NULL);
+	}
+    }
+
+  Py_INCREF (Py_None);
+  return Py_None;
+}
+
+static char _cubrid_CursorObject_set_fetch_target__doc__[] =
+  "set_fetch_target(nbytes)\n\
+Set about how many bytes a batch of fetched rows should carry when no\n\
+fixed fetch size is set. Batches start at 100 rows and grow towards\n\
+the size matching nbytes, from the observed row width, as the rows are\n\
+read. 0 keeps the CCI fetch size unchanged.\n\
+\n\
+nbytes: int, target size of a batch in bytes.";
+
+static PyObject *
+_cubrid_CursorObject_set_fetch_target (_cubrid_CursorObject * self,
+				       PyObject * args)
+{
+  int target;
+
+  if (self->state == CURSOR_STATE_CLOSED)
+    {
+      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
+    }
+  if (!PyArg_ParseTuple (args, "i", &target))
+    {
+      return NULL;
+    }
+
+  if (target < 0)
+    {
+      return handle_error (CUBRID_ER_INVALID_PARAM, NULL);
+    }
+
+  self->fetch_target = target;
+
+  Py_INCREF (Py_None);
+  return Py_None;
+}
+
+static char _cubrid_CursorObject_fetch_stats__doc__[] =
+  "fetch_stats()\n\
+Return a dict describing the fetching of the current result set:\n\
+rows, the number of rows read, round_trips, the number of requests to\n\
+the server counting the execution, fetch_size, the current batch size\n\
+in rows, and row_width, the average row width in bytes. round_trips is\n\
+derived from the batch size.";
+
+static PyObject *
+_cubrid_CursorObject_fetch_stats (_cubrid_CursorObject * self,
+				  PyObject * args)
+{
+  if (self->state == CURSOR_STATE_CLOSED)
+    {
+      return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
+    }
+  if (!PyArg_ParseTuple (args, ""))
+    {
+      return NULL;
+    }
+
+  return Py_BuildValue ("{s:l,s:l,s:i,s:i}",
+			"rows", self->rows_fetched,
+			"round_trips", self->round_trips,
+			"fetch_size", self->fetch_batch,
+			"row_width", self->row_width);
+}
+
+static char _cubrid_CursorObject_stats__doc__[] = "stats()\n\
+Return a dict of the driver statistics of the cursor, counted while\n\
+they are enabled on its connection. See connection.stats().";
+
+static PyObject *
+_cubrid_CursorObject_stats (_cubrid_CursorObject * self, PyObject * args)
+{
+  if (!PyArg_ParseTuple (args, ""))
+    {
+      return NULL;
+    }
+
+  return _cubrid_stats_to_dict (&self->stats);
 }
 
-static char _cubrid_CursorObject_affected_rows__doc__[] = "affected_rows()\n\
-get the number of rows affected by the SQL sentence (INSERT,\n\
-DELETE, UPDATE).\n\
+static char _cubrid_CursorObject_set_forward_only__doc__[] =
+  "set_forward_only(flag)\n\
+Make the cursor forward only. data_seek() and moving back with\n\
+row_seek() then raise NotSupportedError, which allows the rows to be\n\
+streamed from the server without being kept by the client.\n\
 \n\
-Return values::\n\
-  Success: Number of rows affected by the SQL sentence\n\
-  Failure: -1";
+flag: bool.";
 
 static PyObject *
-_cubrid_CursorObject_affected_rows (_cubrid_CursorObject * self,
-				    PyObject * args)
+_cubrid_CursorObject_set_forward_only (_cubrid_CursorObject * self,
+				       PyObject * args)
 {
-  int affected_rows;
+  PyObject *flag;
 
   if (self->state == CURSOR_STATE_CLOSED)
     {
       return handle_error (CUBRID_ER_INVALID_CURSOR, NULL);
     }
-  if (!PyArg_ParseTuple (args, ""))
+  if (!PyArg_ParseTuple (args, "O", &flag))
     {
       return NULL;
     }
 
-  switch (self->sql_type)
+  self->forward_only = PyObject_IsTrue (flag);
+  if (self->forward_only < 0)
     {
-    case SQLX_CMD_INSERT:
-    case SQLX_CMD_UPDATE:
-    case SQLX_CMD_DELETE:
-      affected_rows = self->row_count;
-      break;
-    default:
-      affected_rows = -1;
-      break;
+      self->forward_only = 0;
+      return NULL;
     }
 
-  return _cubrid_return_PyInt_FromLong (affected_rows);
+  Py_INCREF (Py_None);
+  return Py_None;
 }
 
 static char _cubrid_CursorObject_data_seek__doc__[] = "data_seek(n)\n\
@@ -2675,12 +5685,21 @@ _cubrid_CursorObject_data_seek (_cubrid_CursorObject * self, PyObject * args)
       return NULL;
     }
 
+  if (self->forward_only)
+    {
+      PyErr_SetString (_cubrid_not_supported_error,
+		       "data_seek() is not allowed on a forward only cursor");
+      return NULL;
+    }
+
   if (row < 1 || row > self->row_count)
     {
       return handle_error (CUBRID_ER_INVALID_PARAM, &error);
     }
 
+  CUBRID_BEGIN_CCI_STAT (self->conn);
   res = cci_cursor (self->handle, row, CCI_CURSOR_FIRST, &error);
+  CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_CURSOR);
   if (res < 0 || res == CCI_ER_NO_MORE_DATA)
     {
       return handle_error (res, &error);
@@ -2787,7 +5806,16 @@ _cubrid_CursorObject_row_seek (_cubrid_CursorObject * self, PyObject * args)
       return NULL;
     }
 
+  if (self->forward_only && offset < 0)
+    {
+      PyErr_SetString (_cubrid_not_supported_error,
+		       "cannot move back on a forward only cursor");
+      return NULL;
+    }
+
+  CUBRID_BEGIN_CCI_STAT (self->conn);
   res = cci_cursor (self->handle, offset, CCI_CURSOR_CURRENT, &error);
+  CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_CURSOR);
   if (res < 0)
     {
       return handle_error (res, &error);
@@ -2823,19 +5851,15 @@ _cubrid_CursorObject_next_result (_cubrid_CursorObject * self,
     }
 
   //_cubrid_CursorObject_reset (self);
-  if (self->description)
-    {
-      Py_DECREF (self->description);
-      self->description = NULL;
-    }
-
   self->bind_num = -1;
   self->col_count = -1;
   self->sql_type = 0;
   self->row_count = -1;
   self->cursor_pos = 0;
 
+  CUBRID_BEGIN_CCI (self->conn);
   res = cci_next_result (self->handle, &error);
+  CUBRID_END_CCI (self->conn);
   if (res == CAS_ER_NO_MORE_RESULT_SET)
     {
       goto RETURN_NEXT_RESULT;
@@ -2856,6 +5880,11 @@ _cubrid_CursorObject_next_result (_cubrid_CursorObject * self,
   self->sql_type = res_sql_type;
   self->col_count = col_count;
 
+  if (_cubrid_CursorObject_set_columns (self) < 0)
+    {
+      return NULL;
+    }
+
   switch (res_sql_type)
     {
     case SQLX_CMD_SELECT:
@@ -2872,8 +5901,11 @@ _cubrid_CursorObject_next_result (_cubrid_CursorObject * self,
 
   if (res_sql_type == SQLX_CMD_SELECT)
     {
-      _cubrid_CursorObject_set_description (self);
+      _cubrid_CursorObject_start_fetch (self);
+
+      CUBRID_BEGIN_CCI_STAT (self->conn);
       res = cci_cursor (self->handle, 1, CCI_CURSOR_CURRENT, &error);
+      CUBRID_END_CCI_STAT (self->conn, &self->stats, CUBRID_STAT_CURSOR);
       if (res < 0 && res != CCI_ER_NO_MORE_DATA)
 	{
 	  return handle_error (res, &error);
@@ -2910,6 +5942,10 @@ static void
 _cubrid_CursorObject_dealloc (_cubrid_CursorObject * self)
 {
   _cubrid_CursorObject_reset (self);
+  _cubrid_CursorObject_free_columns (self);
+  Py_CLEAR (self->bind_refs);
+  Py_CLEAR (self->lastrowid);
+  Py_XDECREF (self->conn);
   Py_TYPE (self)->tp_free ((PyObject *) self);
 }
 
@@ -2939,6 +5975,8 @@ _cubrid_LobObject_init (_cubrid_LobObject * self, PyObject * args,
       return -1;
     }
 
+  Py_INCREF (conn);
+  self->conn = conn;
   self->connection = conn->handle;
   self->blob = NULL;
   self->clob = NULL;
@@ -2975,7 +6013,9 @@ _cubrid_LobObject_create (_cubrid_LobObject * self, char type)
 
   if (type == 'B' || type == 'b')
     {
+      CUBRID_BEGIN_CCI (self->conn);
       res = cci_blob_new (self->connection, &self->blob, &error);
+      CUBRID_END_CCI (self->conn);
       if (res < 0)
 	{
 	  return handle_error (res, &error);
@@ -2984,7 +6024,9 @@ _cubrid_LobObject_create (_cubrid_LobObject * self, char type)
     }
   else if (type == 'C' || type == 'c')
     {
+      CUBRID_BEGIN_CCI (self->conn);
       res = cci_clob_new (self->connection, &self->clob, &error);
+      CUBRID_END_CCI (self->conn);
       if (res < 0)
 	{
 	  return handle_error (res, &error);
@@ -3004,9 +6046,15 @@ static int
 _cubrid_LobObject_cci_write (_cubrid_LobObject * self, CUBRID_LONG_LONG pos,
 			     int size, char *buf, T_CCI_ERROR * error)
 {
-  return (self->type == CUBRID_BLOB) ?
+  int res;
+
+  CUBRID_BEGIN_CCI (self->conn);
+  res = (self->type == CUBRID_BLOB) ?
     cci_blob_write (self->connection, self->blob, pos, size, buf, error) :
     cci_clob_write (self->connection, self->clob, pos, size, buf, error);
+  CUBRID_END_CCI (self->conn);
+
+  return res;
 }
 
 static CUBRID_LONG_LONG
@@ -3164,9 +6212,15 @@ static int
 _cubrid_LobObject_cci_read (_cubrid_LobObject * self, CUBRID_LONG_LONG pos,
 			    int size, char *buf, T_CCI_ERROR * error)
 {
-  return (self->type == CUBRID_BLOB) ?
+  int res;
+
+  CUBRID_BEGIN_CCI (self->conn);
+  res = (self->type == CUBRID_BLOB) ?
     cci_blob_read (self->connection, self->blob, pos, size, buf, error) :
     cci_clob_read (self->connection, self->clob, pos, size, buf, error);
+  CUBRID_END_CCI (self->conn);
+
+  return res;
 }
 
 static char _cubrid_LobObject_export__doc__[] = "export(file)\n\
@@ -3381,6 +6435,7 @@ static void
 _cubrid_LobObject_dealloc (_cubrid_LobObject * self)
 {
   _cubrid_LobObject_close (self, NULL);
+  Py_XDECREF (self->conn);
   Py_TYPE (self)->tp_free ((PyObject *) self);
 }
 
@@ -3544,125 +6599,411 @@ _cubrid_SetObject_import (_cubrid_SetObject * self, PyObject * args)
       return Py_None;
     }
 
-  err_code = cci_set_make (&set, type, num, data, (int *) indicator);
-  if (err_code < 0)
+  err_code = cci_set_make (&set, type, num, data, (int *) indicator);
+  if (err_code < 0)
+    {
+      goto handle_error;
+    }
+  self->data = set;
+
+  pBit = (T_CCI_BIT *) data;
+  switch (type)
+    {
+    case CCI_U_TYPE_BIT:
+    case CCI_U_TYPE_VARBIT:
+      for (i = 0; i < num; i++)
+	{
+	  if (indicator[i] == 1)
+	    continue;
+	  if (pBit != NULL && pBit[i].buf != NULL)
+	    {
+	      free (pBit[i].buf);
+	    }
+	}
+    }
+
+  Py_INCREF (Py_None);
+  free (data);
+  free (indicator);
+  free (potinter);
+  return Py_None;
+
+handle_error:
+  free (data);
+  free (indicator);
+  free (potinter);
+  return handle_error (CUBRID_ER_INVALID_PARAM, NULL);
+}
+
+static char _cubrid_SetObject_import__doc__[] = "imports(data,type)\n\
+imports LIST/SET/MULTISET data. To use this function.\n\
+data:tuple object\n\
+type:Element type of set,default type:string.\n\
+\n\
+    Example::\n\
+from CUBRIDdb import FIELD_TYPE\n\
+def one_para():\n\
+    con = CUBRIDdb.connect('CUBRID:localhost:33000:demodb:::', 'public')\n\
+    c = con.cursor()\n\
+    set_val=(('1','23','48'),)\n\
+    etype = FIELD_TYPE.INT\n\
+    c.execute(\"insert into set_tbl_int VALUES(?)\", set_val,etype)\n\
+    con.commit();\n\
+    c.close()\n\
+    con.close() \n\
+def two_para():\n\
+    con = CUBRIDdb.connect('CUBRID:localhost:33000:demodb:::', 'public')\n\
+    c = con.cursor()\n\
+    set_val=(('abc','def'),('1','23','48'))\n\
+    etype = (FIELD_TYPE.CHAR,FIELD_TYPE.INT)\n\
+    c.execute('CREATE TABLE set_tbl_char_int ( col_1 set(CHAR(5)),col_2  set(int));')\n\
+    c.execute('insert into set_tbl_int VALUES(?,?)', set_val,etype)\n\
+    c.close()\n\
+    con.close()";
+
+static PyMethodDef _cubrid_SetObject_methods[] = {
+  {
+   "imports",
+   (PyCFunction) _cubrid_SetObject_import,
+   METH_VARARGS,
+   _cubrid_SetObject_import__doc__},
+  {NULL, NULL}
+};
+
+static char _cubrid_SetObject__doc__[] = "Set class.\n\
+Process Set,MULTISET and LIST/SEQUENCE type\n\
+The class is support by version 9.1.0.0003 and later";
+
+PyTypeObject _cubrid_SetObject_type = {
+#if PY_MAJOR_VERSION >= 3
+  PyVarObject_HEAD_INIT (NULL, 0)
+#else
+  PyObject_HEAD_INIT (NULL) 0,	/* ob_size */
+#endif
+  "_cubrid.set",		/* tp_name */
+  sizeof (_cubrid_SetObject),	/* tp_basicsize */
+  0,				/* tp_itemsize */
+  (destructor) _cubrid_SetObject_dealloc,	/* tp_dealloc */
+  0,				/* tp_print */
+  0,				/* tp_getattr */
+  0,				/* tp_setattr */
+  0,				/* tp_compare */
+  0,				/* tp_repr */
+  0,				/* tp_as_number */
+  0,				/* tp_as_sequence */
+  0,				/* tp_as_mapping */
+  0,				/* tp_hash */
+  0,				/* tp_call */
+  0,				/* tp_str */
+  0,				/* tp_getattro */
+  0,				/* tp_setattro */
+  0,				/* tp_as_buffer */
+  Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,	/* tp_flags */
+  _cubrid_SetObject__doc__,	/* tp_doc */
+  0,				/* tp_traverse */
+  0,				/* tp_clear */
+  0,				/* tp_richcompare */
+  0,				/* tp_weaklistoffset */
+  0,				/* tp_iter */
+  0,				/* tp_iternext */
+  _cubrid_SetObject_methods,	/* tp_methods */
+  0,				/* tp_members */
+  0,				/* tp_getset */
+  0,				/* tp_base */
+  0,				/* tp_dict */
+  0,				/* tp_descr_get */
+  0,				/* tp_descr_set */
+  0,				/* tp_dictoffset */
+  (initproc) _cubrid_SetObject_init,	/* tp_init */
+  0,				/* tp_alloc */
+  (newfunc) _cubrid_SetObject_new,	/* tp_new */
+  0,				/* tp_free */
+};
+
+static void
+_cubrid_RowObject_dealloc (_cubrid_RowObject * self)
+{
+  Py_ssize_t i;
+
+  for (i = 0; i < Py_SIZE (self); i++)
+    {
+      Py_XDECREF (self->items[i]);
+    }
+  Py_XDECREF (self->index);
+
+  PyObject_Del (self);
+}
+
+static Py_ssize_t
+_cubrid_RowObject_length (_cubrid_RowObject * self)
+{
+  return Py_SIZE (self);
+}
+
+static PyObject *
+_cubrid_RowObject_item (_cubrid_RowObject * self, Py_ssize_t i)
+{
+  if (i < 0 || i >= Py_SIZE (self))
+    {
+      PyErr_SetString (PyExc_IndexError, "row index out of range");
+      return NULL;
+    }
+
+  Py_INCREF (self->items[i]);
+  return self->items[i];
+}
+
+static PyObject *
+_cubrid_RowObject_as_tuple (_cubrid_RowObject * self)
+{
+  Py_ssize_t i;
+  PyObject *t;
+
+  if (!(t = PyTuple_New (Py_SIZE (self))))
+    {
+      return NULL;
+    }
+
+  for (i = 0; i < Py_SIZE (self); i++)
+    {
+      Py_INCREF (self->items[i]);
+      PyTuple_SET_ITEM (t, i, self->items[i]);
+    }
+
+  return t;
+}
+
+static PyObject *
+_cubrid_RowObject_subscript (_cubrid_RowObject * self, PyObject * key)
+{
+  Py_ssize_t i;
+  PyObject *pos, *t, *val;
+
+  if (PyIndex_Check (key))
+    {
+      i = PyNumber_AsSsize_t (key, PyExc_IndexError);
+      if (i == -1 && PyErr_Occurred ())
+	{
+	  return NULL;
+	}
+      if (i < 0)
+	{
+	  i += Py_SIZE (self);
+	}
+      return _cubrid_RowObject_item (self, i);
+    }
+
+  if (PySlice_Check (key))
+    {
+      if (!(t = _cubrid_RowObject_as_tuple (self)))
+	{
+	  return NULL;
+	}
+      val = PyObject_GetItem (t, key);
+      Py_DECREF (t);
+      return val;
+    }
+
+  pos = PyDict_GetItem (self->index, key);
+  if (!pos)
+    {
+      PyErr_SetObject (PyExc_KeyError, key);
+      return NULL;
+    }
+
+  return _cubrid_RowObject_item (self, PyNumber_AsSsize_t (pos, NULL));
+}
+
+static PyObject *
+_cubrid_RowObject_getattro (_cubrid_RowObject * self, PyObject * name)
+{
+  PyObject *pos;
+
+  pos = PyDict_GetItem (self->index, name);
+  if (pos)
+    {
+      return _cubrid_RowObject_item (self, PyNumber_AsSsize_t (pos, NULL));
+    }
+
+  return PyObject_GenericGetAttr ((PyObject *) self, name);
+}
+
+static PyObject *
+_cubrid_RowObject_repr (_cubrid_RowObject * self)
+{
+  PyObject *t, *repr;
+
+  if (!(t = _cubrid_RowObject_as_tuple (self)))
+    {
+      return NULL;
+    }
+
+  repr = PyObject_Repr (t);
+  Py_DECREF (t);
+
+  return repr;
+}
+
+static Py_hash_t
+_cubrid_RowObject_hash (_cubrid_RowObject * self)
+{
+  PyObject *t;
+  Py_hash_t hash;
+
+  if (!(t = _cubrid_RowObject_as_tuple (self)))
+    {
+      return -1;
+    }
+
+  hash = PyObject_Hash (t);
+  Py_DECREF (t);
+
+  return hash;
+}
+
+/* Rows compare like tuples, with tuples and with other rows. */
+static PyObject *
+_cubrid_RowObject_richcompare (PyObject * a, PyObject * b, int op)
+{
+  PyObject *ta, *tb, *res;
+
+  if (!(PyTuple_Check (a) || Py_TYPE (a) == &_cubrid_RowObject_type)
+      || !(PyTuple_Check (b) || Py_TYPE (b) == &_cubrid_RowObject_type))
+    {
+      Py_INCREF (Py_NotImplemented);
+      return Py_NotImplemented;
+    }
+
+  if (Py_TYPE (a) == &_cubrid_RowObject_type)
     {
-      goto handle_error;
+      ta = _cubrid_RowObject_as_tuple ((_cubrid_RowObject *) a);
+    }
+  else
+    {
+      Py_INCREF (a);
+      ta = a;
+    }
+  if (!ta)
+    {
+      return NULL;
     }
-  self->data = set;
 
-  pBit = (T_CCI_BIT *) data;
-  switch (type)
+  if (Py_TYPE (b) == &_cubrid_RowObject_type)
     {
-    case CCI_U_TYPE_BIT:
-    case CCI_U_TYPE_VARBIT:
-      for (i = 0; i < num; i++)
-	{
-	  if (indicator[i] == 1)
-	    continue;
-	  if (pBit != NULL && pBit[i].buf != NULL)
-	    {
-	      free (pBit[i].buf);
-	    }
-	}
+      tb = _cubrid_RowObject_as_tuple ((_cubrid_RowObject *) b);
+    }
+  else
+    {
+      Py_INCREF (b);
+      tb = b;
+    }
+  if (!tb)
+    {
+      Py_DECREF (ta);
+      return NULL;
     }
 
-  Py_INCREF (Py_None);
-  free (data);
-  free (indicator);
-  free (potinter);
-  return Py_None;
+  res = PyObject_RichCompare (ta, tb, op);
+  Py_DECREF (ta);
+  Py_DECREF (tb);
 
-handle_error:
-  free (data);
-  free (indicator);
-  free (potinter);
-  return handle_error (CUBRID_ER_INVALID_PARAM, NULL);
+  return res;
 }
 
-static char _cubrid_SetObject_import__doc__[] = "imports(data,type)\n\
-imports LIST/SET/MULTISET data. To use this function.\n\
-data:tuple object\n\
-type:Element type of set,default type:string.\n\
-\n\
-    Example::\n\
-from CUBRIDdb import FIELD_TYPE\n\
-def one_para():\n\
-    con = CUBRIDdb.connect('CUBRID:localhost:33000:demodb:::', 'public')\n\
-    c = con.cursor()\n\
-    set_val=(('1','23','48'),)\n\
-    etype = FIELD_TYPE.INT\n\
-    c.execute(\"insert into set_tbl_int VALUES(?)\", set_val,etype)\n\
-    con.commit();\n\
-    c.close()\n\
-    con.close() \n\
-def two_para():\n\
-    con = CUBRIDdb.connect('CUBRID:localhost:33000:demodb:::', 'public')\n\
-    c = con.cursor()\n\
-    set_val=(('abc','def'),('1','23','48'))\n\
-    etype = (FIELD_TYPE.CHAR,FIELD_TYPE.INT)\n\
-    c.execute('CREATE TABLE set_tbl_char_int ( col_1 set(CHAR(5)),col_2  set(int));')\n\
-    c.execute('insert into set_tbl_int VALUES(?,?)', set_val,etype)\n\
-    c.close()\n\
-    con.close()";
+static PyObject *
+_cubrid_RowObject_iter (_cubrid_RowObject * self)
+{
+  return PySeqIter_New ((PyObject *) self);
+}
 
-static PyMethodDef _cubrid_SetObject_methods[] = {
+static char _cubrid_RowObject_asdict__doc__[] = "_asdict()\n\
+Return a new dict which maps column names to the values of the row.";
+
+static PyObject *
+_cubrid_RowObject_asdict (_cubrid_RowObject * self, PyObject * args)
+{
+  Py_ssize_t ppos = 0;
+  PyObject *d, *key, *pos;
+
+  if (!(d = PyDict_New ()))
+    {
+      return NULL;
+    }
+
+  while (PyDict_Next (self->index, &ppos, &key, &pos))
+    {
+      if (PyDict_SetItem (d, key,
+			  self->items[PyNumber_AsSsize_t (pos, NULL)]) < 0)
+	{
+	  Py_DECREF (d);
+	  return NULL;
+	}
+    }
+
+  return d;
+}
+
+static PyMethodDef _cubrid_RowObject_methods[] = {
   {
-   "imports",
-   (PyCFunction) _cubrid_SetObject_import,
-   METH_VARARGS,
-   _cubrid_SetObject_import__doc__},
+   "_asdict",
+   (PyCFunction) _cubrid_RowObject_asdict,
+   METH_NOARGS,
+   _cubrid_RowObject_asdict__doc__},
   {NULL, NULL}
 };
 
-static char _cubrid_SetObject__doc__[] = "Set class.\n\
-Process Set,MULTISET and LIST/SEQUENCE type\n\
-The class is support by version 9.1.0.0003 and later";
+static PySequenceMethods _cubrid_RowObject_as_sequence = {
+  (lenfunc) _cubrid_RowObject_length,	/* sq_length */
+  0,				/* sq_concat */
+  0,				/* sq_repeat */
+  (ssizeargfunc) _cubrid_RowObject_item,	/* sq_item */
+};
 
-PyTypeObject _cubrid_SetObject_type = {
+static PyMappingMethods _cubrid_RowObject_as_mapping = {
+  (lenfunc) _cubrid_RowObject_length,	/* mp_length */
+  (binaryfunc) _cubrid_RowObject_subscript,	/* mp_subscript */
+  0,				/* mp_ass_subscript */
+};
+
+static char _cubrid_RowObject__doc__[] = "Row class.\n\
+A read-only row of a query result, returned when fetching with how=2.\n\
+Values can be read by position like a tuple, or by column name with\n\
+row['name'] and row.name. All rows of a result set share one column\n\
+name index.";
+
+PyTypeObject _cubrid_RowObject_type = {
 #if PY_MAJOR_VERSION >= 3
   PyVarObject_HEAD_INIT (NULL, 0)
 #else
   PyObject_HEAD_INIT (NULL) 0,	/* ob_size */
 #endif
-  "_cubrid.set",		/* tp_name */
-  sizeof (_cubrid_SetObject),	/* tp_basicsize */
-  0,				/* tp_itemsize */
-  (destructor) _cubrid_SetObject_dealloc,	/* tp_dealloc */
+  "_cubrid.row",		/* tp_name */
+  sizeof (_cubrid_RowObject) - sizeof (PyObject *),	/* tp_basicsize */
+  sizeof (PyObject *),		/* tp_itemsize */
+  (destructor) _cubrid_RowObject_dealloc,	/* tp_dealloc */
   0,				/* tp_print */
   0,				/* tp_getattr */
   0,				/* tp_setattr */
   0,				/* tp_compare */
-  0,				/* tp_repr */
+  (reprfunc) _cubrid_RowObject_repr,	/* tp_repr */
   0,				/* tp_as_number */
-  0,				/* tp_as_sequence */
-  0,				/* tp_as_mapping */
-  0,				/* tp_hash */
+  &_cubrid_RowObject_as_sequence,	/* tp_as_sequence */
+  &_cubrid_RowObject_as_mapping,	/* tp_as_mapping */
+  (hashfunc) _cubrid_RowObject_hash,	/* tp_hash */
   0,				/* tp_call */
   0,				/* tp_str */
-  0,				/* tp_getattro */
+  (getattrofunc) _cubrid_RowObject_getattro,	/* tp_getattro */
   0,				/* tp_setattro */
   0,				/* tp_as_buffer */
-  Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,	/* tp_flags */
-  _cubrid_SetObject__doc__,	/* tp_doc */
+  Py_TPFLAGS_DEFAULT,		/* tp_flags */
+  _cubrid_RowObject__doc__,	/* tp_doc */
   0,				/* tp_traverse */
   0,				/* tp_clear */
-  0,				/* tp_richcompare */
+  (richcmpfunc) _cubrid_RowObject_richcompare,	/* tp_richcompare */
   0,				/* tp_weaklistoffset */
-  0,				/* tp_iter */
+  (getiterfunc) _cubrid_RowObject_iter,	/* tp_iter */
   0,				/* tp_iternext */
-  _cubrid_SetObject_methods,	/* tp_methods */
-  0,				/* tp_members */
-  0,				/* tp_getset */
-  0,				/* tp_base */
-  0,				/* tp_dict */
-  0,				/* tp_descr_get */
-  0,				/* tp_descr_set */
-  0,				/* tp_dictoffset */
-  (initproc) _cubrid_SetObject_init,	/* tp_init */
-  0,				/* tp_alloc */
-  (newfunc) _cubrid_SetObject_new,	/* tp_new */
-  0,				/* tp_free */
+  _cubrid_RowObject_methods,	/* tp_methods */
 };
 
 static PyMethodDef _cubrid_LobObject_methods[] = {
@@ -3765,6 +7106,16 @@ static PyMethodDef _cubrid_CursorObject_methods[] = {
    (PyCFunction) _cubrid_CursorObject__set_charset_name,
    METH_VARARGS,
    _cubrid_CursorObject__set_charset_name__doc__},
+  {
+   "_set_fetch_type",
+   (PyCFunction) _cubrid_CursorObject__set_fetch_type,
+   METH_VARARGS,
+   _cubrid_CursorObject__set_fetch_type__doc__},
+  {
+   "_set_numeric_type",
+   (PyCFunction) _cubrid_CursorObject__set_numeric_type,
+   METH_VARARGS,
+   _cubrid_CursorObject__set_numeric_type__doc__},
   {
    "bind_param",
    (PyCFunction) _cubrid_CursorObject_bind_param,
@@ -3785,6 +7136,11 @@ static PyMethodDef _cubrid_CursorObject_methods[] = {
    (PyCFunction) _cubrid_CursorObject_execute,
    METH_VARARGS,
    _cubrid_CursorObject_execute__doc__},
+  {
+   "execute_array",
+   (PyCFunction) _cubrid_CursorObject_execute_array,
+   METH_VARARGS,
+   _cubrid_CursorObject_execute_array__doc__},
   {
    "affected_rows",
    (PyCFunction) _cubrid_CursorObject_affected_rows,
@@ -3795,11 +7151,51 @@ static PyMethodDef _cubrid_CursorObject_methods[] = {
    (PyCFunction) _cubrid_CursorObject_fetch,
    METH_VARARGS,
    _cubrid_CursorObject_fetch__doc__},
+  {
+   "bind_params",
+   (PyCFunction) _cubrid_CursorObject_bind_params,
+   METH_VARARGS,
+   _cubrid_CursorObject_bind_params__doc__},
+  {
+   "fetch_many",
+   (PyCFunction) _cubrid_CursorObject_fetch_many,
+   METH_VARARGS,
+   _cubrid_CursorObject_fetch_many__doc__},
+  {
+   "fetch_columns",
+   (PyCFunction) _cubrid_CursorObject_fetch_columns,
+   METH_VARARGS,
+   _cubrid_CursorObject_fetch_columns__doc__},
   {
    "fetch_lob",
    (PyCFunction) _cubrid_CursorObject_fetch_lob,
    METH_VARARGS,
    _cubrid_CursorObject_fetch_lob__doc__},
+  {
+   "set_fetch_size",
+   (PyCFunction) _cubrid_CursorObject_set_fetch_size,
+   METH_VARARGS,
+   _cubrid_CursorObject_set_fetch_size__doc__},
+  {
+   "set_fetch_target",
+   (PyCFunction) _cubrid_CursorObject_set_fetch_target,
+   METH_VARARGS,
+   _cubrid_CursorObject_set_fetch_target__doc__},
+  {
+   "fetch_stats",
+   (PyCFunction) _cubrid_CursorObject_fetch_stats,
+   METH_VARARGS,
+   _cubrid_CursorObject_fetch_stats__doc__},
+  {
+   "stats",
+   (PyCFunction) _cubrid_CursorObject_stats,
+   METH_VARARGS,
+   _cubrid_CursorObject_stats__doc__},
+  {
+   "set_forward_only",
+   (PyCFunction) _cubrid_CursorObject_set_forward_only,
+   METH_VARARGS,
+   _cubrid_CursorObject_set_forward_only__doc__},
   {
    "data_seek",
    (PyCFunction) _cubrid_CursorObject_data_seek,
@@ -3844,6 +7240,11 @@ static PyMethodDef _cubrid_ConnectionObject_methods[] = {
    (PyCFunction) _cubrid_ConnectionObject_close,
    METH_VARARGS,
    _cubrid_ConnectionObject_close__doc__},
+  {
+   "_detach",
+   (PyCFunction) _cubrid_ConnectionObject__detach,
+   METH_VARARGS,
+   _cubrid_ConnectionObject__detach__doc__},
   {
    "cursor",
    (PyCFunction) _cubrid_ConnectionObject_cursor,
@@ -3874,6 +7275,31 @@ static PyMethodDef _cubrid_ConnectionObject_methods[] = {
    (PyCFunction) _cubrid_ConnectionObject_ping,
    METH_VARARGS,
    _cubrid_ConnectionObject_ping__doc__},
+  {
+   "set_stmt_cache_size",
+   (PyCFunction) _cubrid_ConnectionObject_set_stmt_cache_size,
+   METH_VARARGS,
+   _cubrid_ConnectionObject_set_stmt_cache_size__doc__},
+  {
+   "stmt_cache_info",
+   (PyCFunction) _cubrid_ConnectionObject_stmt_cache_info,
+   METH_VARARGS,
+   _cubrid_ConnectionObject_stmt_cache_info__doc__},
+  {
+   "set_stats_enabled",
+   (PyCFunction) _cubrid_ConnectionObject_set_stats_enabled,
+   METH_VARARGS,
+   _cubrid_ConnectionObject_set_stats_enabled__doc__},
+  {
+   "stats",
+   (PyCFunction) _cubrid_ConnectionObject_stats,
+   METH_VARARGS,
+   _cubrid_ConnectionObject_stats__doc__},
+  {
+   "reset_stats",
+   (PyCFunction) _cubrid_ConnectionObject_reset_stats,
+   METH_VARARGS,
+   _cubrid_ConnectionObject_reset_stats__doc__},
   {
    "server_version",
    (PyCFunction) _cubrid_ConnectionObject_server_version,
@@ -3894,6 +7320,11 @@ static PyMethodDef _cubrid_ConnectionObject_methods[] = {
    (PyCFunction) _cubrid_ConnectionObject_set_isolation_level,
    METH_VARARGS,
    _cubrid_ConnectionObject_set_isolation_level__doc__},
+  {
+   "set_lock_timeout",
+   (PyCFunction) _cubrid_ConnectionObject_set_lock_timeout,
+   METH_VARARGS,
+   _cubrid_ConnectionObject_set_lock_timeout__doc__},
   {
    "insert_id",
    (PyCFunction) _cubrid_ConnectionObject_last_insert_id,
@@ -3929,24 +7360,28 @@ static struct PyMemberDef _cubrid_ConnectionObject_members[] = {
    offsetof (_cubrid_ConnectionObject, autocommit),
    0,
    "autocommit status"},
+  {NULL}
+};
+
+static PyGetSetDef _cubrid_ConnectionObject_getset[] = {
   {
    "isolation_level",
-   T_OBJECT,
-   offsetof (_cubrid_ConnectionObject, isolation_level),
-   0,
-   "isolation level"},
+   (getter) _cubrid_ConnectionObject_get_isolation_level,
+   NULL,
+   "isolation level, read from the server when first used",
+   NULL},
   {
    "max_string_len",
-   T_OBJECT,
-   offsetof (_cubrid_ConnectionObject, max_string_len),
-   0,
-   "max string length"},
+   (getter) _cubrid_ConnectionObject_get_max_string_len,
+   NULL,
+   "max string length, read from the server when first used",
+   NULL},
   {
    "lock_timeout",
-   T_OBJECT,
-   offsetof (_cubrid_ConnectionObject, lock_timeout),
-   0,
-   "lock time out"},
+   (getter) _cubrid_ConnectionObject_get_lock_timeout,
+   NULL,
+   "lock time out, read from the server when first used",
+   NULL},
   {NULL}
 };
 
@@ -3977,21 +7412,88 @@ _cubrid_CursorObject_repr (_cubrid_CursorObject * self)
 }
 
 static struct PyMemberDef _cubrid_CursorObject_members[] = {
-  {
-   "description",
-   T_OBJECT,
-   offsetof (_cubrid_CursorObject, description),
-   0,
-   "description"},
   {
    "rowcount",
    T_INT,
    offsetof (_cubrid_CursorObject, row_count),
    0,
    "row count"},
+  {
+   "sql_type",
+   T_INT,
+   offsetof (_cubrid_CursorObject, sql_type),
+   READONLY,
+   "type of the last executed statement, one of the CUBRID_STMT_*\n\
+constants for SELECT, INSERT, UPDATE, DELETE and CALL"},
   {NULL}
 };
 
+static PyGetSetDef _cubrid_CursorObject_getset[] = {
+  {
+   "description",
+   (getter) _cubrid_CursorObject_get_description,
+   NULL,
+   "description of the columns of the current result set, built when\n\
+first read",
+   NULL},
+  {
+   "lastrowid",
+   (getter) _cubrid_CursorObject_get_lastrowid,
+   NULL,
+   "AUTO_INCREMENT value generated by the last INSERT of the cursor, or\n\
+None. It is read from the server when first accessed, and is None once\n\
+another statement was executed on the connection.",
+   NULL},
+  {NULL}
+};
+
+static char _cubrid_register_adapter__doc__[] =
+  "register_adapter(type, adapter)\n\
+Register a function converting values of the given type before they are\n\
+bound by cursor.bind_params(). The adapter is looked up by the exact type\n\
+of the value and must return a value that bind_params() can bind: None,\n\
+bool, int, float, Decimal, str, bytes, date, time, datetime, lob or set.\n\
+Passing None as adapter removes the registration.\n\
+\n\
+Example::\n\
+  import uuid, _cubrid\n\
+  _cubrid.register_adapter(uuid.UUID, str)";
+
+static PyObject *
+_cubrid_register_adapter (PyObject * self, PyObject * args)
+{
+  PyObject *type, *adapter;
+
+  if (!PyArg_ParseTuple (args, "O!O", &PyType_Type, &type, &adapter))
+    {
+      return NULL;
+    }
+
+  if (adapter == Py_None)
+    {
+      if (PyDict_GetItem (_cubrid_adapters, type)
+	  && PyDict_DelItem (_cubrid_adapters, type) < 0)
+	{
+	  return NULL;
+	}
+    }
+  else
+    {
+      if (!PyCallable_Check (adapter))
+	{
+	  PyErr_SetString (PyExc_TypeError, "adapter must be callable");
+	  return NULL;
+	}
+      if (PyDict_SetItem (_cubrid_adapters, type, adapter) < 0)
+	{
+	  return NULL;
+	}
+    }
+
+  Py_INCREF (Py_None);
+  return Py_None;
+}
+
 static struct PyMethodDef _cubrid_methods[] = {
   {
    "connect",
@@ -4003,6 +7505,11 @@ static struct PyMethodDef _cubrid_methods[] = {
    (PyCFunction) _cubrid_escape_string,
    METH_VARARGS | METH_KEYWORDS,
    _cubrid_escape_string__doc__},
+  {
+   "register_adapter",
+   (PyCFunction) _cubrid_register_adapter,
+   METH_VARARGS,
+   _cubrid_register_adapter__doc__},
   {NULL, NULL}
 };
 
@@ -4040,7 +7547,7 @@ PyTypeObject _cubrid_ConnectionObject_type = {
   0,				/* tp_iternext */
   _cubrid_ConnectionObject_methods,	/* tp_methods */
   _cubrid_ConnectionObject_members,	/* tp_members */
-  0,				/* tp_getset */
+  _cubrid_ConnectionObject_getset,	/* tp_getset */
   0,				/* tp_base */
   0,				/* tp_dict */
   0,				/* tp_descr_get */
@@ -4082,11 +7589,11 @@ PyTypeObject _cubrid_CursorObject_type = {
   0,				/* tp_clear */
   0,				/* tp_richcompare */
   0,				/* tp_weaklistoffset */
-  0,				/* tp_iter */
-  0,				/* tp_iternext */
+  PyObject_SelfIter,		/* tp_iter */
+  (iternextfunc) _cubrid_CursorObject_iternext,	/* tp_iternext */
   _cubrid_CursorObject_methods,	/* tp_methods */
   _cubrid_CursorObject_members,	/* tp_members */
-  0,				/* tp_getset */
+  _cubrid_CursorObject_getset,	/* tp_getset */
   0,				/* tp_base */
   0,				/* tp_dict */
   0,				/* tp_descr_get */
@@ -4279,6 +7786,33 @@ all_ins (PyObject * d)
   if (ins (d, "CUBRID_SCH_CROSS_REFERENCE", (long) CCI_SCH_CROSS_REFERENCE))
     return -1;
 
+  if (ins (d, "CUBRID_NUMERIC_AS_DECIMAL", (long) CUBRID_NUMERIC_AS_DECIMAL))
+    return -1;
+
+  if (ins (d, "CUBRID_NUMERIC_AS_INT", (long) CUBRID_NUMERIC_AS_INT))
+    return -1;
+
+  if (ins (d, "CUBRID_NUMERIC_AS_FLOAT", (long) CUBRID_NUMERIC_AS_FLOAT))
+    return -1;
+
+  if (ins (d, "CUBRID_NUMERIC_AS_STR", (long) CUBRID_NUMERIC_AS_STR))
+    return -1;
+
+  if (ins (d, "CUBRID_STMT_SELECT", (long) SQLX_CMD_SELECT))
+    return -1;
+
+  if (ins (d, "CUBRID_STMT_INSERT", (long) SQLX_CMD_INSERT))
+    return -1;
+
+  if (ins (d, "CUBRID_STMT_UPDATE", (long) SQLX_CMD_UPDATE))
+    return -1;
+
+  if (ins (d, "CUBRID_STMT_DELETE", (long) SQLX_CMD_DELETE))
+    return -1;
+
+  if (ins (d, "CUBRID_STMT_CALL", (long) SQLX_CMD_CALL))
+    return -1;
+
   if (ins (d, "SEEK_CUR", (long) SEEK_CUR))
     return -1;
 
@@ -4299,7 +7833,7 @@ void
 init_cubrid (void)
 #endif
 {
-  PyObject *dict, *module, *mDecimal;
+  PyObject *dict, *module, *mDecimal, *mArray;
 
 #if PY_MAJOR_VERSION >= 3
   module = PyModule_Create (&cubriddef);
@@ -4356,6 +7890,18 @@ init_cubrid (void)
       goto Error;
     }
 
+  if (PyType_Ready (&_cubrid_RowObject_type) < 0)
+    {
+      goto Error;
+    }
+
+  Py_INCREF (&_cubrid_RowObject_type);
+  if (PyModule_AddObject
+      (module, "row", (PyObject *) & _cubrid_RowObject_type) < 0)
+    {
+      goto Error;
+    }
+
   if (PyType_Ready (&_cubrid_SetObject_type) < 0)
     {
       goto Error;
@@ -4384,6 +7930,26 @@ init_cubrid (void)
   Py_INCREF (_func_Decimal);
   Py_DECREF (mDecimal);
 
+  _cubrid_adapters = PyDict_New ();
+  if (!_cubrid_adapters)
+    {
+      goto Error;
+    }
+
+  /* array.array holds the numeric columns returned by fetch_columns() */
+  mArray = PyImport_ImportModule ("array");
+  if (!mArray)
+    {
+      goto Error;
+    }
+
+  _cubrid_array_type = PyObject_GetAttrString (mArray, "array");
+  Py_DECREF (mArray);
+  if (!_cubrid_array_type)
+    {
+      goto Error;
+    }
+
   /* invoke PyDateTime_IMPORT macro to use functions from datetime.h */
   PyDateTime_IMPORT;
 
@@ -1,5 +1,6 @@
 #include "Python.h"
 #include "structmember.h"
+#include "pythread.h"
 #include "datetime.h"
 #include "cas_cci.h"
 
@@ -7,6 +8,8 @@
 #define PyString_FromString PyBytes_FromString
 #define PyString_AsString PyBytes_AsString
 #define PyString_Check PyBytes_Check
+#else
+typedef long Py_hash_t;
 #endif
 
 #define CUBRID_ER_NO_MORE_MEMORY	    -30001
@@ -35,6 +38,42 @@
 #define CUBRID_EXEC_ONLY_QUERY_PLAN CCI_EXEC_ONLY_QUERY_PLAN
 #define CUBRID_EXEC_THREAD          CCI_EXEC_THREAD
 
+/* Blocking CCI calls run with the GIL released. The connection lock keeps
+ * threads sharing a connection from using its CCI handle at the same time;
+ * no Python API may be used between the two macros.
+ */
+#define CUBRID_BEGIN_CCI(conn) \
+  Py_BEGIN_ALLOW_THREADS \
+  PyThread_acquire_lock ((conn)->lock, WAIT_LOCK)
+
+#define CUBRID_END_CCI(conn) \
+  PyThread_release_lock ((conn)->lock); \
+  Py_END_ALLOW_THREADS
+
+/* the same, for the calls counted in the driver statistics when they
+ * are enabled on the connection; stats is the cursor's or NULL */
+#define CUBRID_BEGIN_CCI_STAT(conn) \
+  { \
+    double _stat_start = (conn)->stats_enabled ? _cubrid_monotonic () : 0; \
+    CUBRID_BEGIN_CCI (conn)
+
+#define CUBRID_END_CCI_STAT(conn, stats, phase) \
+    CUBRID_END_CCI (conn); \
+    if ((conn)->stats_enabled) \
+      _cubrid_stats_call ((conn), (stats), (phase), _stat_start); \
+  }
+
+#define CUBRID_NUMERIC_AS_DECIMAL   0
+#define CUBRID_NUMERIC_AS_INT       1
+#define CUBRID_NUMERIC_AS_FLOAT     2
+#define CUBRID_NUMERIC_AS_STR       3
+
+/* adaptive fetch size: rows of the first batch, default bytes per batch
+ * and the widest a column is assumed to be before rows are read */
+#define CUBRID_FETCH_SIZE_INITIAL   100
+#define CUBRID_FETCH_TARGET_DEFAULT (256 * 1024)
+#define CUBRID_FETCH_WIDTH_MAX      256
+
 #define SHRT_MIN_STR     "-32768"       /* minimum (signed) short value */
 #define SHRT_MAX_STR       "32767"         /* maximum (signed) short value */
 #define INT_MIN_STR     "-2147483648"/* minimum (signed) int value */
@@ -59,6 +98,34 @@ typedef enum
   CURSOR_STATE_OPENED
 } CURSOR_STATE;
 
+typedef enum
+{
+  CUBRID_STAT_PREPARE,
+  CUBRID_STAT_EXECUTE,
+  CUBRID_STAT_FETCH,
+  CUBRID_STAT_CURSOR,
+  CUBRID_STAT_END_TRAN,
+  CUBRID_STAT_PHASES
+} CUBRID_STAT_PHASE;
+
+typedef struct
+{
+  long calls[CUBRID_STAT_PHASES];
+  double wait[CUBRID_STAT_PHASES];	/* seconds with the GIL released */
+  long rows;
+  long bytes;
+  double decode;			/* seconds spent decoding rows */
+} _cubrid_stats;
+
+typedef struct
+{
+  char *sql;
+  unsigned long hash;
+  int handle;
+  int in_use;
+  unsigned long last_used;
+} _cubrid_stmt_cache_entry;
+
 typedef struct
 {
   PyObject_HEAD
@@ -70,21 +137,84 @@ typedef struct
   PyObject *isolation_level;
   PyObject *max_string_len;
   PyObject *lock_timeout;
+  int pending_isolation;
+  int server_isolation;
+  int pending_lock_timeout;
+  int has_pending_lock_timeout;
+  int server_lock_timeout;
+  int has_server_lock_timeout;
+  PyThread_type_lock lock;
+  _cubrid_stmt_cache_entry *stmt_cache;
+  int stmt_cache_size;
+  int stmt_cache_count;
+  unsigned long stmt_cache_clock;
+  long stmt_cache_hits;
+  long stmt_cache_misses;
+  int stats_enabled;
+  _cubrid_stats stats;
+  unsigned long executed;	/* statements executed, see lastrowid */
 } _cubrid_ConnectionObject;
 
+struct _cubrid_CursorObject;
+struct _cubrid_column;
+
+typedef PyObject *(*_cubrid_decoder) (struct _cubrid_CursorObject * self,
+				      struct _cubrid_column * col);
+
+typedef struct _cubrid_column
+{
+  int index;
+  int type;
+  int precision;
+  int scale;
+  int nullable;
+  char *name;
+  PyObject *key;
+  _cubrid_decoder decode;
+} _cubrid_column;
+
 typedef struct
+{
+  char typecode;
+  int temporal;
+  int itemsize;
+  char *data;
+  char *nulls;
+  PyObject *list;
+} _cubrid_column_buffer;
+
+typedef struct _cubrid_CursorObject
 {
   PyObject_HEAD
   CURSOR_STATE state;
   int handle;
   int connection;  
+  _cubrid_ConnectionObject *conn;
   int col_count;
   int row_count;
   int bind_num;
+  char *bound;			/* parameters bound since prepare() */
   int cursor_pos;
+  int fetch_type;
+  int fetch_size;
+  int fetch_target;
+  int fetch_batch;
+  int fetch_batch_left;
+  int row_width;
+  long rows_fetched;
+  long round_trips;
+  int forward_only;
+  PyObject *lastrowid;
+  unsigned long lastrowid_stmt;
+  int numeric_type;
   char charset[128];
   T_CCI_CUBRID_STMT sql_type;
   T_CCI_COL_INFO *col_info;
+  _cubrid_column *columns;
+  int n_columns;
+  PyObject *row_index;
+  PyObject *bind_refs;
+  _cubrid_stats stats;
   PyObject *description;  
 } _cubrid_CursorObject;
 
@@ -92,6 +222,7 @@ typedef struct
 {
   PyObject_HEAD
   int connection;
+  _cubrid_ConnectionObject *conn;
   T_CCI_BLOB blob;
   T_CCI_CLOB clob;
   char type;
@@ -108,10 +239,18 @@ typedef struct
 } _cubrid_SetObject;
 
 
+typedef struct
+{
+  PyObject_VAR_HEAD
+  PyObject *index;
+  PyObject *items[1];
+} _cubrid_RowObject;
+
 extern PyTypeObject _cubrid_ConnectionObject_type;
 extern PyTypeObject _cubrid_CursorObject_type;
 extern PyTypeObject _cubrid_LobObject_type;
 extern PyTypeObject _cubrid_SetObject_type;
+extern PyTypeObject _cubrid_RowObject_type;
 
 extern int ut_str_to_bigint (char *str, CUBRID_LONG_LONG * value);
 extern int ut_str_to_int (char *str, int *value);
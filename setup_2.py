@@ -122,13 +122,15 @@ else:
 if sys.version_info[0] == 2 and sys.version_info[1] >= 5:
     py_modules = [
         "CUBRIDdb.connections", "CUBRIDdb.cursors", "CUBRIDdb.FIELD_TYPE",
+        "CUBRIDdb.pool", "CUBRIDdb.failover", "CUBRIDdb.routing",
         "django_cubrid.base", "django_cubrid.client", "django_cubrid.compiler",
         "django_cubrid.creation", "django_cubrid.introspection",
         "django_cubrid.validation",
         ]
 else:
-    py_modules = ["CUBRIDdb.connections",
-                  "CUBRIDdb.cursors", "CUBRIDdb.FIELD_TYPE"]
+    py_modules = ["CUBRIDdb.connections", "CUBRIDdb.cursors",
+                  "CUBRIDdb.FIELD_TYPE", "CUBRIDdb.pool", "CUBRIDdb.failover",
+                  "CUBRIDdb.routing"]
 
 # Install CUBRID-Python driver.
 setup(
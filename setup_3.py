@@ -119,7 +119,11 @@ else:
 
 
 # set py_modules
-py_modules = ["CUBRIDdb.connections", "CUBRIDdb.cursors", "CUBRIDdb.FIELD_TYPE"]
+py_modules = ["CUBRIDdb.connections", "CUBRIDdb.cursors", "CUBRIDdb.FIELD_TYPE",
+              "CUBRIDdb.pool", "CUBRIDdb.failover",
+              "CUBRIDdb.routing"]
+if sys.version_info >= (3, 5):
+    py_modules.append("CUBRIDdb.aio")
 if sys.version_info.major >= 3:
     py_modules += [
         "django_cubrid.base", "django_cubrid.client", "django_cubrid.compiler",
@@ -2,10 +2,17 @@
 
 import unittest
 import CUBRIDdb
+import CUBRIDdb.pool
+import CUBRIDdb.failover
+import CUBRIDdb.routing
 import time
 import sys
 import decimal
 import datetime
+import array
+import threading
+import tempfile
+import os
 from xml.dom import minidom
 
 class DBAPI20Test(unittest.TestCase):
@@ -394,6 +401,670 @@ class DBAPI20Test(unittest.TestCase):
             con.close()
 
 
+    def test_datatype_numbers(self):
+        con = self._connect()
+
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %snumbers' % self.table_prefix)
+            cur.execute('create table %snumbers (col1 bigint, col2 double, \
+                    col3 monetary, col4 bigint)' % self.table_prefix)
+            cur.execute("insert into %snumbers values (9223372036854775807, \
+                    0.1, 12.5, null)" % self.table_prefix)
+
+            cur.execute('select * from %snumbers' % self.table_prefix)
+            row = cur.fetchone()
+
+            self.assertEqual(row[0], 9223372036854775807)
+            self.assertTrue(isinstance(row[0], int if sys.version_info >= (3, 0) else long))
+            self.assertEqual(row[1], 0.1)
+            self.assertEqual(row[2], 12.5)
+            self.assertEqual(row[3], None)
+            cur.execute('drop table %snumbers' % self.table_prefix)
+        finally:
+            con.close()
+
+    def test_datatype_binary(self):
+        con = self._connect()
+
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %sbinary' % self.table_prefix)
+            cur.execute('create table %sbinary (col1 bit varying(1048576))'
+                    % self.table_prefix)
+            value = bytes(bytearray(range(256))) * 256
+            cur.execute('insert into %sbinary values (?)' % self.table_prefix,
+                    (value,))
+            cur.execute('insert into %sbinary values (?)' % self.table_prefix,
+                    (None,))
+
+            cur.execute('select col1 from %sbinary' % self.table_prefix)
+            rows = cur.fetchall()
+            self.assertEqual(rows[0][0], value)
+            self.assertEqual(rows[1][0], None)
+            cur.execute('drop table %sbinary' % self.table_prefix)
+        finally:
+            con.close()
+
+    def test_typed_binding(self):
+        con = self._connect()
+
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %styped' % self.table_prefix)
+            cur.execute('create table %styped (col1 int, col2 bigint, \
+                    col3 double, col4 numeric(20,4), col5 date, \
+                    col6 datetime, col7 varchar(40))' % self.table_prefix)
+            values = (42, 2 ** 40, 0.25, decimal.Decimal('123.4567'),
+                    datetime.date(2020, 2, 29),
+                    datetime.datetime(2020, 2, 29, 12, 30, 15, 250000), None)
+            cur.execute('insert into %styped values (?,?,?,?,?,?,?)'
+                    % self.table_prefix, values)
+            cur.execute('insert into %styped (col1) values (?)'
+                    % self.table_prefix, (True,))
+
+            cur.execute('select * from %styped order by col1'
+                    % self.table_prefix)
+            rows = cur.fetchall()
+            self.assertEqual(rows[0][0], 1)
+            self.assertEqual(tuple(rows[1]), values)
+
+            class Point(object):
+                def __init__(self, x, y):
+                    self.x, self.y = x, y
+
+            self.driver.register_adapter(Point,
+                    lambda p: '(%d,%d)' % (p.x, p.y))
+            try:
+                cur.execute('insert into %styped (col1, col7) values (?,?)'
+                        % self.table_prefix, (3, Point(1, 2)))
+            finally:
+                self.driver.register_adapter(Point, None)
+            cur.execute('select col7 from %styped where col1 = 3'
+                    % self.table_prefix)
+            self.assertEqual(cur.fetchone()[0], '(1,2)')
+            cur.execute('drop table %styped' % self.table_prefix)
+        finally:
+            con.close()
+
+    def test_stmt_cache(self):
+        con = self._connect()
+
+        try:
+            con.set_stmt_cache_size(2)
+            con.warmup_stmt_cache(['select 1 from db_root'])
+            info = con.stmt_cache_info()
+            self.assertEqual(info['count'], 1)
+            self.assertEqual(info['misses'], 1)
+
+            cur = con.cursor()
+            for i in range(3):
+                cur.execute('select 1 from db_root')
+                self.assertEqual(cur.fetchone()[0], 1)
+            cur.execute('select 2 from db_root')
+            cur.execute('select 3 from db_root')
+            cur.close()
+
+            info = con.stmt_cache_info()
+            self.assertEqual(info['hits'], 3)
+            self.assertEqual(info['misses'], 3)
+            self.assertEqual(info['count'], 2)
+
+            # a cached handle does not keep the values of its last use
+            cur = con.cursor()
+            cur.execute('select ? from db_root', (5,))
+            self.assertEqual(cur.fetchone()[0], 5)
+            self.assertRaises(CUBRIDdb.InterfaceError, cur.execute,
+                    'select ? from db_root')
+            self.assertEqual(con.stmt_cache_info()['hits'], 4)
+            cur.close()
+
+            con.set_stmt_cache_size(0)
+            self.assertEqual(con.stmt_cache_info()['count'], 0)
+        finally:
+            con.close()
+
+    def test_executemany_array(self):
+        con = self._connect()
+
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %smany' % self.table_prefix)
+            cur.execute('create table %smany (col1 int primary key, \
+                    col2 varchar(10), col3 double)' % self.table_prefix)
+            cur.executemany_chunksize = 3
+            rows = [(i, 'row%d' % i, i / 2.0) for i in range(10)]
+            rows.append((0, 'dup', None))
+            con.set_stats_enabled(True)
+            r = cur.executemany('insert into %smany values (?,?,?)'
+                    % self.table_prefix, rows)
+            # prepared once, one request per chunk
+            self.assertEqual(con.stats()['prepare']['calls'], 1)
+            self.assertEqual(con.stats()['execute']['calls'], 4)
+            con.set_stats_enabled(False)
+            self.assertEqual(r, 10)
+            self.assertEqual(cur.rowcount, 10)
+            self.assertEqual(len(cur.rowstatus), 11)
+            self.assertEqual(cur.rowstatus[0]['result'], 1)
+            self.assertTrue(cur.rowstatus[10]['err_no'] < 0)
+
+            cur.execute('select col1, col2, col3 from %smany order by 1'
+                    % self.table_prefix)
+            self.assertEqual([tuple(row) for row in cur.fetchall()], rows[:10])
+            cur.execute('drop table %smany' % self.table_prefix)
+        finally:
+            con.close()
+
+    def test_executemany_row_by_row(self):
+        con = self._connect()
+
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %smany' % self.table_prefix)
+            cur.execute('create table %smany (col1 int primary key)'
+                    % self.table_prefix)
+            # no parameters: the rows are executed one by one
+            r = cur.executemany('insert into %smany values (1)'
+                    % self.table_prefix, [(), (), ()])
+            self.assertEqual(r, 1)
+            self.assertEqual(len(cur.rowstatus), 3)
+            self.assertEqual(cur.rowstatus[0]['err_no'], 0)
+            self.assertTrue(cur.rowstatus[1]['err_no'] < 0)
+            self.assertTrue(cur.rowstatus[2]['err_no'] < 0)
+            cur.execute('drop table %smany' % self.table_prefix)
+        finally:
+            con.close()
+
+    def test_copy_from(self):
+        con = self._connect()
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        os.write(fd, b'id,name\n1,a\n2,\n2,dup\n3\n')
+        os.close(fd)
+
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %scopy' % self.table_prefix)
+            cur.execute('create table %scopy (id int primary key, \
+                    name varchar(10))' % self.table_prefix)
+            calls = []
+            loaded, rejected = cur.copy_from('%scopy' % self.table_prefix,
+                    path, header=True, chunk_rows=2,
+                    progress=lambda l, r: calls.append((l, r)))
+            self.assertEqual(loaded, 2)
+            self.assertEqual(sorted(r[0] for r in rejected), [4, 5])
+            self.assertEqual(calls, [(2, 0), (2, 2)])
+
+            loaded, rejected = cur.copy_from('%scopy' % self.table_prefix,
+                    [(10, 'x'), (11, 'y')], columns=('id', 'name'))
+            self.assertEqual((loaded, rejected), (2, []))
+
+            cur.execute('select * from %scopy order by id' % self.table_prefix)
+            self.assertEqual([tuple(r) for r in cur.fetchall()],
+                    [(1, 'a'), (2, None), (10, 'x'), (11, 'y')])
+
+            # with autocommit off the load is part of the caller's transaction
+            con.set_autocommit(False)
+            cur.execute("insert into %scopy values (20, 'z')" % self.table_prefix)
+            cur.copy_from('%scopy' % self.table_prefix, [(21, 'w')])
+            con.rollback()
+            cur.execute('select count(*) from %scopy' % self.table_prefix)
+            self.assertEqual(cur.fetchone()[0], 4)
+            con.set_autocommit(True)
+            cur.execute('drop table %scopy' % self.table_prefix)
+        finally:
+            os.remove(path)
+            con.close()
+
+    def test_sscursor(self):
+        con = self._connect()
+
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %sstream' % self.table_prefix)
+            cur.execute('create table %sstream (col1 int)' % self.table_prefix)
+            cur.executemany('insert into %sstream values (?)'
+                    % self.table_prefix, [(i,) for i in range(50)])
+            cur.close()
+
+            cur = con.cursor(cursorclass=CUBRIDdb.cursors.SSCursor)
+            self.assertEqual(cur.fetchsize, 100)
+            cur.fetchsize = 7
+            cur.execute('select col1 from %sstream order by 1'
+                    % self.table_prefix)
+            self.assertEqual([row[0] for row in cur], list(range(50)))
+            self.assertRaises(CUBRIDdb.NotSupportedError,
+                    cur._cs.data_seek, 1)
+            cur.execute('drop table %sstream' % self.table_prefix)
+            cur.close()
+        finally:
+            con.close()
+
+    def test_fetch_stats(self):
+        con = self._connect()
+
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %sstats' % self.table_prefix)
+            cur.execute('create table %sstats (col1 int)' % self.table_prefix)
+            cur.executemany('insert into %sstats values (?)'
+                    % self.table_prefix, [(i,) for i in range(1000)])
+
+            cur.execute('select col1 from %sstats' % self.table_prefix)
+            self.assertEqual(len(cur.fetchall()), 1000)
+            stats = cur.fetch_stats()
+            self.assertEqual(stats['rows'], 1000)
+            # batches of 100, 200, 400 and then 800 rows
+            self.assertEqual(stats['round_trips'], 4)
+            self.assertEqual(stats['fetch_size'], 800)
+
+            cur.fetchsize = 100
+            cur.execute('select col1 from %sstats' % self.table_prefix)
+            cur.fetchall()
+            self.assertEqual(cur.fetch_stats()['round_trips'], 11)
+            cur.execute('drop table %sstats' % self.table_prefix)
+        finally:
+            con.close()
+
+    def test_pool(self):
+        pool = CUBRIDdb.pool.ConnectionPool(*self.connect_args, maxsize=1)
+
+        try:
+            con = pool.acquire()
+            self.assertTrue(con.ping())
+            isolation_level = con.connection.isolation_level
+            lock_timeout = con.lock_timeout
+            con.set_autocommit(False)
+            con.connection.set_isolation_level(CUBRIDdb.CUBRID_SERIALIZABLE)
+            con.set_lock_timeout(1234)
+            self.assertRaises(CUBRIDdb.OperationalError, pool.acquire, 0.1)
+            con.close()
+            self.assertRaises(CUBRIDdb.InterfaceError, con.cursor)
+
+            with pool.connection() as con:
+                self.assertEqual(con.autocommit, True)
+                self.assertEqual(con.connection.isolation_level, isolation_level)
+                self.assertEqual(con.lock_timeout, lock_timeout)
+                cur = con.cursor()
+                cur.execute('select 1 from db_root')
+                self.assertEqual(cur.fetchone()[0], 1)
+                cur.close()
+
+            stats = pool.stats()
+            self.assertEqual(stats['created'], 1)
+            self.assertEqual(stats['acquired'], 2)
+            self.assertEqual(stats['timeouts'], 1)
+            self.assertEqual(stats['idle'], 1)
+        finally:
+            pool.close()
+
+    def test_aio(self):
+        if sys.version_info < (3, 5):
+            return
+        import asyncio
+        import CUBRIDdb.aio
+        run = asyncio.get_event_loop().run_until_complete
+
+        # a failed prefetch is raised once, not by every later fetch
+        cur = CUBRIDdb.aio.AsyncCursor(None, None)
+        cur._prefetch = asyncio.Future()
+        cur._prefetch.set_exception(CUBRIDdb.InterfaceError('lost'))
+        self.assertRaises(CUBRIDdb.InterfaceError, run, cur._fill())
+        self.assertEqual(cur._prefetch, None)
+        run(cur._fill())
+
+        con = run(CUBRIDdb.aio.connect(*self.connect_args))
+        try:
+            cur = con.cursor()
+            run(cur.execute('drop table if exists %saio' % self.table_prefix))
+            run(cur.execute('create table %saio (col1 int)' % self.table_prefix))
+            run(cur.executemany('insert into %saio values (?)'
+                    % self.table_prefix, [(i,) for i in range(250)]))
+
+            run(cur.execute('select col1 from %saio order by 1'
+                    % self.table_prefix))
+            cur.prefetch = 100
+            rows = []
+            while True:
+                try:
+                    rows.append(run(cur.__anext__())[0])
+                except StopAsyncIteration:
+                    break
+            self.assertEqual(rows, list(range(250)))
+
+            run(cur.execute('select col1 from %saio order by 1'
+                    % self.table_prefix))
+            self.assertEqual(run(cur.fetchone())[0], 0)
+            self.assertEqual(len(run(cur.fetchmany(9))), 9)
+            self.assertEqual(len(run(cur.fetchall())), 240)
+            run(cur.execute('drop table %saio' % self.table_prefix))
+            run(cur.close())
+        finally:
+            run(con.close())
+
+        pool = run(CUBRIDdb.aio.create_pool(*self.connect_args,
+                minsize=1, maxsize=1))
+        try:
+            con = run(pool.acquire())
+            self.assertTrue(run(con.ping()))
+            self.assertRaises(CUBRIDdb.OperationalError, run, pool.acquire(0.1))
+            run(con.set_autocommit(False))
+            run(pool.release(con))
+            con = run(pool.acquire())
+            self.assertEqual(con.autocommit, True)
+            run(pool.release(con))
+            stats = pool.stats()
+            self.assertEqual(stats['created'], 1)
+            self.assertEqual(stats['acquired'], 2)
+            self.assertEqual(stats['timeouts'], 1)
+            self.assertEqual(stats['idle'], 1)
+        finally:
+            run(pool.close())
+
+    def test_failover(self):
+        # nothing listens on port 1 of the first broker
+        url = "CUBRID:%s:1:%s:::" % (self.ip, self.dbname)
+        broker = "%s:%s" % (self.ip, self.port)
+        for i in range(3):
+            con = self.driver.connect(url, 'dba', '', brokers=[broker],
+                    connect_retries=0)
+            try:
+                self.assertEqual(con.broker.port, int(self.port))
+                self.assertTrue(con.ping())
+            finally:
+                con.close()
+
+        stats = dict(((b['host'], b['port']), b)
+                for b in CUBRIDdb.failover.broker_stats())
+        # once it failed, the first broker is tried after the one that works
+        self.assertEqual(stats[(self.ip, 1)]['errors'], 1)
+        self.assertEqual(stats[(self.ip, int(self.port))]['connects'], 3)
+        self.assertTrue(stats[(self.ip, int(self.port))]['latency'] > 0)
+
+        # altHosts alone is left to CCI
+        con = self.driver.connect(url + '?altHosts=' + broker, 'dba', '')
+        try:
+            self.assertEqual(con.broker, None)
+            self.assertTrue(con.ping())
+        finally:
+            con.close()
+
+    def test_routing(self):
+        is_read_only = CUBRIDdb.routing.is_read_only
+        self.assertTrue(is_read_only('/* x */ (select 1 from db_root)'))
+        self.assertFalse(is_read_only('select * from t for update'))
+        self.assertFalse(is_read_only('insert into t values (1)'))
+
+        replicas = CUBRIDdb.pool.ConnectionPool(*self.connect_args, maxsize=2)
+        con = CUBRIDdb.routing.RoutingConnection(self._connect(), replicas)
+        try:
+            cur = con.cursor()
+            cur.execute('select 1 from db_root')
+            self.assertFalse(cur.on_master)
+            self.assertEqual(cur.fetchone()[0], 1)
+            cur.execute(self.ddl1)
+            self.assertTrue(cur.on_master)
+
+            con.begin()
+            cur.execute("insert into %sbooze values ('Hello')" % self.table_prefix)
+            cur.execute('select count(*) from %sbooze' % self.table_prefix)
+            self.assertTrue(cur.on_master)
+            self.assertEqual(cur.fetchone()[0], 1)
+            con.commit()
+            self.assertFalse(con.in_transaction)
+            self.assertTrue(con.master.autocommit)
+
+            # once the transaction is over, reads after a write go to a replica
+            cur.execute("insert into %sbooze values ('World')" % self.table_prefix)
+            self.assertTrue(cur.on_master)
+            self.assertFalse(con.in_transaction)
+            cur.execute('select count(*) from %sbooze' % self.table_prefix)
+            self.assertFalse(cur.on_master)
+            cur.execute("delete from %sbooze where name = 'World'" % self.table_prefix)
+
+            with con.read_only():
+                cur.execute('select count(*) from %sbooze' % self.table_prefix)
+                self.assertFalse(cur.on_master)
+                self.assertEqual(cur.fetchone()[0], 1)
+                self.assertRaises(CUBRIDdb.ProgrammingError, cur.execute,
+                        "delete from %sbooze" % self.table_prefix)
+            cur.close()
+            self.assertEqual(replicas.stats()['size'], replicas.stats()['idle'])
+        finally:
+            con.close()
+            replicas.close()
+
+    def test_commit_policy(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            self.executeDDL1(cur)
+            insert = "insert into %sbooze values ('Hello')" % self.table_prefix
+
+            con.set_commit_policy(every_n=3)
+            self.assertEqual(con.autocommit, True)
+            cur.execute(insert)
+            self.assertEqual(cur._cs.sql_type, CUBRIDdb.CUBRID_STMT_INSERT)
+            cur.execute(insert)
+            self.assertEqual(con._commit_pending, 2)
+            cur.execute('select count(*) from %sbooze' % self.table_prefix)
+            self.assertEqual(cur.fetchone()[0], 2)
+            cur.execute(insert)
+            self.assertEqual(con._commit_pending, 0)
+
+            con.set_commit_policy(every_ms=50)
+            flusher = con._commit_thread
+            cur.execute(insert)
+            self.assertEqual(con._commit_pending, 1)
+            time.sleep(0.5)
+            self.assertEqual(con._commit_pending, 0)
+            # the same thread serves every window
+            self.assertTrue(con._commit_thread is flusher)
+
+            cur.execute(insert)
+            cur.close()
+        finally:
+            con.close()
+
+        con = self.driver.connect(*self.connect_args)
+        try:
+            cur = con.cursor()
+            cur.execute('select count(*) from %sbooze' % self.table_prefix)
+            self.assertEqual(cur.fetchone()[0], 5)
+            cur.close()
+        finally:
+            con.close()
+
+    def test_lastrowid(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %sautoid' % self.table_prefix)
+            cur.execute('create table %sautoid (id int auto_increment(100, 1), '
+                    'name varchar(20))' % self.table_prefix)
+            self.assertEqual(cur.lastrowid, None)
+            cur.execute("insert into %sautoid (name) values ('a')" % self.table_prefix)
+            self.assertEqual(cur.lastrowid, 100)
+            cur.execute("insert into %sautoid (name) values ('b')" % self.table_prefix)
+            self.assertEqual(cur.lastrowid, 101)
+            # read once, kept until the next execute
+            self.assertEqual(cur.lastrowid, 101)
+
+            # another statement on the connection makes an unread id stale
+            cur.execute("insert into %sautoid (name) values ('c')" % self.table_prefix)
+            cur2 = con.cursor()
+            cur2.execute("insert into %sautoid (name) values ('d')" % self.table_prefix)
+            self.assertEqual(cur.lastrowid, None)
+            self.assertEqual(cur2.lastrowid, 103)
+            cur2.close()
+            cur.execute('select * from %sautoid' % self.table_prefix)
+            self.assertEqual(cur.lastrowid, None)
+            cur.execute('drop table %sautoid' % self.table_prefix)
+            cur.close()
+        finally:
+            con.close()
+
+    def test_stats(self):
+        con = self.driver.connect(*self.connect_args, stats=True)
+        try:
+            cur = con.cursor()
+            cur.execute('select 1 from db_root')
+            self.assertEqual(cur.fetchall(), [(1,)])
+            con.commit()
+
+            stats = cur.stats()
+            self.assertEqual(stats['prepare']['calls'], 1)
+            self.assertEqual(stats['execute']['calls'], 1)
+            self.assertEqual(stats['fetch']['calls'], 1)
+            self.assertEqual(stats['rows'], 1)
+            self.assertTrue(stats['bytes'] > 0)
+            self.assertTrue(stats['execute']['wait'] > 0)
+            self.assertEqual(con.stats()['end_tran']['calls'], 1)
+
+            con.set_stats_enabled(False)
+            cur.execute('select 1 from db_root')
+            cur.fetchall()
+            self.assertEqual(cur.stats(), stats)
+            con.reset_stats()
+            self.assertEqual(con.stats()['execute']['calls'], 0)
+            cur.close()
+        finally:
+            con.close()
+
+    def test_fetch_columns(self):
+        con = self._connect()
+
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %scolumns' % self.table_prefix)
+            cur.execute('create table %scolumns (col1 int, col2 bigint, \
+                    col3 double, col4 varchar(10))' % self.table_prefix)
+            cur.execute("insert into %scolumns values (1, 10, 0.5, 'a'), \
+                    (2, null, 1.5, null), (3, 30, null, 'c')" % self.table_prefix)
+
+            cur.execute('select * from %scolumns order by col1' % self.table_prefix)
+            columns, nulls = cur.fetch_columns(2)
+            self.assertTrue(isinstance(columns[0], array.array))
+            self.assertEqual(list(columns[0]), [1, 2])
+            self.assertEqual(list(columns[1]), [10, 0])
+            self.assertEqual(list(nulls[1]), [0, 1])
+            self.assertEqual(list(columns[2]), [0.5, 1.5])
+            self.assertEqual(columns[3], ['a', None])
+            self.assertEqual(nulls[3], None)
+
+            columns, nulls = cur.fetch_columns()
+            self.assertEqual(list(columns[0]), [3])
+            self.assertEqual(list(nulls[2]), [1])
+            columns, nulls = cur.fetch_columns()
+            self.assertEqual(len(columns[0]), 0)
+            cur.execute('drop table %scolumns' % self.table_prefix)
+        finally:
+            con.close()
+
+    def test_fetch_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            self.assertRaises(CUBRIDdb.NotSupportedError,
+                    self._connect().cursor().fetch_numpy)
+            return
+
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %snumpy' % self.table_prefix)
+            cur.execute('create table %snumpy (col1 int, col2 double, \
+                    col3 date, col4 varchar(10))' % self.table_prefix)
+            cur.execute("insert into %snumpy values (1, 0.5, date'2000-03-01', 'a'), \
+                    (2, null, null, 'b')" % self.table_prefix)
+
+            cur.execute('select * from %snumpy order by col1' % self.table_prefix)
+            result = cur.fetch_numpy()
+            self.assertEqual(list(result['col1']), [1, 2])
+            self.assertEqual(result['col2'][0], 0.5)
+            self.assertTrue(result['col2'].mask[1])
+            self.assertEqual(result['col3'][0], numpy.datetime64('2000-03-01'))
+            self.assertEqual(list(result['col4']), ['a', 'b'])
+
+            cur.execute('select col1, col3 from %snumpy order by col1' % self.table_prefix)
+            result = cur.fetch_numpy(as_dict=True)
+            self.assertEqual(result['col1'].dtype, numpy.dtype('i'))
+            self.assertEqual(result['col3'].dtype, numpy.dtype('datetime64[D]'))
+
+            # repeated column names get a suffix
+            cur.execute('select a.col1, b.col1 from %snumpy a, %snumpy b \
+                    where a.col1 = 1 and b.col1 = 2'
+                    % (self.table_prefix, self.table_prefix))
+            result = cur.fetch_numpy()
+            self.assertEqual(result.dtype.names, ('col1', 'col1_1'))
+            self.assertEqual((result['col1'][0], result['col1_1'][0]), (1, 2))
+            cur.execute('drop table %snumpy' % self.table_prefix)
+        finally:
+            con.close()
+
+    def test_fetch_numpy_temporal(self):
+        try:
+            import numpy
+        except ImportError:
+            return
+
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %snumpy_dates' % self.table_prefix)
+            cur.execute('create table %snumpy_dates (col1 date, col2 datetime, \
+                    col3 timestamp)' % self.table_prefix)
+            cur.execute("insert into %snumpy_dates values (date'1969-12-31', \
+                    datetime'2000-03-01 12:34:56.789', \
+                    timestamp'2020-02-29 23:59:59')" % self.table_prefix)
+
+            cur.execute('select * from %snumpy_dates' % self.table_prefix)
+            result = cur.fetch_numpy(as_dict=True)
+            self.assertEqual(result['col1'][0], numpy.datetime64('1969-12-31'))
+            self.assertEqual(result['col2'][0],
+                    numpy.datetime64('2000-03-01T12:34:56.789'))
+            self.assertEqual(result['col3'][0],
+                    numpy.datetime64('2020-02-29T23:59:59'))
+            self.assertEqual(result['col2'].dtype, numpy.dtype('datetime64[ms]'))
+            self.assertEqual(result['col3'].dtype, numpy.dtype('datetime64[s]'))
+            cur.execute('drop table %snumpy_dates' % self.table_prefix)
+        finally:
+            con.close()
+
+    def test_numeric_type(self):
+        con = self._connect()
+
+        try:
+            cur = con.cursor()
+            cur.execute('drop table if exists %snumerics' % self.table_prefix)
+            cur.execute('create table %snumerics (col1 numeric(10,3), \
+                    col2 numeric(38,0))' % self.table_prefix)
+            cur.execute("insert into %snumerics values (-12.345, \
+                    12345678901234567890123456789012345678)" % self.table_prefix)
+
+            cur.execute('select * from %snumerics' % self.table_prefix)
+            row = cur.fetchone()
+            self.assertEqual(row[0], decimal.Decimal('-12.345'))
+            self.assertEqual(row[1], 12345678901234567890123456789012345678)
+
+            cur.numeric_type = int
+            cur.execute('select * from %snumerics' % self.table_prefix)
+            row = cur.fetchone()
+            self.assertEqual(row[0], -12)
+            self.assertEqual(row[1], 12345678901234567890123456789012345678)
+
+            cur.numeric_type = float
+            cur.execute('select * from %snumerics' % self.table_prefix)
+            self.assertEqual(cur.fetchone()[0], -12.345)
+
+            cur.numeric_type = str
+            cur.execute('select * from %snumerics' % self.table_prefix)
+            self.assertEqual(cur.fetchone()[0], '-12.345')
+
+            self.assertRaises(ValueError, setattr, cur, 'numeric_type', bool)
+            cur.execute('drop table %snumerics' % self.table_prefix)
+        finally:
+            con.close()
+
     def test_fetchone(self):
         con = self._connect()
         try:
@@ -579,6 +1250,84 @@ class DBAPI20Test(unittest.TestCase):
         finally:
             con.close()
 
+    def test_iter(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            self._populate(cur)
+
+            cur.execute('select name from %sbooze' % self.table_prefix)
+            rows = [r[0] for r in cur]
+            rows.sort()
+            self.assertEqual(rows, self.samples,
+                    'iteration over cursor retrieved incorrect rows')
+            self.assertRaises(StopIteration, next, cur)
+
+            cur = con.cursor(dictCursor = True)
+            cur.execute('select name from %sbooze' % self.table_prefix)
+            for row in cur:
+                self.assertTrue(row['name'] in self.samples,
+                        'iteration over dict cursor retrieved incorrect rows')
+        finally:
+            con.close()
+
+    def test_named_row_cursor(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            self._populate(cur)
+
+            cur = con.cursor(cursorclass = CUBRIDdb.cursors.NamedRowCursor)
+            cur.execute("select name, 1 as one from %sbooze where name = '%s'"
+                    % (self.table_prefix, self.samples[0]))
+            row = cur.fetchone()
+            self.assertEqual(len(row), 2)
+            self.assertEqual(row[0], self.samples[0])
+            self.assertEqual(row[-1], 1)
+            self.assertEqual(row['name'], self.samples[0])
+            self.assertEqual(row.one, 1)
+            self.assertEqual(row, (self.samples[0], 1))
+            self.assertEqual(tuple(row), (self.samples[0], 1))
+            self.assertEqual(row[:1], (self.samples[0],))
+            self.assertEqual(row._asdict(), {'name': self.samples[0], 'one': 1})
+            self.assertRaises(KeyError, lambda: row['missing'])
+            self.assertRaises(AttributeError, lambda: row.missing)
+
+            cur.execute('select name from %sbooze' % self.table_prefix)
+            names = sorted(r.name for r in cur.fetchall())
+            self.assertEqual(names, self.samples)
+        finally:
+            con.close()
+
+    def test_threads(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            self._populate(cur)
+            errors = []
+
+            def worker():
+                try:
+                    c = con.cursor()
+                    for i in range(20):
+                        c.execute('select name from %sbooze' % self.table_prefix)
+                        rows = [r[0] for r in c]
+                        rows.sort()
+                        self.assertEqual(rows, self.samples)
+                    c.close()
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=worker) for i in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(errors, [],
+                    'cursors sharing a connection failed across threads')
+        finally:
+            con.close()
+
     def test_mixdfetch(self):
         con = self._connect()
         try:
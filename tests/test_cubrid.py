@@ -132,6 +132,15 @@ class DatabaseTest(unittest.TestCase):
                     self.assertEqual(len(cur.description[0]), 7,))
             self.assertEqual(cur.description[0][0].lower(), 'name',
                     'cursor.description[x][0] must return column name')
+            desc = cur.description
+            cur.prepare("select name from test_cubrid")
+            cur.execute()
+            self.assertTrue(cur.description is desc,
+                    'cursor.description should be reused for the same columns')
+            cur.prepare("select name, 1 as one from test_cubrid")
+            cur.execute()
+            self.assertEqual(len(cur.description), 2,
+                    'cursor.description not rebuilt for new columns')
             cur.close()
         finally:
             con.close()
@@ -169,6 +178,50 @@ class DatabaseTest(unittest.TestCase):
         finally:
             con.close()
 
+    def test_lazy_session_parameters(self):
+        con = self._connect()
+        try:
+            self.assertTrue(isinstance(con.lock_timeout, int))
+            self.assertTrue(isinstance(con.max_string_len, int))
+            self.assertTrue(con.isolation_level.startswith('CUBRID_'))
+            # the level read from the server is not sent back to it
+            level = con.isolation_level
+            if level != 'CUBRID_TRAN_UNKNOWN_ISOLATION':
+                con.set_isolation_level(getattr(_cubrid, level))
+                self.assertEqual(con.isolation_level, level)
+            self.assertRaises(InterfaceError, con.set_isolation_level, 0)
+
+            # the level is sent with the next statement
+            con.set_isolation_level(CUBRID_SERIALIZABLE)
+            cur = con.cursor()
+            cur.prepare('select 1 from db_root')
+            cur.execute()
+            cur.close()
+            self.assertEqual(con.isolation_level, 'CUBRID_SERIALIZABLE')
+        finally:
+            con.close()
+
+    def test_set_lock_timeout(self):
+        con = self._connect()
+        try:
+            self.assertRaises(InterfaceError, con.set_lock_timeout, -2)
+            # only the last value is sent, with the next statement
+            con.set_lock_timeout(1000)
+            con.set_lock_timeout(2000)
+            self.assertEqual(con.lock_timeout, 2000)
+            cur = con.cursor()
+            cur.prepare('select 1 from db_root')
+            cur.execute()
+            cur.close()
+            con.set_lock_timeout(2000)
+            self.assertEqual(con.lock_timeout, 2000)
+
+            # unchanged modes are not sent again
+            con.set_autocommit(True)
+            self.assertEqual(con.autocommit, True)
+        finally:
+            con.close()
+
     def test_autocommit(self):
         con = self._connect()
         try:
@@ -298,6 +351,34 @@ class DatabaseTest(unittest.TestCase):
             cur.close()
             con.close()
 
+    def test_fetch_many(self):
+        t_fetch_many = 'create table test_cubrid (name varchar(20))'
+        con = self._connect()
+        cur = con.cursor()
+        try:
+            cur.prepare(t_fetch_many)
+            cur.execute()
+            self._prepare_data(cur)
+            self._select_data(cur)
+            rows = cur.fetch_many(4)
+            self.assertEqual(len(rows), 4,
+                    'cursor.fetch_many get incorrect number of rows')
+            self.assertEqual(cur.row_tell(), 4,
+                    'cursor.fetch_many move cursor error')
+            rows.extend(cur.fetch_many(-1))
+            self.assertEqual(sorted([r[0] for r in rows]), self.samples,
+                    'cursor.fetch_many get incorrect result')
+            self.assertEqual(cur.fetch_many(), [],
+                    'cursor.fetch_many should return an empty list at the end')
+
+            self._select_data(cur)
+            rows = [r for r in cur]
+            self.assertEqual(len(rows), len(self.samples),
+                    'iteration over cursor get incorrect number of rows')
+        finally:
+            cur.close()
+            con.close()
+
     def test_bind_int(self):
         t_bind_int = 'create table test_cubrid (id int)'
         samples_int = ['100', '200', '300', '400']